@@ -0,0 +1,60 @@
+"""
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+
+Benchmark of the CR3BP right-hand side backends.
+
+Times a single right-hand side call and a full `solve_non_dim_trajectory()` run for
+every available `CR3BP.rhs_backend`, and reports the largest deviation of each
+trajectory from the "python" backend.
+
+    python benchmarks/bench_cr3bp_rhs.py
+"""
+
+import io
+import timeit
+import contextlib
+import numpy as np
+
+from pyastronautics.astrodynamics import three_body_problem
+from pyastronautics.astrodynamics.three_body_problem import CR3BP
+
+def make_model(backend: str) -> CR3BP:
+    """Same spacecraft as the CR3BP test suite, using the given backend."""
+    sc = CR3BP([0.50, 0.50, 0.0], [-0.05, 0.10, 0.0])
+    sc.time = np.linspace(0, 2*np.pi*4, 1000)
+    sc.rel_tol = 1e-12
+    sc.abs_tol = 1e-13
+    sc.rhs_backend = backend
+    return sc
+
+def main():
+    backends = ["python", "numpy"]
+    if three_body_problem.numba is not None:
+        backends.append("numba")
+
+    state = np.array([0.50, 0.50, 0.01, -0.05, 0.10, 0.0])
+    reference = None
+
+    print(f"{'backend':<10}{'rhs call [us]':>16}{'solve [ms]':>14}{'speedup':>10}{'max |dx|':>12}")
+    for backend in backends:
+        sc = make_model(backend)
+        rhs = sc.non_dim_rhs()
+        # Warm up, includes JIT compilation
+        rhs(0.0, state)
+
+        number = 20000
+        call_time = min(timeit.repeat(lambda: rhs(0.0, state), number=number, repeat=5))/number
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            solve_time = min(timeit.repeat(sc.solve_non_dim_trajectory, number=1, repeat=3))
+
+        if reference is None:
+            reference = (call_time, sc.num_sol.y)
+        deviation = np.max(np.abs(sc.num_sol.y - reference[1]))
+
+        print(f"{backend:<10}{call_time*1e6:>16.3f}{solve_time*1e3:>14.1f}"
+              f"{reference[0]/call_time:>10.1f}{deviation:>12.2e}")
+
+if __name__ == "__main__":
+    main()
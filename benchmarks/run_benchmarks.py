@@ -0,0 +1,259 @@
+"""
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+
+Benchmark suite of the propagation, orbit element and CR3BP entry points.
+
+Every benchmark is timed at several problem sizes with `timeit`: each measurement
+repeats the call enough times to last at least `--min-time` seconds, and the best and
+median of `--repeat` measurements are reported per call. Results can be saved as a JSON
+baseline together with the versions and machine they were measured on, and compared
+against a stored baseline to show the change of every benchmark.
+
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --save benchmarks/baselines/0.0.40.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baselines/0.0.40.json
+    python benchmarks/run_benchmarks.py --filter forbidden_region --quick
+
+Baselines are only comparable on the machine that recorded them, so record a new
+baseline on the release machine before comparing.
+"""
+
+import sys
+import json
+import timeit
+import argparse
+import platform
+import statistics
+import subprocess
+import numpy as np
+import scipy
+from importlib import metadata
+
+from pyastronautics.astrodynamics.base_model import calc_orbit_elements_array
+from pyastronautics.astrodynamics.two_body_problem import TwoBodyModel
+from pyastronautics.astrodynamics.three_body_problem import (CR3BP, planar_lagrange_points,
+                                                             jacobi_potential_grid)
+from pyastronautics.astrodynamics.lagrange import lagrange_points
+
+# Benchmark Definitions
+# ---------------------------------------------------------------------
+# Each setup function takes the problem size and returns the callable being timed
+
+def two_body_solve(periods: int) -> callable:
+    """`TwoBodyModel.solve_trajectory()` over a number of orbit periods, 100 points each."""
+    sc = TwoBodyModel([5000, 100, 0], [1, 10, 5])
+    sc.mu = 398600 # km^3/sec^2
+    sc.verbose = False
+    sc.time = np.linspace(0, periods*12969.97314383982, 100*periods)
+    return sc.solve_trajectory
+
+def cr3bp_solve(periods: int) -> callable:
+    """`CR3BP.solve_non_dim_trajectory()` over a number of 2π periods, 250 points each."""
+    sc = CR3BP([0.50, 0.50, 0.0], [-0.05, 0.10, 0.0])
+    sc.verbose = False
+    sc.rel_tol = 1e-12
+    sc.abs_tol = 1e-13
+    sc.time = np.linspace(0, periods*2*np.pi, 250*periods)
+    return sc.solve_non_dim_trajectory
+
+def orbit_elements(num_states: int) -> callable:
+    """`TwoBodyModel.calc_orbit_elements()` for a single state, else `calc_orbit_elements_array()`."""
+    if num_states == 1:
+        sc = TwoBodyModel([5000, 100, 0], [1, 10, 5])
+        sc.mu = 398600 # km^3/sec^2
+        return sc.calc_orbit_elements
+
+    rng = np.random.default_rng(0)
+    position = rng.normal(7000, 500, (num_states, 3))
+    velocity = rng.normal(5, 1, (num_states, 3))
+    return lambda: calc_orbit_elements_array(position, velocity, 398600)
+
+def forbidden_region(linspace_num: int) -> callable:
+    """`CR3BP.forbidden_region()` on an uncached grid of linspace_num x linspace_num points."""
+    def run():
+        jacobi_potential_grid.cache_clear()
+        CR3BP.forbidden_region(3.1, 0.012150515586657583, linspace_num=linspace_num)
+    return run
+
+def planar_lagrange(num_mass_ratios: int) -> callable:
+    """`planar_lagrange_points.get_points()` for each of a number of mass ratios."""
+    mass_ratios = np.linspace(0.001, 0.5, num_mass_ratios)
+    def run():
+        for mass_ratio in mass_ratios:
+            planar_lagrange_points(mass_ratio).get_points()
+    return run
+
+def batch_lagrange(num_mass_ratios: int) -> callable:
+    """`lagrange.lagrange_points()` for a number of mass ratios at once."""
+    mass_ratios = np.linspace(0.001, 0.5, num_mass_ratios)
+    return lambda: lagrange_points(mass_ratios)
+
+# Benchmark name, size parameter, sizes and setup function
+BENCHMARKS = [("solve_trajectory", "periods", (1, 5, 25), two_body_solve),
+              ("solve_non_dim_trajectory", "periods", (1, 4, 16), cr3bp_solve),
+              ("calc_orbit_elements", "states", (1, 1000, 100000), orbit_elements),
+              ("forbidden_region", "linspace_num", (100, 300, 1000), forbidden_region),
+              ("planar_lagrange_points.get_points", "mass_ratios", (1, 10, 100), planar_lagrange),
+              ("lagrange_points", "mass_ratios", (1, 10, 100), batch_lagrange)]
+
+# Running and Reporting
+# ---------------------------------------------------------------------
+
+def environment() -> dict:
+    """Versions and machine of the current run."""
+    try:
+        version = metadata.version("pyastronautics")
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {"pyastronautics": version,
+            "commit": commit,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "scipy": scipy.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "system": platform.system()}
+
+def run_benchmarks(pattern: str = None, repeat: int = 5, min_time: float = 0.2,
+                   quick: bool = False) -> dict:
+    """
+    Time every benchmark whose name contains pattern.
+
+    Parameters
+    ----------
+    pattern : str, optional
+        Only run benchmarks whose name contains this string. Defaults to None, all.
+    repeat : int, optional
+        The number of measurements of each benchmark. Defaults to 5.
+    min_time : float, optional
+        The minimum duration of each measurement in seconds. Defaults to 0.2.
+    quick : bool, optional
+        Only run the smallest size of each benchmark. Defaults to False.
+
+    Returns
+    -------
+    dict
+        The environment of the run and, for every benchmark and size, the best and median
+        time per call in seconds and the number of calls per measurement.
+    """
+    results = {}
+    for name, parameter, sizes, setup in BENCHMARKS:
+        if pattern is not None and pattern not in name:
+            continue
+        for size in sizes[:1] if quick else sizes:
+            key = f"{name}[{parameter}={size}]"
+            timer = timeit.Timer(setup(size))
+            # Warm up and choose the number of calls per measurement
+            number, elapsed = timer.autorange()
+            number = max(1, int(np.ceil(number*min_time/max(elapsed, 1e-9))))
+            times = [t/number for t in timer.repeat(repeat=repeat, number=number)]
+
+            results[key] = {"best": min(times), "median": statistics.median(times),
+                            "number": number}
+            print(f"{key:<56}{_format_time(min(times)):>12}", flush=True)
+
+    return {"environment": environment(), "results": results}
+
+def compare(baseline: dict, current: dict, threshold: float = 0.1) -> tuple:
+    """
+    Build the comparison report of the best time of every benchmark of the current run.
+
+    Parameters
+    ----------
+    baseline : dict
+        The stored run, see `run_benchmarks()`.
+    current : dict
+        The new run.
+    threshold : float, optional
+        Relative change above which a benchmark is marked slower (+) or faster (-).
+        Defaults to 0.1.
+
+    Returns
+    -------
+    tuple
+        A tuple containing:
+            - report : str
+                The comparison table.
+            - regressions : list
+                The names of the benchmarks slower than the threshold.
+    """
+    lines = [f"baseline: {_describe(baseline['environment'])}",
+             f"current:  {_describe(current['environment'])}",
+             "",
+             f"   {'benchmark':<56}{'baseline':>12}{'current':>12}{'ratio':>8}"]
+    regressions = []
+
+    for key, new in current["results"].items():
+        old = baseline["results"].get(key)
+        if old is None:
+            lines.append(f"   {key:<56}{'-':>12}{_format_time(new['best']):>12}{'n/a':>8}")
+            continue
+
+        ratio = new["best"]/old["best"]
+        mark = " "
+        if ratio > 1 + threshold:
+            mark = "+"
+            regressions.append(key)
+        elif ratio < 1/(1 + threshold):
+            mark = "-"
+        lines.append(f"{mark}  {key:<56}{_format_time(old['best']):>12}"
+                     f"{_format_time(new['best']):>12}{ratio:>8.2f}")
+
+    return "\n".join(lines), regressions
+
+def _format_time(seconds: float) -> str:
+    """Format a duration with a readable unit."""
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds/scale:.3f} {unit}"
+    return f"{seconds/1e-9:.1f} ns"
+
+def _describe(env: dict) -> str:
+    """One line summary of a run environment."""
+    commit = f" ({env['commit']})" if env.get("commit") else ""
+    return (f"pyastronautics {env['pyastronautics']}{commit}, python {env['python']}, "
+            f"numpy {env['numpy']}, scipy {env['scipy']}, {env['system']} {env['machine']}")
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the PyAstronautics benchmark suite.")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this string")
+    parser.add_argument("--repeat", type=int, default=5, help="measurements per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="minimum duration of each measurement in seconds")
+    parser.add_argument("--quick", action="store_true", help="only run the smallest sizes")
+    parser.add_argument("--save", metavar="FILE", help="save the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative change reported as a regression or improvement")
+    parser.add_argument("--check", action="store_true",
+                        help="exit with status 1 when a benchmark regressed")
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.filter, args.repeat, args.min_time, args.quick)
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(current, file, indent=2)
+        print(f"\nSaved results to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        report, regressions = compare(baseline, current, args.threshold)
+        print("\n" + report)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) slower than the {args.threshold:.0%} threshold.")
+            if args.check:
+                return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
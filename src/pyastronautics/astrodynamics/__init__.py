@@ -1,5 +1,16 @@
 """ A Python module for Astronautics """
 
 from .base_model import *
+from .kepler import *
+from .integrators import *
+from .instrumentation import *
+from .events import *
+from .trajectory import *
 from .two_body_problem import *
-from .three_body_problem import *
\ No newline at end of file
+from .catalog import *
+from .three_body_problem import *
+from .lagrange import *
+from .periodic_orbits import *
+from .manifolds import *
+from .poincare import *
+from .monte_carlo import *
\ No newline at end of file
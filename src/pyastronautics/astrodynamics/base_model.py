@@ -3,8 +3,9 @@
    https://github.com/eduardo-ocampo/PyAstronautics
 """
 
-import math
 import numpy as np
+from copy import deepcopy
+from collections.abc import MutableMapping
 from typing import Union
 from numpy.linalg import norm
 
@@ -22,6 +23,8 @@ class Parameter:
     description : str
         A short description fo the parameter. Default to None
     """
+    __slots__ = ("value", "unit", "description")
+
     def __init__(self, value: Union[list[float], np.ndarray, float, int],
                  unit: str, description: str = None):
         if not isinstance(value, (list, np.ndarray, float, int)):
@@ -35,23 +38,102 @@ class Parameter:
         return f"Parameter(value={self.value}, unit='{self.unit}', description='{self.description})"
 
 
+# Layout of the computed orbit elements along the first axis of an element array:
+# name, number of values, unit and description
+_ELEMENT_LAYOUT = (("E", 1, "km^2/sec^2", "Specific Energy"),
+                   ("h_vector", 3, "km^2/sec", "Specific Angular Momentum Vector"),
+                   ("h", 1, "km^2/sec", "Magnitude of The Specific Angular Momentum Vector"),
+                   ("e_vector", 3, "", "Eccentricity Vector"),
+                   ("e", 1, "", "Magnitude of The Eccentricity Vector"),
+                   ("i", 1, "degrees", "Inclination"),
+                   ("N", 3, "km^2/sec", "Ascending Node Vector"),
+                   ("Omega", 1, "degrees", "Longitude of Ascending Node (Ω)"),
+                   ("omega", 1, "degrees", "Argument of Perigee (ω)"),
+                   ("p", 1, "km", "Semi-latus Rectum"),
+                   ("a", 1, "km", "Semi-major Axis"),
+                   ("n", 1, "rad/sec", "Mean Motion"),
+                   ("fi", 1, "degrees", "Initial True Anomaly"),
+                   ("Ei", 1, "degrees", "Initial Eccentric Anomaly"),
+                   ("Mi", 1, "degrees", "Initial Mean Anomaly"),
+                   ("period", 1, "secs", "Period"))
+
+# Static field index shared by every OrbitElements: name -> (index, unit, description),
+# where the index is an integer for scalar elements and a slice for vector elements
+ORBIT_ELEMENT_FIELDS = {}
+_start = 0
+for _name, _size, _unit, _description in _ELEMENT_LAYOUT:
+    _index = _start if _size == 1 else slice(_start, _start + _size)
+    ORBIT_ELEMENT_FIELDS[_name] = (_index, _unit, _description)
+    _start += _size
+# Length of the first axis of an element array
+NUM_ELEMENT_VALUES = _start
+_ELEMENT_INDEX = {name: field[0] for name, field in ORBIT_ELEMENT_FIELDS.items()}
+# Shared by every complete element array
+_ALL_FIELDS = frozenset(ORBIT_ELEMENT_FIELDS)
+del _start, _name, _size, _unit, _description, _index
+
 class OrbitElements:
     """
     Stores various orbital parameters.
 
+    The computed orbit elements listed in `ORBIT_ELEMENT_FIELDS` are held in a single
+    float64 element array of shape (NUM_ELEMENT_VALUES, ...), so a set of elements, or an
+    (N,) or (N, T) array of element sets, is one allocation that is cheap to create, copy
+    and export. Each element is a contiguous block of the array, and its unit and
+    description come from the shared field index. Any other parameter, such as the
+    position and velocity lists, is kept as a `Parameter`. Every parameter is read with
+    dot notation, e.g. `elements.a.value`.
+
+    Parameters read from the element array write through to it: setting
+    `elements.a.value`, `elements.a = Parameter(...)` or `elements.parameters["a"]`
+    updates the element array, or keeps the new value as a separate `Parameter` when it
+    no longer fits the array, e.g. in another unit. Since each read builds a new
+    `Parameter` around the array, compare values rather than identities.
+
     Attributes
     ----------
-    parameters : dict[str, Parameter]
-        A dictionary storing parameters by their name (e.g., position, velocity).
+    parameters : _ParameterMapping
+        A dictionary-like view of every parameter by its name (e.g., position, velocity)
+        that writes through to the elements.
     """
-    def __init__(self):
-        self.parameters: dict[str, Parameter] = {}
+    __slots__ = ("_data", "_fields", "_extra")
+
+    def __init__(self, data: np.ndarray = None):
+        """
+        Initialize the OrbitElements instance.
+
+        Parameters
+        ----------
+        data : np.ndarray, optional
+            A (NUM_ELEMENT_VALUES, ...) element array holding every computed element as
+            laid out in `ORBIT_ELEMENT_FIELDS`, used without copying when it is float64.
+            Defaults to None, which starts without any parameter.
+
+        Raises
+        ------
+        ValueError
+            If the first axis of data does not have `NUM_ELEMENT_VALUES` values.
+        """
+        if data is not None:
+            data = np.asarray(data, dtype=float)
+            if data.ndim == 0 or data.shape[0] != NUM_ELEMENT_VALUES:
+                raise ValueError(f"data must have {NUM_ELEMENT_VALUES} values in its first axis.")
+
+        self._data = data
+        # Names of the elements of the field index holding a value in self._data, an
+        # immutable set that is shared between instances
+        self._fields = frozenset() if data is None else _ALL_FIELDS
+        # Parameters outside the element array
+        self._extra: dict[str, Parameter] = {}
 
     def add_parameter(self, name: str, value: Union[list[float], np.ndarray, float, int],
                       unit: str, description: str = None):
         """
         Add a new parameter to the orbit elements repository.
 
+        Numeric values of the elements in `ORBIT_ELEMENT_FIELDS` given in the same unit
+        are written into the element array, any other parameter is kept as is.
+
         Parameters
         ----------
         name : str 
@@ -63,7 +145,36 @@ class OrbitElements:
         description : str
             A short description of the parameter.
         """
-        self.parameters[name] = Parameter(value, unit, description)
+        field = ORBIT_ELEMENT_FIELDS.get(name)
+        if (field is not None and unit == field[1] and description in (None, field[2])
+                and self._store(field[0], value)):
+            self._fields = self._fields | {name}
+            self._extra.pop(name, None)
+            return
+
+        self._extra[name] = Parameter(value, unit, description)
+        self._fields = self._fields - {name}
+
+    def _store(self, index: Union[int, slice], value: Union[np.ndarray, float, int]) -> bool:
+        """Write a numeric value into the element array, False if it does not fit."""
+        if not isinstance(value, (np.ndarray, float, int)):
+            return False
+
+        # Shape of the element sets, without the last axis of vector elements
+        shape = np.shape(value)
+        if isinstance(index, slice):
+            if shape[-1:] != (index.stop - index.start,):
+                return False
+            shape = shape[:-1]
+            value = np.moveaxis(value, -1, 0)
+
+        if self._data is None:
+            self._data = np.full((NUM_ELEMENT_VALUES,) + shape, np.nan)
+        elif self._data.shape[1:] != shape:
+            return False
+
+        self._data[index] = value
+        return True
 
     def __getattr__(self, name: str) -> Parameter:
         """Allow access to parameters via dot notation.
@@ -80,14 +191,254 @@ class OrbitElements:
         Raises:
             AttributeError: If the parameter does not exist.
         """
-        if name in self.parameters:
-            return self.parameters[name]
+        # Elements of the field index are read by _ElementField, slots are never parameters
+        if not name.startswith("_") and name in self._extra:
+            return self._extra[name]
         raise AttributeError(f"'OrbitElements' object has no attribute '{name}'")
 
+    @property
+    def parameters(self) -> "_ParameterMapping":
+        """A dictionary-like view of every parameter by its name, see `_ParameterMapping`."""
+        return _ParameterMapping(self)
+
+    def _remove_parameter(self, name: str) -> None:
+        """Remove a parameter, raising KeyError if it does not exist."""
+        if name in self._extra:
+            del self._extra[name]
+        elif name in self._fields:
+            self._fields = self._fields - {name}
+        else:
+            raise KeyError(name)
+
+    @property
+    def shape(self) -> tuple:
+        """The shape of the element sets, () for a single set."""
+        return () if self._data is None else self._data.shape[1:]
+
+    def __getitem__(self, index) -> "OrbitElements":
+        """
+        Select element sets, e.g. `elements[0]` or `elements[elements.e.value < 1]`.
+
+        As with NumPy indexing, integers and slices return a view of the element array and
+        boolean or integer arrays a copy. Other parameters are not carried over.
+        """
+        if not self.shape:
+            raise TypeError("A single set of orbit elements cannot be indexed.")
+        index = index if isinstance(index, tuple) else (index,)
+        selected = OrbitElements(self._data[(slice(None),) + index])
+        selected._fields = self._fields
+        return selected
+
+    def update(self, other: "OrbitElements") -> None:
+        """
+        Copy every parameter of another OrbitElements into this one.
+
+        Parameters
+        ----------
+        other : OrbitElements
+            The parameters to copy, replacing existing parameters of the same name.
+
+        Raises
+        ------
+        ValueError
+            If both hold element arrays with different shapes of element sets.
+        """
+        if other._fields:
+            if self._data is None:
+                self._data = np.array(other._data)
+            elif self.shape != other.shape:
+                raise ValueError(f"Cannot update elements of shape {self.shape} "
+                                 f"with elements of shape {other.shape}.")
+            else:
+                for name in other._fields:
+                    index = ORBIT_ELEMENT_FIELDS[name][0]
+                    self._data[index] = other._data[index]
+
+            # Share the set of the other elements when it holds every name
+            if self._fields <= other._fields:
+                self._fields = other._fields
+            elif not other._fields <= self._fields:
+                self._fields = self._fields | other._fields
+            for name in other._fields:
+                self._extra.pop(name, None)
+
+        self._extra.update(other._extra)
+        if not self._fields.isdisjoint(other._extra):
+            self._fields = self._fields - set(other._extra)
+
+    def copy(self) -> "OrbitElements":
+        """Return a copy with its own element array, sharing the other `Parameter` objects."""
+        elements = OrbitElements()
+        elements._data = None if self._data is None else self._data.copy()
+        elements._fields = self._fields
+        elements._extra = dict(self._extra)
+        return elements
+
+    def __deepcopy__(self, memo: dict) -> "OrbitElements":
+        """Return a copy with its own element array and other parameters."""
+        elements = self.copy()
+        elements._extra = deepcopy(self._extra, memo)
+        return elements
+
+    def to_array(self) -> np.ndarray:
+        """
+        The element array, laid out as in `ORBIT_ELEMENT_FIELDS`.
+
+        Returns
+        -------
+        np.ndarray
+            The (NUM_ELEMENT_VALUES, ...) element array itself, not a copy. Values of
+            elements that were never set are NaN.
+        """
+        if self._data is None:
+            return np.full(NUM_ELEMENT_VALUES, np.nan)
+        return self._data
+
+    def to_records(self) -> np.ndarray:
+        """
+        Export the elements as a NumPy structured array with one named field per element,
+        e.g. `records["a"]` or `records["h_vector"]`, in a single transposed copy.
+
+        Returns
+        -------
+        np.ndarray
+            The structured array of shape `self.shape`.
+        """
+        data = np.ascontiguousarray(np.moveaxis(self.to_array(), 0, -1))
+        return data.view(_RECORD_DTYPE).reshape(data.shape[:-1])
+
     def __repr__(self) -> str:
         """Return a string representation of the parameters."""
         return f"OrbitElements({', '.join(self.parameters.keys())})"
 
+class _ElementField:
+    """Descriptor reading and writing an element of the field index of an OrbitElements."""
+    __slots__ = ("name", "index", "unit", "description")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.index, self.unit, self.description = ORBIT_ELEMENT_FIELDS[name]
+
+    def __get__(self, elements: OrbitElements, owner: type) -> Parameter:
+        if elements is None:
+            return self
+        if self.name in elements._extra:
+            return elements._extra[self.name]
+        if self.name not in elements._fields:
+            # Falls back to OrbitElements.__getattr__
+            raise AttributeError(self.name)
+        return _ElementParameter(elements, self)
+
+    def __set__(self, elements: OrbitElements, parameter: Parameter) -> None:
+        if not isinstance(parameter, Parameter):
+            raise TypeError(f"{self.name} must be set to a Parameter.")
+        elements.add_parameter(self.name, parameter.value, parameter.unit, parameter.description)
+
+    def read(self, elements: OrbitElements) -> Union[np.ndarray, float]:
+        """A float for a single element set, else a view of the element array with the vector axis last."""
+        value = elements._data[self.index]
+        if isinstance(self.index, slice) and value.ndim > 1:
+            value = np.moveaxis(value, 0, -1)
+        return value
+
+class _ElementParameter(Parameter):
+    """
+    Parameter of an element held in the element array of an OrbitElements.
+
+    Reads come from the elements, so they see later changes, and writes go through
+    `OrbitElements.add_parameter()`.
+    """
+    __slots__ = ("_elements", "_field")
+
+    def __init__(self, elements: OrbitElements, field: _ElementField):
+        self._elements = elements
+        self._field = field
+
+    def _current(self) -> Union[Parameter, None]:
+        """The separate Parameter replacing the element, if any."""
+        return self._elements._extra.get(self._field.name)
+
+    @property
+    def value(self) -> Union[np.ndarray, float]:
+        current = self._current()
+        return self._field.read(self._elements) if current is None else current.value
+
+    @value.setter
+    def value(self, value: Union[list[float], np.ndarray, float, int]) -> None:
+        self._elements.add_parameter(self._field.name, value, self.unit, self.description)
+
+    @property
+    def unit(self) -> str:
+        current = self._current()
+        return self._field.unit if current is None else current.unit
+
+    @unit.setter
+    def unit(self, unit: str) -> None:
+        self._elements.add_parameter(self._field.name, self.value, unit, self.description)
+
+    @property
+    def description(self) -> str:
+        current = self._current()
+        return self._field.description if current is None else current.description
+
+    @description.setter
+    def description(self, description: str) -> None:
+        self._elements.add_parameter(self._field.name, self.value, self.unit, description)
+
+for _name in ORBIT_ELEMENT_FIELDS:
+    setattr(OrbitElements, _name, _ElementField(_name))
+del _name
+
+class _ParameterMapping(MutableMapping):
+    """
+    Dictionary-like view of the parameters of an OrbitElements, in insertion order of the
+    other parameters followed by the order of `ORBIT_ELEMENT_FIELDS`.
+
+    Setting an item adds or replaces the parameter with `OrbitElements.add_parameter()`
+    and deleting an item removes it.
+    """
+    __slots__ = ("_elements",)
+
+    def __init__(self, elements: OrbitElements):
+        self._elements = elements
+
+    def __getitem__(self, name: str) -> Parameter:
+        elements = self._elements
+        if name in elements._extra:
+            return elements._extra[name]
+        if name in elements._fields:
+            return getattr(elements, name)
+        raise KeyError(name)
+
+    def __setitem__(self, name: str, parameter: Parameter) -> None:
+        if not isinstance(parameter, Parameter):
+            raise TypeError(f"{name} must be set to a Parameter.")
+        self._elements.add_parameter(name, parameter.value, parameter.unit, parameter.description)
+
+    def __delitem__(self, name: str) -> None:
+        self._elements._remove_parameter(name)
+
+    def __iter__(self):
+        # Names are either in the element array or other parameters, never both
+        elements = self._elements
+        names = list(elements._extra)
+        names.extend(name for name in ORBIT_ELEMENT_FIELDS if name in elements._fields)
+        return iter(names)
+
+    def __len__(self) -> int:
+        return len(self._elements._extra) + len(self._elements._fields)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+# One record of an element array with the element axis last
+_RECORD_DTYPE = np.dtype({"names": list(ORBIT_ELEMENT_FIELDS),
+                          "formats": [float if isinstance(index, int) else (float, (index.stop - index.start,))
+                                      for index, _, _ in ORBIT_ELEMENT_FIELDS.values()],
+                          "offsets": [8*(index if isinstance(index, int) else index.start)
+                                      for index, _, _ in ORBIT_ELEMENT_FIELDS.values()],
+                          "itemsize": 8*NUM_ELEMENT_VALUES})
+
 class TwoBodyOrbitalModel():
 
     def __init__(self, position: list[float], velocity: list[float]):
@@ -161,125 +512,137 @@ class TwoBodyOrbitalModel():
         None
         """
 
-        r = self.position_norm
-        v = self.velocity_norm
-
-        # Specific Energy
-        # ---------------------------------------------------------------------
-        energy = v**2/2 - self.mu/r # Vis-Viva Equation
-        self.orbit_elements.add_parameter("E", energy, "km^2/sec^2",
-                                          description="Specific Energy")
-
-        # Specific Angular Momentum Vector
-        # ---------------------------------------------------------------------
-        ang_momentum = np.cross(self.position,self.velocity)
-        self.orbit_elements.add_parameter("h_vector", 
-                                          ang_momentum, "km^2/sec",
-                                          description="Specific Angular Momentum Vector")
-        self.orbit_elements.add_parameter("h",
-                                          norm(ang_momentum), "km^2/sec",
-                                          description="Magnitude of The Specific Angular Momentum Vector")
-
-        # Eccentricity Vector
-        # ---------------------------------------------------------------------
-        eccentricity = (1/self.mu)*(np.cross(self.velocity,ang_momentum))-self.position/r
-        self.orbit_elements.add_parameter("e_vector",
-                                          eccentricity, "",
-                                          description="Eccentricity Vector")
-        self.orbit_elements.add_parameter("e",
-                                          norm(eccentricity), "",
-                                          description="Magnitude of The Eccentricity Vector")
-
-        # Inclination
-        # ---------------------------------------------------------------------
-        incl = np.arccos(np.dot([0,0,1],ang_momentum)/norm(ang_momentum))
-        self.orbit_elements.add_parameter("i",
-                                          np.degrees(incl), "degrees",
-                                          description="Inclination")
-
-        # Ascending Node Vector 
-        # ---------------------------------------------------------------------
-        node_vec = np.cross([0,0,1],ang_momentum)
-        self.orbit_elements.add_parameter("N",
-                                          node_vec, "km^2/sec",
-                                          description="Ascending Node Vector")
-
-        # Longitude of Ascending Node (Ω)
-        # ---------------------------------------------------------------------
-        long_ascend_node = np.arccos(np.dot([1,0,0],node_vec)/norm(node_vec))
-
-        if node_vec[1] >= 0.0:
-            lan =  np.degrees(norm(long_ascend_node))
-        elif node_vec[1] < 0.0:
-            lan = np.degrees(2*np.pi - norm(long_ascend_node))
-        self.orbit_elements.add_parameter("Omega",
-                                          lan, "degrees",
-                                          description="Longitude of Ascending Node (Ω)")
-
-        # Argument of Perigee (ω)
-        # ---------------------------------------------------------------------
-        arg_peri = np.arccos(np.dot(node_vec,eccentricity) / 
-                            (norm(eccentricity)*norm(node_vec)))
-        # Check eccentricity z component
-        if eccentricity[-1] < 0:
-            arg_peri = 2*np.pi - arg_peri
-
-        self.orbit_elements.add_parameter("omega",
-                                          np.degrees(arg_peri), "degrees",
-                                          description="Argument of Perigee (ω)")
-
-        # Semi-latus Rectum
-        # ---------------------------------------------------------------------
-        p = norm(ang_momentum)*norm(ang_momentum)/self.mu
-        self.orbit_elements.add_parameter("p", p, "km",
-                                          description="Semi-latus Rectum")
-
-        # Semi-major Axis
-        # ---------------------------------------------------------------------
-        # a = p/self.mu*(1-norm(eccentricity)*norm(eccentricity))
-        a = -self.mu/(2*energy)
-        self.orbit_elements.add_parameter("a", a, "km",
-                                          description="Semi-major Axis")
-
-        # Mean Motion
-        # ---------------------------------------------------------------------
-        try:
-            n = math.sqrt(self.mu/(a**3))
-        except ValueError as e:
-            n = np.nan
-        self.orbit_elements.add_parameter("n", n, "rad/sec",
-                                          description="Mean Motion")
-
-        # Initial True Anomaly
-        # ---------------------------------------------------------------------
-        # f = np.arccos((p-r)/(r*norm(eccentricity)))
-        f = np.arccos(np.dot(eccentricity,self.position) / 
-                      (norm(eccentricity)*norm(self.position_norm)))
-        # Check orientation of True Anomaly
-        if np.dot(self.position,self.velocity) < 0:
-            f = 2*np.pi - f
-        self.orbit_elements.add_parameter("fi",
-                                          np.degrees(f), "degrees",
-                                          description="Initial True Anomaly")
-
-        # Initial Eccentric Anomaly
-        # ---------------------------------------------------------------------
-        ecc_anomaly = np.arccos((norm(eccentricity) + 
-                      np.cos(f))/(1+norm(eccentricity)*np.cos(f)))
-        self.orbit_elements.add_parameter("Ei",
-                                          np.degrees(ecc_anomaly), "degrees",
-                                          description="Initial Eccentric Anomaly")
-
-        # Mean Anomaly
-        # ---------------------------------------------------------------------
-        mean_anomaly = ecc_anomaly - norm(eccentricity)*np.sin(ecc_anomaly)
-        self.orbit_elements.add_parameter("Mi",
-                                          np.degrees(mean_anomaly), "degrees",
-                                          description="Initial Mean Anomaly")
-
-        # Orbital Period
-        # ---------------------------------------------------------------------
-        period = 2*np.pi / n
-        self.orbit_elements.add_parameter("period", period, "secs",
-                                          description="Period")
- 
\ No newline at end of file
+        elements = calc_orbit_elements_array(np.atleast_2d(self.position),
+                                             np.atleast_2d(self.velocity),
+                                             self.mu)
+
+        # Copy the single row of elements into the existing repository
+        self.orbit_elements.update(elements[0])
+
+
+def calc_orbit_elements_array(position: np.ndarray, velocity: np.ndarray, mu: float) -> OrbitElements:
+    """
+    Vectorized form of `TwoBodyOrbitalModel.calc_orbit_elements()`. Calculates the
+    Conservation Parameters, Keplerian Orbit Elements, Initial Anomaly Parameters and
+    the Orbital Period for N state vectors in a single pass over the arrays.
+
+    Each parameter of the returned OrbitElements holds a NumPy array with one row per
+    state vector, so scalar elements have shape (N,) and vector elements (h_vector,
+    e_vector, N) have shape (N, 3). The edge cases of the scalar method are kept: the
+    Mean Motion and Period of hyperbolic orbits are NaN and the quadrants of Ω, ω and
+    the Initial True Anomaly are resolved element-wise.
+
+    Parameters
+    ----------
+    position : np.ndarray
+        The (N, 3) position vectors in km.
+    velocity : np.ndarray
+        The (N, 3) velocity vectors in km/sec.
+    mu : float
+        The gravitational parameter of the central body in km^3/sec^2.
+
+    Returns
+    -------
+    OrbitElements
+        The orbital parameters of every state vector, named as in `calc_orbit_elements()`.
+
+    Examples
+    --------
+    elements = calc_orbit_elements_array(sc.numerical_position, sc.numerical_velocity, sc.mu)
+    """
+
+    position = np.asarray(position, dtype=float)
+    velocity = np.asarray(velocity, dtype=float)
+
+    # Every element is written into a single array laid out as in ORBIT_ELEMENT_FIELDS
+    data = np.empty((NUM_ELEMENT_VALUES,) + position.shape[:-1])
+
+    r = norm(position, axis=-1)
+    v = norm(velocity, axis=-1)
+
+    # Specific Energy
+    # ---------------------------------------------------------------------
+    energy = v**2/2 - mu/r # Vis-Viva Equation
+    data[_ELEMENT_INDEX["E"]] = energy
+
+    # Specific Angular Momentum Vector
+    # ---------------------------------------------------------------------
+    ang_momentum = np.cross(position, velocity)
+    h = norm(ang_momentum, axis=-1)
+    data[_ELEMENT_INDEX["h_vector"]] = np.moveaxis(ang_momentum, -1, 0)
+    data[_ELEMENT_INDEX["h"]] = h
+
+    # Eccentricity Vector
+    # ---------------------------------------------------------------------
+    eccentricity = (1/mu)*(np.cross(velocity, ang_momentum)) - position/r[..., np.newaxis]
+    e = norm(eccentricity, axis=-1)
+    data[_ELEMENT_INDEX["e_vector"]] = np.moveaxis(eccentricity, -1, 0)
+    data[_ELEMENT_INDEX["e"]] = e
+
+    # Inclination
+    # ---------------------------------------------------------------------
+    incl = np.arccos(ang_momentum[..., 2]/h)
+    data[_ELEMENT_INDEX["i"]] = np.degrees(incl)
+
+    # Ascending Node Vector 
+    # ---------------------------------------------------------------------
+    node_vec = np.cross([0, 0, 1], ang_momentum)
+    node = norm(node_vec, axis=-1)
+    data[_ELEMENT_INDEX["N"]] = np.moveaxis(node_vec, -1, 0)
+
+    # Longitude of Ascending Node (Ω)
+    # ---------------------------------------------------------------------
+    long_ascend_node = np.arccos(node_vec[..., 0]/node)
+    # Check node vector y component
+    lan = np.where(node_vec[..., 1] < 0.0, 2*np.pi - long_ascend_node, long_ascend_node)
+    data[_ELEMENT_INDEX["Omega"]] = np.degrees(lan)
+
+    # Argument of Perigee (ω)
+    # ---------------------------------------------------------------------
+    arg_peri = np.arccos(np.sum(node_vec*eccentricity, axis=-1)/(e*node))
+    # Check eccentricity z component
+    arg_peri = np.where(eccentricity[..., 2] < 0, 2*np.pi - arg_peri, arg_peri)
+    data[_ELEMENT_INDEX["omega"]] = np.degrees(arg_peri)
+
+    # Semi-latus Rectum
+    # ---------------------------------------------------------------------
+    p = h*h/mu
+    data[_ELEMENT_INDEX["p"]] = p
+
+    # Semi-major Axis
+    # ---------------------------------------------------------------------
+    a = -mu/(2*energy)
+    data[_ELEMENT_INDEX["a"]] = a
+
+    # Mean Motion
+    # ---------------------------------------------------------------------
+    # Undefined (NaN) for hyperbolic orbits
+    with np.errstate(invalid='ignore'):
+        n = np.sqrt(mu/(a**3))
+    data[_ELEMENT_INDEX["n"]] = n
+
+    # Initial True Anomaly
+    # ---------------------------------------------------------------------
+    f = np.arccos(np.sum(eccentricity*position, axis=-1)/(e*r))
+    # Check orientation of True Anomaly
+    f = np.where(np.sum(position*velocity, axis=-1) < 0, 2*np.pi - f, f)
+    data[_ELEMENT_INDEX["fi"]] = np.degrees(f)
+
+    # Initial Eccentric Anomaly
+    # ---------------------------------------------------------------------
+    # Undefined (NaN) for hyperbolic orbits
+    with np.errstate(invalid='ignore'):
+        ecc_anomaly = np.arccos((e + np.cos(f))/(1 + e*np.cos(f)))
+    data[_ELEMENT_INDEX["Ei"]] = np.degrees(ecc_anomaly)
+
+    # Mean Anomaly
+    # ---------------------------------------------------------------------
+    mean_anomaly = ecc_anomaly - e*np.sin(ecc_anomaly)
+    data[_ELEMENT_INDEX["Mi"]] = np.degrees(mean_anomaly)
+
+    # Orbital Period
+    # ---------------------------------------------------------------------
+    period = 2*np.pi / n
+    data[_ELEMENT_INDEX["period"]] = period
+
+    return OrbitElements(data)
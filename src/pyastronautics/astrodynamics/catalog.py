@@ -0,0 +1,368 @@
+"""
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+"""
+
+import numpy as np
+from typing import Union
+from numpy.linalg import norm
+
+from .base_model import OrbitElements, ORBIT_ELEMENT_FIELDS, calc_orbit_elements_array
+from .kepler import kepler_propagate
+from .two_body_problem import TwoBodyModel, TwoBodyBatchModel
+
+class OrbitCatalog(object):
+    """
+    Catalog of Two-Body objects orbiting one central body, stored as columns.
+
+    The state vectors of all objects are held in a single (N, 6) array and their orbit
+    elements in a single `OrbitElements` computed in one vectorized pass on first use, so
+    filters, sorting and propagation operate on whole columns instead of looping over
+    `TwoBodyModel` instances. Filtering, sorting and indexing return new catalogs that
+    carry over the already computed elements.
+
+    Columns are the orbit elements of `ORBIT_ELEMENT_FIELDS`, e.g. "a", "e" or "i", and
+    the derived columns:
+        - "radius", "speed": magnitude of the position and velocity vectors
+        - "perigee_radius", "apogee_radius": in km, the apogee of open orbits is infinite
+        - "perigee_altitude", "apogee_altitude": above `body_radius` in km
+
+    Attributes
+    ----------
+    states : np.ndarray
+        The read-only (N, 6) state vectors [x, y, z, vx, vy, vz] in km and km/sec.
+    ids : np.ndarray
+        The (N,) identifiers of the objects, default is their index.
+    mu : float
+        The gravitational parameter of the central body, set to Earth's gravitational
+        constant (3.986004418E+05 km^3/sec^2) by default.
+    body_radius : float
+        The radius of the central body used for altitudes, set to Earth's equatorial
+        radius (6378.1363 km) by default.
+    abs_tol : float
+        Absolute tolerance of numerical propagation, default is 1e-10.
+    rel_tol : float
+        Relative tolerance of numerical propagation, default is 1e-10.
+
+    Examples
+    --------
+    catalog = OrbitCatalog(states)
+    leo = catalog.filter(perigee_altitude=(None, 2000), i=(50, 60)).sort("a")
+    """
+
+    def __init__(self, states: Union[list, np.ndarray], ids: Union[list, np.ndarray] = None,
+                 mu: float = 3.986004418E+05):
+        """
+        Initialize the OrbitCatalog instance with an array of state vectors.
+
+        Parameters
+        ----------
+        states : Union[list, np.ndarray]
+            The (N, 6) state vectors [x, y, z, vx, vy, vz] in km and km/sec.
+        ids : Union[list, np.ndarray], optional
+            The (N,) identifiers of the objects. Defaults to None, their index.
+        mu : float, optional
+            The gravitational parameter of the central body in km^3/sec^2. Defaults to Earth.
+
+        Raises
+        ------
+        ValueError
+            If states does not have shape (N, 6) or ids does not have N entries.
+        """
+        states = np.array(states, dtype=float)
+        if states.ndim != 2 or states.shape[1] != 6:
+            raise ValueError("states must have shape (N, 6).")
+        states.flags.writeable = False
+
+        ids = np.arange(len(states)) if ids is None else np.asarray(ids)
+        if ids.shape != (len(states),):
+            raise ValueError("ids must have one entry per state.")
+
+        self.states = states
+        self.ids = ids
+        self._mu = mu
+        # Orbit elements of every state, computed on first use
+        self._elements = None
+
+        # Default Set to Earth
+        self.body_radius = 6378.1363 # km
+
+        # Default tolerance values
+        self.abs_tol = 1e-10
+        self.rel_tol = 1e-10
+
+    @classmethod
+    def from_models(cls, models: list[TwoBodyModel], ids: Union[list, np.ndarray] = None) -> "OrbitCatalog":
+        """
+        Create a catalog from existing TwoBodyModel instances sharing one central body.
+
+        Parameters
+        ----------
+        models : list[TwoBodyModel]
+            The objects of the catalog, their initial state vectors are used.
+        ids : Union[list, np.ndarray], optional
+            The (N,) identifiers of the objects. Defaults to None, their index.
+
+        Raises
+        ------
+        ValueError
+            If no models are given or the models do not share the same `mu`.
+
+        Returns
+        -------
+        OrbitCatalog
+            A catalog using the `mu` and tolerances of the first model.
+        """
+        if len(models) == 0:
+            raise ValueError("models must contain at least one TwoBodyModel.")
+        if any(model.mu != models[0].mu for model in models):
+            raise ValueError("models must share the same gravitational parameter mu.")
+
+        catalog = cls([model.initial_state_vector for model in models], ids=ids, mu=models[0].mu)
+        catalog.abs_tol = models[0].abs_tol
+        catalog.rel_tol = models[0].rel_tol
+
+        return catalog
+
+    def to_models(self) -> list[TwoBodyModel]:
+        """
+        Create one TwoBodyModel per object of the catalog.
+
+        Returns
+        -------
+        list[TwoBodyModel]
+            The models, using the `mu` and tolerances of the catalog.
+        """
+        models = []
+        for state in self.states:
+            model = TwoBodyModel(state[:3].tolist(), state[3:].tolist())
+            model.mu = self.mu
+            model.abs_tol = self.abs_tol
+            model.rel_tol = self.rel_tol
+            models.append(model)
+        return models
+
+    @property
+    def mu(self) -> float:
+        """The gravitational parameter of the central body in km^3/sec^2."""
+        return self._mu
+
+    @mu.setter
+    def mu(self, value: float) -> None:
+        # The elements depend on mu
+        self._mu = value
+        self._elements = None
+
+    @property
+    def position(self) -> np.ndarray:
+        """The (N, 3) position vectors in km."""
+        return self.states[:, :3]
+
+    @property
+    def velocity(self) -> np.ndarray:
+        """The (N, 3) velocity vectors in km/sec."""
+        return self.states[:, 3:]
+
+    @property
+    def elements(self) -> OrbitElements:
+        """The orbit elements of every object, with (N,) scalar and (N, 3) vector elements."""
+        if self._elements is None:
+            self._elements = calc_orbit_elements_array(self.position, self.velocity, self.mu)
+        return self._elements
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Values of an orbit element or derived column for every object.
+
+        Parameters
+        ----------
+        name : str
+            The name of the column, e.g. "a", "i" or "perigee_altitude".
+
+        Raises
+        ------
+        ValueError
+            If the column is unknown.
+
+        Returns
+        -------
+        np.ndarray
+            The (N,) values, or (N, 3) for vector elements.
+        """
+        if name in ORBIT_ELEMENT_FIELDS:
+            return getattr(self.elements, name).value
+
+        if name == "radius":
+            return norm(self.position, axis=1)
+        if name == "speed":
+            return norm(self.velocity, axis=1)
+
+        p, e = self.elements.p.value, self.elements.e.value
+        if name in ("perigee_radius", "perigee_altitude"):
+            radius = p/(1 + e)
+        elif name in ("apogee_radius", "apogee_altitude"):
+            with np.errstate(divide='ignore'):
+                radius = np.where(e < 1, p/(1 - e), np.inf)
+        else:
+            raise ValueError(f"Unknown column '{name}'.")
+
+        return radius - self.body_radius if name.endswith("altitude") else radius
+
+    def filter(self, **bounds: tuple) -> "OrbitCatalog":
+        """
+        Select the objects whose columns lie within inclusive bounds.
+
+        Parameters
+        ----------
+        **bounds : tuple
+            (low, high) bounds of scalar columns, either bound may be None, e.g.
+            `perigee_altitude=(300, 2000)` or `e=(None, 0.01)`. Objects with a NaN value
+            in a bounded column are excluded.
+
+        Raises
+        ------
+        ValueError
+            If a column is unknown or is a vector element.
+
+        Returns
+        -------
+        OrbitCatalog
+            The catalog of the selected objects.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for name, (low, high) in bounds.items():
+            values = self.column(name)
+            if values.ndim != 1:
+                raise ValueError(f"Column '{name}' is not a scalar column.")
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+
+        return self[mask]
+
+    def argsort(self, by: str, descending: bool = False) -> np.ndarray:
+        """
+        Indices that sort the catalog by a scalar column, with NaN values last.
+
+        Parameters
+        ----------
+        by : str
+            The name of the column.
+        descending : bool, optional
+            If True, sort from the largest value. Defaults to False.
+
+        Raises
+        ------
+        ValueError
+            If the column is unknown or is a vector element.
+
+        Returns
+        -------
+        np.ndarray
+            The (N,) indices.
+        """
+        values = self.column(by)
+        if values.ndim != 1:
+            raise ValueError(f"Column '{by}' is not a scalar column.")
+        return np.argsort(-values if descending else values, kind='stable')
+
+    def sort(self, by: str, descending: bool = False) -> "OrbitCatalog":
+        """
+        Sort the catalog by a scalar column, e.g. `catalog.sort("a")`, see `argsort()`.
+
+        Returns
+        -------
+        OrbitCatalog
+            The sorted catalog.
+        """
+        return self[self.argsort(by, descending)]
+
+    def propagate(self, time: Union[list, np.ndarray], method: str = "kepler") -> np.ndarray:
+        """
+        Propagate every object over a shared time grid.
+
+        Parameters
+        ----------
+        time : Union[list, np.ndarray]
+            The (T,) times in seconds relative to the epoch of the catalog states.
+        method : str, optional
+            "kepler" propagates analytically with `kepler_propagate()`, "numerical"
+            integrates all objects as one system with `TwoBodyBatchModel` using the
+            catalog tolerances. Defaults to "kepler".
+
+        Raises
+        ------
+        ValueError
+            If the method is unknown.
+
+        Returns
+        -------
+        np.ndarray
+            The (N, T, 6) propagated state vectors.
+        """
+        time = np.asarray(time, dtype=float)
+
+        if method == "kepler":
+            position, velocity = kepler_propagate(self.position, self.velocity, time, self.mu)
+            return np.concatenate((position, velocity), axis=-1)
+
+        if method == "numerical":
+            batch = TwoBodyBatchModel(self.states)
+            batch.mu = self.mu
+            batch.abs_tol = self.abs_tol
+            batch.rel_tol = self.rel_tol
+            batch.verbose = False
+            batch.time = time
+            batch.solve_trajectory()
+            return batch.states
+
+        raise ValueError(f"Unknown propagation method '{method}'. Expected 'kepler' or 'numerical'.")
+
+    def advance(self, dt: float, method: str = "kepler") -> "OrbitCatalog":
+        """
+        Catalog of the same objects propagated by a time offset, see `propagate()`.
+
+        Parameters
+        ----------
+        dt : float
+            The time offset in seconds.
+        method : str, optional
+            "kepler" or "numerical". Defaults to "kepler".
+
+        Returns
+        -------
+        OrbitCatalog
+            The catalog at the new epoch, with the same ids and settings.
+        """
+        return self._subset(slice(None), self.propagate([0.0, dt], method)[:, -1])
+
+    def __getitem__(self, index) -> "OrbitCatalog":
+        """
+        Select objects by integer, slice, integer array or boolean mask, e.g.
+        `catalog[catalog.column("e") < 0.1]`. An integer selects a catalog of one object.
+        """
+        if isinstance(index, (int, np.integer)):
+            index = [index]
+        return self._subset(index)
+
+    def _subset(self, index, states: np.ndarray = None) -> "OrbitCatalog":
+        """Catalog of the selected objects with the same settings, and elements when states are kept."""
+        catalog = OrbitCatalog(self.states[index] if states is None else states,
+                               ids=self.ids[index], mu=self.mu)
+        catalog.body_radius = self.body_radius
+        catalog.abs_tol = self.abs_tol
+        catalog.rel_tol = self.rel_tol
+
+        if states is None and self._elements is not None:
+            catalog._elements = self._elements[index]
+
+        return catalog
+
+    def __len__(self) -> int:
+        """The number of objects in the catalog."""
+        return len(self.states)
+
+    def __repr__(self) -> str:
+        """Return a string representation of the catalog."""
+        return f"OrbitCatalog({len(self)} objects)"
@@ -0,0 +1,166 @@
+"""
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+"""
+
+import numpy as np
+from typing import Union
+
+# Prebuilt event functions for `scipy.integrate.solve_ivp()`. Each factory returns a
+# function event(t, y) whose zero crossings are located by the solver to within its
+# tolerances, so events are found precisely from a coarse output grid. Only the first six
+# components [x, y, z, vx, vy, vz] of the state are used, so the events also apply to
+# states augmented with the State Transition Matrix.
+
+def plane_crossing(axis: int = 1, value: float = 0.0, direction: float = 0,
+                   terminal: bool = False) -> callable:
+    """
+    Event triggered when a position coordinate crosses a constant value, e.g. the x-axis
+    (y = 0) crossings of a CR3BP trajectory.
+
+    Parameters
+    ----------
+    axis : int, optional
+        Index of the position coordinate, 0 for x, 1 for y and 2 for z. Defaults to 1.
+    value : float, optional
+        The value of the coordinate at the plane. Defaults to 0.0.
+    direction : float, optional
+        Only trigger on crossings with increasing (1) or decreasing (-1) coordinate, or
+        on both (0). Defaults to 0.
+    terminal : bool, optional
+        If True, the integration stops at the first crossing. Defaults to False.
+
+    Raises
+    ------
+    ValueError
+        If axis is not 0, 1 or 2.
+
+    Returns
+    -------
+    callable
+        The event function event(t, y).
+    """
+    if axis not in (0, 1, 2):
+        raise ValueError("axis must be 0, 1 or 2.")
+
+    def event(t, y):
+        return y[axis] - value
+
+    return _set_flags(event, terminal, direction)
+
+def periapsis(center: Union[list, np.ndarray] = (0.0, 0.0, 0.0),
+              terminal: bool = False) -> callable:
+    """
+    Event triggered at closest approach to a body, where the radial velocity changes
+    from negative to positive.
+
+    Parameters
+    ----------
+    center : Union[list, np.ndarray], optional
+        Position of the body, e.g. `cr3bp_primary_position(mass_ratio, 2)` for the secondary
+        of a CR3BP. Defaults to the origin.
+    terminal : bool, optional
+        If True, the integration stops at the first periapsis. Defaults to False.
+
+    Returns
+    -------
+    callable
+        The event function event(t, y).
+    """
+    return _set_flags(_radial_velocity(center), terminal, 1)
+
+def apoapsis(center: Union[list, np.ndarray] = (0.0, 0.0, 0.0),
+             terminal: bool = False) -> callable:
+    """
+    Event triggered at furthest distance from a body, where the radial velocity changes
+    from positive to negative.
+
+    Parameters
+    ----------
+    center : Union[list, np.ndarray], optional
+        Position of the body. Defaults to the origin.
+    terminal : bool, optional
+        If True, the integration stops at the first apoapsis. Defaults to False.
+
+    Returns
+    -------
+    callable
+        The event function event(t, y).
+    """
+    return _set_flags(_radial_velocity(center), terminal, -1)
+
+def impact(radius: float, center: Union[list, np.ndarray] = (0.0, 0.0, 0.0),
+           terminal: bool = True) -> callable:
+    """
+    Event triggered when the trajectory descends through a sphere around a body, e.g. the
+    surface of the central body.
+
+    Parameters
+    ----------
+    radius : float
+        Radius of the sphere in the units of the model.
+    center : Union[list, np.ndarray], optional
+        Position of the body. Defaults to the origin.
+    terminal : bool, optional
+        If True, the integration stops at impact. Defaults to True.
+
+    Raises
+    ------
+    ValueError
+        If radius is not positive.
+
+    Returns
+    -------
+    callable
+        The event function event(t, y).
+    """
+    if radius <= 0:
+        raise ValueError("radius must be positive.")
+    center = np.asarray(center, dtype=float)
+
+    def event(t, y):
+        return np.sqrt(np.sum((y[:3] - center)**2)) - radius
+
+    return _set_flags(event, terminal, -1)
+
+def cr3bp_primary_position(mass_ratio: float, body: int = 1) -> np.ndarray:
+    """
+    Position of a primary in the non-dimensional rotating frame of the CR3BP.
+
+    Parameters
+    ----------
+    mass_ratio : float
+        The mass ratio of the system.
+    body : int, optional
+        1 for the larger primary at (-mu, 0, 0), 2 for the smaller at (1 - mu, 0, 0).
+        Defaults to 1.
+
+    Raises
+    ------
+    ValueError
+        If body is not 1 or 2.
+
+    Returns
+    -------
+    np.ndarray
+        The (3,) position of the primary.
+    """
+    if body not in (1, 2):
+        raise ValueError("body must be 1 or 2.")
+    x = -mass_ratio if body == 1 else 1 - mass_ratio
+    return np.array([x, 0.0, 0.0])
+
+def _radial_velocity(center: Union[list, np.ndarray]) -> callable:
+    """Event function proportional to the radial velocity relative to center."""
+    center = np.asarray(center, dtype=float)
+
+    def event(t, y):
+        return np.dot(y[:3] - center, y[3:6])
+
+    return event
+
+def _set_flags(event: callable, terminal: bool, direction: float) -> callable:
+    """Attach the solve_ivp terminal and direction attributes to an event function."""
+    event.terminal = terminal
+    event.direction = direction
+    return event
@@ -0,0 +1,247 @@
+"""
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+"""
+
+import time
+import tracemalloc
+import numpy as np
+from typing import Union
+import scipy.integrate
+from scipy.integrate import solve_ivp
+from scipy.optimize import OptimizeResult
+
+from .integrators import integrate, FIXED_STEP_CALLS
+
+# Explicit Runge-Kutta methods whose rejected steps are counted
+RUNGE_KUTTA_METHODS = ("RK45", "RK23", "DOP853")
+
+class SolverReport(object):
+    """
+    Performance statistics of a single integration, see `instrumented_integrate()`.
+
+    Attributes
+    ----------
+    method : str
+        The integration method.
+    success : bool
+        True if the solver reached the end of the interval or a termination event.
+    status : int
+        The solver status, see `scipy.integrate.solve_ivp()`.
+    nfev : int
+        The number of right-hand side evaluations reported by the solver.
+    njev : int
+        The number of Jacobian evaluations reported by the solver.
+    nlu : int
+        The number of LU decompositions reported by the solver.
+    rhs_calls : int
+        The number of right-hand side calls measured, including those of the dense output.
+    accepted_steps : int
+        The number of accepted steps, None for the implicit methods and LSODA.
+    rejected_steps : int
+        The number of rejected step attempts, None for the implicit methods and LSODA.
+    wall_time : float
+        The wall time of the whole integration in seconds.
+    rhs_time : float
+        The wall time spent in the right-hand side in seconds.
+    peak_memory : int
+        The peak memory in bytes allocated during the integration and traced by
+        `tracemalloc`, which includes NumPy arrays. None when memory is not tracked.
+    """
+
+    def __init__(self, method: str, success: bool, status: int, nfev: int, njev: int,
+                 nlu: int, rhs_calls: int, accepted_steps: int, rejected_steps: int,
+                 wall_time: float, rhs_time: float, peak_memory: int = None):
+        """
+        Initialize the SolverReport instance, see the class attributes.
+        """
+        self.method = method
+        self.success = success
+        self.status = status
+        self.nfev = nfev
+        self.njev = njev
+        self.nlu = nlu
+        self.rhs_calls = rhs_calls
+        self.accepted_steps = accepted_steps
+        self.rejected_steps = rejected_steps
+        self.wall_time = wall_time
+        self.rhs_time = rhs_time
+        self.peak_memory = peak_memory
+
+    @property
+    def integrator_time(self) -> float:
+        """The wall time spent outside the right-hand side in seconds."""
+        return self.wall_time - self.rhs_time
+
+    @property
+    def rejection_ratio(self) -> float:
+        """The fraction of step attempts that were rejected, None when steps are not counted."""
+        if self.accepted_steps is None or self.rejected_steps is None:
+            return None
+        attempts = self.accepted_steps + self.rejected_steps
+        return self.rejected_steps/attempts if attempts else 0.0
+
+    def as_dict(self) -> dict:
+        """
+        Return the statistics as a flat dictionary of Python scalars, e.g. for a metrics
+        pipeline or a JSON log.
+
+        Returns
+        -------
+        dict
+            Every attribute along with `integrator_time` and `rejection_ratio`.
+        """
+        return {"method": self.method,
+                "success": bool(self.success),
+                "status": int(self.status),
+                "nfev": int(self.nfev),
+                "njev": int(self.njev),
+                "nlu": int(self.nlu),
+                "rhs_calls": self.rhs_calls,
+                "accepted_steps": self.accepted_steps,
+                "rejected_steps": self.rejected_steps,
+                "rejection_ratio": self.rejection_ratio,
+                "wall_time": self.wall_time,
+                "rhs_time": self.rhs_time,
+                "integrator_time": self.integrator_time,
+                "peak_memory": self.peak_memory}
+
+    def __repr__(self) -> str:
+        """Return a string representation of the report."""
+        steps = "" if self.accepted_steps is None else \
+            f", steps={self.accepted_steps}/{self.rejected_steps} accepted/rejected"
+        memory = "" if self.peak_memory is None else f", peak_memory={self.peak_memory} B"
+        return (f"SolverReport(method='{self.method}', success={self.success}, "
+                f"nfev={self.nfev}{steps}, wall_time={self.wall_time:.4g} s, "
+                f"rhs_time={self.rhs_time:.4g} s{memory})")
+
+
+def instrumented_integrate(fun: callable, t_span: list, y0: Union[list, np.ndarray],
+                           t_eval: Union[list, np.ndarray] = None, method: str = "RK45",
+                           rtol: float = 1e-3, atol: float = 1e-6, step_size: float = None,
+                           track_memory: bool = False, callback: callable = None,
+                           **options) -> OptimizeResult:
+    """
+    Integrate a system of ordinary differential equations like `integrators.integrate()`
+    while recording a `SolverReport` of the run.
+
+    The right-hand side is wrapped to count and time every call. Accepted and rejected
+    steps are counted for the explicit Runge-Kutta methods, whose every step attempt costs
+    a fixed number of right-hand side calls, and for the fixed-step methods. The timers add
+    roughly a microsecond per right-hand side call, and tracking memory with `tracemalloc`
+    slows down every allocation, so only instrument the runs that are being investigated.
+
+    Parameters
+    ----------
+    fun : callable
+        Right-hand side of the system with signature fun(t, y).
+    t_span : list
+        Interval of integration [t0, tf].
+    y0 : Union[list, np.ndarray]
+        Initial state.
+    t_eval : Union[list, np.ndarray], optional
+        Times at which to store the solution. Defaults to None.
+    method : str, optional
+        The integration method, see `integrators.integrate()`. Defaults to "RK45".
+    rtol : float, optional
+        Relative tolerance, only used by adaptive methods. Defaults to 1e-3.
+    atol : float, optional
+        Absolute tolerance, only used by adaptive methods. Defaults to 1e-6.
+    step_size : float, optional
+        Maximum step size of fixed-step methods. Defaults to None.
+    track_memory : bool, optional
+        If True, the peak memory allocated during the integration is traced. If
+        `tracemalloc` is already tracing, its peak is reset. Defaults to False.
+    callback : callable, optional
+        Function callback(report) called with the `SolverReport` once the integration
+        ends. Defaults to None.
+    **options
+        Additional keyword arguments passed to `solve_ivp()`.
+
+    Raises
+    ------
+    ValueError
+        If the method is unknown, or options are given to a fixed-step method.
+
+    Returns
+    -------
+    OptimizeResult
+        The solution of `integrators.integrate()` with the additional field `report`
+        holding the `SolverReport`.
+    """
+
+    rhs = _TimedFunction(fun)
+    steps = {"accepted": 0, "attempts": 0}
+
+    started_tracing = track_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    elif track_memory:
+        tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0] if track_memory else 0
+
+    try:
+        start = time.perf_counter()
+        if method in RUNGE_KUTTA_METHODS:
+            sol = solve_ivp(rhs, t_span, y0, method=_counting_solver(method, rhs, steps),
+                            t_eval=t_eval, rtol=rtol, atol=atol, **options)
+        else:
+            sol = integrate(rhs, t_span, y0, t_eval=t_eval, method=method, rtol=rtol,
+                            atol=atol, step_size=step_size, **options)
+        wall_time = time.perf_counter() - start
+
+        peak_memory = tracemalloc.get_traced_memory()[1] - baseline if track_memory else None
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    # Step Statistics
+    # ---------------------------------------------------------------------
+    if method in RUNGE_KUTTA_METHODS:
+        accepted_steps = steps["accepted"]
+        rejected_steps = steps["attempts"] - steps["accepted"]
+    elif method in FIXED_STEP_CALLS:
+        accepted_steps = rhs.calls//FIXED_STEP_CALLS[method]
+        rejected_steps = 0
+    else:
+        accepted_steps = rejected_steps = None
+
+    sol.report = SolverReport(method, sol.success, sol.status, sol.nfev, sol.njev, sol.nlu,
+                              rhs.calls, accepted_steps, rejected_steps, wall_time,
+                              rhs.time, peak_memory)
+
+    if callback is not None:
+        callback(sol.report)
+
+    return sol
+
+class _TimedFunction(object):
+    """Right-hand side wrapper counting and timing its calls."""
+
+    def __init__(self, fun: callable):
+        self.fun = fun
+        self.calls = 0
+        self.time = 0.0
+
+    def __call__(self, t, y, *args):
+        start = time.perf_counter()
+        derivative = self.fun(t, y, *args)
+        self.time += time.perf_counter() - start
+        self.calls += 1
+        return derivative
+
+def _counting_solver(method: str, rhs: _TimedFunction, steps: dict) -> type:
+    """Subclass of a Runge-Kutta `OdeSolver` counting its accepted steps and step attempts."""
+    base = getattr(scipy.integrate, method)
+
+    class CountingSolver(base):
+        def _step_impl(self):
+            calls = rhs.calls
+            success, message = super()._step_impl()
+            # Every attempt evaluates each stage once, the last one at the new state
+            steps["attempts"] += (rhs.calls - calls)//self.n_stages
+            steps["accepted"] += bool(success)
+            return success, message
+
+    CountingSolver.__name__ = base.__name__
+    return CountingSolver
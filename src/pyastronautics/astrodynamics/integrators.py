@@ -0,0 +1,355 @@
+"""
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+"""
+
+import numpy as np
+from typing import Union
+import scipy.integrate
+from scipy.integrate import solve_ivp
+from scipy.optimize import OptimizeResult
+
+# Adaptive methods handed to scipy.integrate.solve_ivp()
+SOLVE_IVP_METHODS = ("RK45", "RK23", "DOP853", "Radau", "BDF", "LSODA")
+# Fixed-step methods built into this module
+FIXED_STEP_METHODS = ("RK8", "symplectic")
+
+def integrate(fun: callable, t_span: list, y0: Union[list, np.ndarray],
+              t_eval: Union[list, np.ndarray] = None, method: str = "RK45",
+              rtol: float = 1e-3, atol: float = 1e-6, step_size: float = None,
+              **options) -> OptimizeResult:
+    """
+    Integrate a system of ordinary differential equations with either an adaptive
+    `scipy.integrate.solve_ivp()` method or one of the built-in fixed-step methods.
+
+    Available methods:
+        - "RK45", "RK23", "DOP853", "Radau", "BDF", "LSODA": passed to `solve_ivp()`
+        - "RK8": fixed-step 8th order Runge-Kutta using the Dormand-Prince (DOP853)
+          coefficients without error control
+        - "symplectic": fixed-step 4th order Yoshida integrator. Only valid when the
+          state is [position, velocity] and the acceleration does not depend on
+          velocity, e.g. the Two-Body Problem
+
+    Parameters
+    ----------
+    fun : callable
+        Right-hand side of the system with signature fun(t, y).
+    t_span : list
+        Interval of integration [t0, tf].
+    y0 : Union[list, np.ndarray]
+        Initial state.
+    t_eval : Union[list, np.ndarray], optional
+        Times at which to store the solution. Fixed-step methods step exactly onto
+        every one of these times. Defaults to None.
+    method : str, optional
+        The integration method. Defaults to "RK45".
+    rtol : float, optional
+        Relative tolerance, only used by adaptive methods. Defaults to 1e-3.
+    atol : float, optional
+        Absolute tolerance, only used by adaptive methods. Defaults to 1e-6.
+    step_size : float, optional
+        Maximum step size of fixed-step methods. Each interval between output times is
+        split into equal steps no larger than this value. Defaults to None, which takes
+        one step per output interval.
+    **options
+        Additional keyword arguments passed to `solve_ivp()`.
+
+    Raises
+    ------
+    ValueError
+        If the method is unknown, or options are given to a fixed-step method.
+
+    Returns
+    -------
+    OptimizeResult
+        The solution with the same fields as `solve_ivp()`: t, y, nfev, njev, nlu,
+        status, message and success.
+    """
+
+    if method in SOLVE_IVP_METHODS:
+        return solve_ivp(fun, t_span, y0, method=method, t_eval=t_eval,
+                         rtol=rtol, atol=atol, **options)
+
+    if method not in FIXED_STEP_METHODS:
+        raise ValueError(f"Unknown integrator '{method}'. Expected one of "
+                         f"{SOLVE_IVP_METHODS + FIXED_STEP_METHODS}.")
+    if options:
+        raise ValueError(f"Integrator '{method}' does not support options: {', '.join(options)}.")
+
+    # Output grid, always including the initial time
+    t_out = np.asarray(t_span if t_eval is None else t_eval, dtype=float)
+    if t_out[0] != t_span[0]:
+        t_out = np.concatenate(([t_span[0]], t_out))
+        drop_initial = True
+    else:
+        drop_initial = False
+
+    step = _rk8_step if method == "RK8" else _symplectic_step
+
+    y = np.array(y0, dtype=float)
+    y_out = np.empty((len(y), len(t_out)))
+    y_out[:, 0] = y
+    nfev = 0
+
+    for k in range(1, len(t_out)):
+        interval = t_out[k] - t_out[k-1]
+        num_steps = 1 if step_size is None else max(1, int(np.ceil(abs(interval)/step_size)))
+        h = interval/num_steps
+
+        t = t_out[k-1]
+        for _ in range(num_steps):
+            y, calls = step(fun, t, y, h)
+            t = t + h
+            nfev += calls
+
+        y_out[:, k] = y
+
+    if drop_initial:
+        t_out, y_out = t_out[1:], y_out[:, 1:]
+
+    return OptimizeResult(t=t_out, y=y_out, sol=None, t_events=None, y_events=None,
+                          nfev=nfev, njev=0, nlu=0, status=0,
+                          message="The solver successfully reached the end of the integration interval.",
+                          success=True)
+
+def iter_integrate(fun: callable, t_eval: Union[list, np.ndarray], y0: Union[list, np.ndarray],
+                   method: str = "RK45", rtol: float = 1e-3, atol: float = 1e-6,
+                   step_size: float = None, chunk_size: int = 1000):
+    """
+    Integrate a system of ordinary differential equations over `t_eval`, yielding the
+    solution in chunks of consecutive output times instead of returning it all at once.
+
+    Adaptive methods step a single `scipy.integrate.OdeSolver` across the whole interval
+    and evaluate its local interpolant at the output times crossed by each step, so the
+    result matches `integrate()` without restarting the solver between chunks. Fixed-step
+    methods integrate each chunk from the last state of the previous one. Only the current
+    chunk is held in memory.
+
+    Parameters
+    ----------
+    fun : callable
+        Right-hand side of the system with signature fun(t, y).
+    t_eval : Union[list, np.ndarray]
+        Monotonic output times, the integration starts at `t_eval[0]` from `y0`.
+    y0 : Union[list, np.ndarray]
+        Initial state.
+    method : str, optional
+        The integration method, see `integrate()`. Defaults to "RK45".
+    rtol : float, optional
+        Relative tolerance, only used by adaptive methods. Defaults to 1e-3.
+    atol : float, optional
+        Absolute tolerance, only used by adaptive methods. Defaults to 1e-6.
+    step_size : float, optional
+        Maximum step size of fixed-step methods. Defaults to None.
+    chunk_size : int, optional
+        The number of output times in each yielded chunk. Defaults to 1000.
+
+    Raises
+    ------
+    ValueError
+        If the method is unknown, or chunk_size is not positive.
+    RuntimeError
+        If an adaptive solver fails before reaching the end of the interval.
+
+    Yields
+    ------
+    tuple
+        A tuple containing:
+            - t : numpy.ndarray
+                The (M,) output times of the chunk.
+            - y : numpy.ndarray
+                The (M, n) states at those times.
+    """
+
+    if method not in SOLVE_IVP_METHODS + FIXED_STEP_METHODS:
+        raise ValueError(f"Unknown integrator '{method}'. Expected one of "
+                         f"{SOLVE_IVP_METHODS + FIXED_STEP_METHODS}.")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+
+    t_eval = np.asarray(t_eval, dtype=float)
+    y = np.array(y0, dtype=float)
+
+    # Fixed-Step Methods
+    # ---------------------------------------------------------------------
+    if method in FIXED_STEP_METHODS:
+        t_previous = t_eval[0]
+        for start in range(0, len(t_eval), chunk_size):
+            t_chunk = t_eval[start:start + chunk_size]
+            result = integrate(fun, [t_previous, t_chunk[-1]], y, t_eval=t_chunk,
+                               method=method, step_size=step_size)
+            y = result.y[:, -1]
+            t_previous = t_chunk[-1]
+            yield result.t, result.y.T
+        return
+
+    # Adaptive Methods
+    # ---------------------------------------------------------------------
+    solver = getattr(scipy.integrate, method)(fun, t_eval[0], y, t_eval[-1],
+                                              rtol=rtol, atol=atol)
+    # Work with increasing times for both integration directions
+    direction = 1.0 if t_eval[-1] >= t_eval[0] else -1.0
+    t_sorted = direction*t_eval
+
+    t_buffer = np.empty(chunk_size)
+    y_buffer = np.empty((chunk_size, len(y)))
+    filled = 0
+    index = 0
+
+    while index < len(t_eval):
+        if index == 0:
+            # The initial state is part of the output
+            stop, dense = 1, None
+        else:
+            if solver.status != "running":
+                raise RuntimeError(f"Integration stopped at t = {solver.t}: {solver.status}.")
+            message = solver.step()
+            if solver.status == "failed":
+                raise RuntimeError(f"Integration failed at t = {solver.t}: {message}")
+            stop = np.searchsorted(t_sorted, direction*solver.t, side="right")
+            if solver.status == "finished":
+                stop = len(t_eval)
+            dense = solver.dense_output()
+
+        while index < stop:
+            count = min(stop - index, chunk_size - filled)
+            t_step = t_eval[index:index + count]
+            t_buffer[filled:filled + count] = t_step
+            y_buffer[filled:filled + count] = y if dense is None else dense(t_step).T
+            filled += count
+            index += count
+
+            if filled == chunk_size:
+                yield t_buffer, y_buffer
+                t_buffer = np.empty(chunk_size)
+                y_buffer = np.empty((chunk_size, len(y)))
+                filled = 0
+
+    if filled:
+        yield t_buffer[:filled], y_buffer[:filled]
+
+# Dormand-Prince 8th Order Tableau
+# ---------------------------------------------------------------------
+# The 12 stages of the 8th order solution of DOP853 (Hairer, Norsett & Wanner)
+RK8_N_STAGES = 12
+
+RK8_C = np.array([0.0,
+                  0.526001519587677318785587544488e-01,
+                  0.789002279381515978178381316732e-01,
+                  0.118350341907227396726757197510,
+                  0.281649658092772603273242802490,
+                  0.333333333333333333333333333333,
+                  0.25,
+                  0.307692307692307692307692307692,
+                  0.651282051282051282051282051282,
+                  0.6,
+                  0.857142857142857142857142857142,
+                  1.0])
+
+RK8_A = np.zeros((RK8_N_STAGES, RK8_N_STAGES))
+RK8_A[1, 0] = 5.26001519587677318785587544488e-2
+
+RK8_A[2, 0] = 1.97250569845378994544595329183e-2
+RK8_A[2, 1] = 5.91751709536136983633785987549e-2
+
+RK8_A[3, 0] = 2.95875854768068491816892993775e-2
+RK8_A[3, 2] = 8.87627564304205475450678981324e-2
+
+RK8_A[4, 0] = 2.41365134159266685502369798665e-1
+RK8_A[4, 2] = -8.84549479328286085344864962717e-1
+RK8_A[4, 3] = 9.24834003261792003115737966543e-1
+
+RK8_A[5, 0] = 3.7037037037037037037037037037e-2
+RK8_A[5, 3] = 1.70828608729473871279604482173e-1
+RK8_A[5, 4] = 1.25467687566822425016691814123e-1
+
+RK8_A[6, 0] = 3.7109375e-2
+RK8_A[6, 3] = 1.70252211019544039314978060272e-1
+RK8_A[6, 4] = 6.02165389804559606850219397283e-2
+RK8_A[6, 5] = -1.7578125e-2
+
+RK8_A[7, 0] = 3.70920001185047927108779319836e-2
+RK8_A[7, 3] = 1.70383925712239993810214054705e-1
+RK8_A[7, 4] = 1.07262030446373284651809199168e-1
+RK8_A[7, 5] = -1.53194377486244017527936158236e-2
+RK8_A[7, 6] = 8.27378916381402288758473766002e-3
+
+RK8_A[8, 0] = 6.24110958716075717114429577812e-1
+RK8_A[8, 3] = -3.36089262944694129406857109825
+RK8_A[8, 4] = -8.68219346841726006818189891453e-1
+RK8_A[8, 5] = 2.75920996994467083049415600797e1
+RK8_A[8, 6] = 2.01540675504778934086186788979e1
+RK8_A[8, 7] = -4.34898841810699588477366255144e1
+
+RK8_A[9, 0] = 4.77662536438264365890433908527e-1
+RK8_A[9, 3] = -2.48811461997166764192642586468
+RK8_A[9, 4] = -5.90290826836842996371446475743e-1
+RK8_A[9, 5] = 2.12300514481811942347288949897e1
+RK8_A[9, 6] = 1.52792336328824235832596922938e1
+RK8_A[9, 7] = -3.32882109689848629194453265587e1
+RK8_A[9, 8] = -2.03312017085086261358222928593e-2
+
+RK8_A[10, 0] = -9.3714243008598732571704021658e-1
+RK8_A[10, 3] = 5.18637242884406370830023853209
+RK8_A[10, 4] = 1.09143734899672957818500254654
+RK8_A[10, 5] = -8.14978701074692612513997267357
+RK8_A[10, 6] = -1.85200656599969598641566180701e1
+RK8_A[10, 7] = 2.27394870993505042818970056734e1
+RK8_A[10, 8] = 2.49360555267965238987089396762
+RK8_A[10, 9] = -3.0467644718982195003823669022
+
+RK8_A[11, 0] = 2.27331014751653820792359768449
+RK8_A[11, 3] = -1.05344954667372501984066689879e1
+RK8_A[11, 4] = -2.00087205822486249909675718444
+RK8_A[11, 5] = -1.79589318631187989172765950534e1
+RK8_A[11, 6] = 2.79488845294199600508499808837e1
+RK8_A[11, 7] = -2.85899827713502369474065508674
+RK8_A[11, 8] = -8.87285693353062954433549289258
+RK8_A[11, 9] = 1.23605671757943030647266201528e1
+RK8_A[11, 10] = 6.43392746015763530355970484046e-1
+
+RK8_B = np.zeros(RK8_N_STAGES)
+RK8_B[0] = 5.42937341165687622380535766363e-2
+RK8_B[5] = 4.45031289275240888144113950566
+RK8_B[6] = 1.89151789931450038304281599044
+RK8_B[7] = -5.8012039600105847814672114227
+RK8_B[8] = 3.1116436695781989440891606237e-1
+RK8_B[9] = -1.52160949662516078556178806805e-1
+RK8_B[10] = 2.01365400804030348374776537501e-1
+RK8_B[11] = 4.47106157277725905176885569043e-2
+
+def _rk8_step(fun: callable, t: float, y: np.ndarray, h: float) -> tuple:
+    """Single 8th order Dormand-Prince step, returning the new state and the number of calls."""
+
+    k = np.empty((RK8_N_STAGES, len(y)))
+    k[0] = fun(t, y)
+    for s in range(1, RK8_N_STAGES):
+        k[s] = fun(t + RK8_C[s]*h, y + h*(RK8_A[s, :s] @ k[:s]))
+
+    return y + h*(RK8_B @ k), FIXED_STEP_CALLS["RK8"]
+
+# Yoshida 4th order coefficients
+_CBRT2 = 2**(1/3)
+_W1 = 1/(2 - _CBRT2)
+_W0 = -_CBRT2*_W1
+_YOSHIDA_C = (_W1/2, (_W0 + _W1)/2, (_W0 + _W1)/2, _W1/2)
+_YOSHIDA_D = (_W1, _W0, _W1)
+
+# Right-hand side calls per step of the fixed-step methods
+FIXED_STEP_CALLS = {"RK8": RK8_N_STAGES, "symplectic": len(_YOSHIDA_D)}
+
+def _symplectic_step(fun: callable, t: float, y: np.ndarray, h: float) -> tuple:
+    """Single 4th order Yoshida drift-kick step, returning the new state and the number of calls."""
+
+    half = len(y)//2
+    pos = y[:half].copy()
+    vel = y[half:].copy()
+
+    time = t
+    for c, d in zip(_YOSHIDA_C, _YOSHIDA_D):
+        pos += c*h*vel
+        time += c*h
+        vel += d*h*np.asarray(fun(time, np.concatenate((pos, vel))))[half:]
+    pos += _YOSHIDA_C[-1]*h*vel
+
+    return np.concatenate((pos, vel)), FIXED_STEP_CALLS["symplectic"]
@@ -0,0 +1,207 @@
+"""
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+"""
+
+import numpy as np
+from typing import Union
+
+def stumpff_c(z: Union[float, np.ndarray]) -> np.ndarray:
+    """
+    Evaluate the Stumpff function C(z) used by the universal variable formulation.
+
+    Parameters
+    ----------
+    z : Union[float, np.ndarray]
+        The universal variable argument z = alpha*chi^2.
+
+    Returns
+    -------
+    np.ndarray
+        C(z) evaluated element-wise, using a series expansion near z = 0.
+    """
+    z = np.asarray(z, dtype=float)
+    c = np.empty_like(z)
+
+    small = np.abs(z) < 1e-3
+    pos = (z >= 1e-3)
+    neg = (z <= -1e-3)
+
+    zs = z[small]
+    c[small] = 1/2 - zs/24 + zs**2/720 - zs**3/40320
+    c[pos] = (1 - np.cos(np.sqrt(z[pos])))/z[pos]
+    c[neg] = (np.cosh(np.sqrt(-z[neg])) - 1)/(-z[neg])
+
+    return c
+
+def stumpff_s(z: Union[float, np.ndarray]) -> np.ndarray:
+    """
+    Evaluate the Stumpff function S(z) used by the universal variable formulation.
+
+    Parameters
+    ----------
+    z : Union[float, np.ndarray]
+        The universal variable argument z = alpha*chi^2.
+
+    Returns
+    -------
+    np.ndarray
+        S(z) evaluated element-wise, using a series expansion near z = 0.
+    """
+    z = np.asarray(z, dtype=float)
+    s = np.empty_like(z)
+
+    small = np.abs(z) < 1e-3
+    pos = (z >= 1e-3)
+    neg = (z <= -1e-3)
+
+    zs = z[small]
+    s[small] = 1/6 - zs/120 + zs**2/5040 - zs**3/362880
+    sqrt_z = np.sqrt(z[pos])
+    s[pos] = (sqrt_z - np.sin(sqrt_z))/sqrt_z**3
+    sqrt_z = np.sqrt(-z[neg])
+    s[neg] = (np.sinh(sqrt_z) - sqrt_z)/sqrt_z**3
+
+    return s
+
+def kepler_propagate(position: Union[list, np.ndarray], velocity: Union[list, np.ndarray],
+                     dt: Union[float, list, np.ndarray], mu: float,
+                     tol: float = 1e-12, max_iter: int = 50) -> tuple:
+    """
+    Propagate Two-Body state vectors analytically using the universal variable
+    formulation of Kepler's equation.
+
+    The universal Kepler equation is solved for the universal anomaly (chi) with
+    Laguerre-Conway iterations, which converge for elliptic, parabolic and hyperbolic
+    orbits alike, and the state is recovered with the Lagrange f and g coefficients.
+    Every state and time offset is solved simultaneously as one array operation, and
+    samples drop out of the iteration as soon as they converge. Elliptic time offsets
+    are first reduced modulo the orbital period, and hyperbolic orbits start from the
+    logarithmic guess of Vallado so that long time offsets converge as well.
+
+    Parameters
+    ----------
+    position : Union[list, np.ndarray]
+        The initial position vector (3,) or vectors (N, 3) in km.
+    velocity : Union[list, np.ndarray]
+        The initial velocity vector (3,) or vectors (N, 3) in km/sec.
+    dt : Union[float, list, np.ndarray]
+        The (T,) time offsets from the initial epoch in seconds.
+    mu : float
+        The gravitational parameter of the central body in km^3/sec^2.
+    tol : float, optional
+        Convergence tolerance on the universal anomaly, relative to its magnitude.
+        Defaults to 1e-12.
+    max_iter : int, optional
+        Maximum number of iterations. Defaults to 50.
+
+    Raises
+    ------
+    RuntimeError
+        If the universal Kepler equation does not converge within `max_iter` iterations
+        for every sample.
+
+    Returns
+    -------
+    tuple
+        A tuple containing:
+            - positions : numpy.ndarray
+                The propagated positions with shape (T, 3), or (N, T, 3) for N initial states.
+            - velocities : numpy.ndarray
+                The propagated velocities with shape (T, 3), or (N, T, 3) for N initial states.
+    """
+
+    position = np.asarray(position, dtype=float)
+    velocity = np.asarray(velocity, dtype=float)
+    single = position.ndim == 1
+
+    r0_vec = np.atleast_2d(position)[:, np.newaxis, :]
+    v0_vec = np.atleast_2d(velocity)[:, np.newaxis, :]
+    dt = np.atleast_1d(np.asarray(dt, dtype=float))[np.newaxis, :]
+
+    # Initial State Constants
+    # ---------------------------------------------------------------------
+    sqrt_mu = np.sqrt(mu)
+    r0 = np.sqrt(np.sum(r0_vec**2, axis=-1))
+    v0 = np.sqrt(np.sum(v0_vec**2, axis=-1))
+    sigma0 = np.sum(r0_vec*v0_vec, axis=-1)/sqrt_mu
+    # Reciprocal of the Semi-major Axis
+    alpha = 2/r0 - v0**2/mu
+
+    # Reduce Elliptic Time Offsets to One Period
+    # ---------------------------------------------------------------------
+    elliptic = alpha > 1e-12
+    period = np.where(elliptic, 2*np.pi/np.sqrt(mu*np.abs(alpha)**3), np.inf)
+    dt = np.where(elliptic, np.fmod(dt, period), dt)
+
+    # Initial Guess of the Universal Anomaly
+    # ---------------------------------------------------------------------
+    chi = np.where(elliptic, sqrt_mu*alpha*dt, sqrt_mu*dt/r0)
+
+    # Hyperbolic guess from Vallado, Fundamentals of Astrodynamics, Algorithm 8
+    hyperbolic = alpha < -1e-12
+    if np.any(hyperbolic):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            a = 1/alpha
+            sign = np.sign(dt)
+            ratio = (-2*mu*alpha*dt
+                     /(sqrt_mu*sigma0 + sign*np.sqrt(-mu*a)*(1 - r0*alpha)))
+            chi_hyp = sign*np.sqrt(-a)*np.log(ratio)
+        valid = hyperbolic & (dt != 0) & np.isfinite(chi_hyp)
+        chi = np.where(valid, chi_hyp, chi)
+
+    # Solve the Universal Kepler Equation
+    # ---------------------------------------------------------------------
+    # Laguerre-Conway iterations with n = 5
+    # Converged samples are frozen, so only the remaining ones are iterated
+    n = 5
+    chi, sigma0, r0, alpha, dt = np.broadcast_arrays(chi, sigma0, r0, alpha, dt)
+    chi = chi.copy()
+    active = np.ones(chi.shape, dtype=bool)
+    for _ in range(max_iter):
+        x = chi[active]
+        sig, rad, alp = sigma0[active], r0[active], alpha[active]
+
+        x2 = x**2
+        z = alp*x2
+        c = stumpff_c(z)
+        s = stumpff_s(z)
+
+        func = sig*x2*c + (1 - alp*rad)*x**3*s + rad*x - sqrt_mu*dt[active]
+        dfunc = sig*x*(1 - z*s) + (1 - alp*rad)*x2*c + rad
+        ddfunc = sig*(1 - z*c) + (1 - alp*rad)*x*(1 - z*s)
+
+        root = np.sqrt(np.abs((n - 1)**2*dfunc**2 - n*(n - 1)*func*ddfunc))
+        delta = n*func/(dfunc + np.copysign(root, dfunc))
+        x = x - delta
+        chi[active] = x
+
+        done = np.abs(delta) <= tol*np.maximum(1.0, np.abs(x))
+        active[active] = ~done
+        if not np.any(active):
+            break
+    else:
+        raise RuntimeError(f"Universal Kepler equation failed to converge for "
+                           f"{np.count_nonzero(active)} of {active.size} samples.")
+
+    # Lagrange Coefficients
+    # ---------------------------------------------------------------------
+    chi2 = chi**2
+    z = alpha*chi2
+    c = stumpff_c(z)
+    s = stumpff_s(z)
+
+    f = 1 - chi2/r0*c
+    g = dt - chi**3/sqrt_mu*s
+
+    positions = f[..., np.newaxis]*r0_vec + g[..., np.newaxis]*v0_vec
+    r = np.sqrt(np.sum(positions**2, axis=-1))
+
+    fdot = sqrt_mu/(r*r0)*chi*(z*s - 1)
+    gdot = 1 - chi2/r*c
+
+    velocities = fdot[..., np.newaxis]*r0_vec + gdot[..., np.newaxis]*v0_vec
+
+    if single:
+        return positions[0], velocities[0]
+    return positions, velocities
@@ -0,0 +1,242 @@
+"""
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+"""
+
+import functools
+import numpy as np
+from typing import Union
+
+from .three_body_problem import CR3BP, planar_lagrange_points
+
+# Mass ratios mu = m2/(m1 + m2) of common primary pairs
+SYSTEM_MASS_RATIOS = {"Earth-Moon": 0.012150515586657583,
+                      "Sun-Earth": 3.003480642487067e-06,
+                      "Sun-EarthMoon": 3.040423452319562e-06,
+                      "Sun-Jupiter": 9.536838828160198e-04,
+                      "Saturn-Titan": 2.366394549646918e-04,
+                      "Mars-Phobos": 1.654744246098620e-08,
+                      "Pluto-Charon": 0.10854143601098945}
+
+def lagrange_points(mass_ratio: Union[float, list, np.ndarray], tol: float = 1e-15,
+                    max_iter: int = 50) -> np.ndarray:
+    """
+    Compute the five Lagrange points of one or many mass ratios at once.
+
+    The collinear points are found by Halley iterations on the collinear force balance
+    `planar_lagrange_points.root_equation()`, seeded by `colinear_approximation()`, with
+    every mass ratio and point solved simultaneously as one array operation. The triangular
+    points are closed form.
+
+    Parameters
+    ----------
+    mass_ratio : Union[float, list, np.ndarray]
+        The mass ratio, or (M,) mass ratios, between the two bodies in the system.
+    tol : float, optional
+        Convergence tolerance of the collinear points, relative to their magnitude.
+        Defaults to 1e-15.
+    max_iter : int, optional
+        Maximum number of Halley iterations. Defaults to 50.
+
+    Raises
+    ------
+    ValueError
+        If a mass ratio is outside (0, 0.5].
+    RuntimeError
+        If the collinear points do not converge within `max_iter` iterations.
+
+    Returns
+    -------
+    np.ndarray
+        The (5, 3) positions [x, y, z] of L1 to L5, or (M, 5, 3) for M mass ratios.
+
+    Examples
+    --------
+    points = lagrange_points(np.linspace(0.001, 0.5, 100))
+    l1_x = points[:, 0, 0]
+    """
+    mass_ratio = np.asarray(mass_ratio, dtype=float)
+    single = mass_ratio.ndim == 0
+    mu = np.atleast_1d(mass_ratio)[:, np.newaxis]
+
+    if np.any((mu <= 0) | (mu > 0.5)):
+        raise ValueError("mass_ratio must be within (0, 0.5].")
+
+    # Collinear Points
+    # ---------------------------------------------------------------------
+    # (M, 3) initial guesses of L1, L2 and L3
+    x = np.stack(planar_lagrange_points(mu[:, 0]).colinear_approximation(), axis=-1)
+
+    for _ in range(max_iter):
+        # Signed distances to the primaries
+        d1 = x + mu
+        d2 = x - 1 + mu
+        r1_3 = np.abs(d1)**3
+        r2_3 = np.abs(d2)**3
+
+        func = x - (1 - mu)*d1/r1_3 - mu*d2/r2_3
+        dfunc = 1 + 2*(1 - mu)/r1_3 + 2*mu/r2_3
+        ddfunc = -6*(1 - mu)*d1/(r1_3*d1**2) - 6*mu*d2/(r2_3*d2**2)
+
+        delta = 2*func*dfunc/(2*dfunc**2 - func*ddfunc)
+        x = x - delta
+
+        if np.all(np.abs(delta) <= tol*np.maximum(1.0, np.abs(x))):
+            break
+    else:
+        raise RuntimeError("Collinear Lagrange points failed to converge.")
+
+    # All Five Points
+    # ---------------------------------------------------------------------
+    points = np.zeros((len(mu), 5, 3))
+    points[:, :3, 0] = x
+    points[:, 3:, 0] = 1/2 - mu
+    points[:, 3, 1] = np.sqrt(3)/2
+    points[:, 4, 1] = -np.sqrt(3)/2
+
+    return points[0] if single else points
+
+@functools.lru_cache(maxsize=None)
+def system_lagrange_points(system: str) -> np.ndarray:
+    """
+    Return the cached Lagrange points of a common system from `SYSTEM_MASS_RATIOS`.
+
+    Parameters
+    ----------
+    system : str
+        The name of the system, e.g. "Earth-Moon" or "Sun-Earth".
+
+    Raises
+    ------
+    ValueError
+        If the system is not in `SYSTEM_MASS_RATIOS`.
+
+    Returns
+    -------
+    np.ndarray
+        The read-only (5, 3) positions of L1 to L5.
+    """
+    if system not in SYSTEM_MASS_RATIOS:
+        raise ValueError(f"Unknown system '{system}'. Expected one of {list(SYSTEM_MASS_RATIOS)}.")
+
+    points = lagrange_points(SYSTEM_MASS_RATIOS[system])
+    points.flags.writeable = False
+    return points
+
+
+class LagrangeStability(object):
+    """
+    Linear stability of the five Lagrange points of one or many mass ratios.
+
+    The CR3BP equations are linearized about every point with `CR3BP.potential_hessian()`
+    and `CR3BP.linearized_system_matrix()`, and the eigen decomposition of all the system
+    matrices is computed in a single batched call. All arrays are read-only so instances can
+    be shared, see `lagrange_stability()`.
+
+    Attributes
+    ----------
+    mass_ratio : np.ndarray
+        The (M,) mass ratios.
+    points : np.ndarray
+        The (M, 5, 3) positions of L1 to L5.
+    hessian : np.ndarray
+        The (M, 5, 3, 3) Hessian of the force potential at each point.
+    system_matrix : np.ndarray
+        The (M, 5, 6, 6) linearized system matrix at each point.
+    eigenvalues : np.ndarray
+        The (M, 5, 6) complex eigenvalues, sorted by increasing real part.
+    eigenvectors : np.ndarray
+        The (M, 5, 6, 6) complex eigenvectors, column k belonging to eigenvalue k.
+    """
+
+    def __init__(self, mass_ratio: Union[float, list, np.ndarray]):
+        """
+        Linearize and decompose the dynamics at the Lagrange points.
+
+        Parameters
+        ----------
+        mass_ratio : Union[float, list, np.ndarray]
+            The mass ratio, or (M,) mass ratios, between the two bodies in the system.
+        """
+        self.mass_ratio = np.atleast_1d(np.asarray(mass_ratio, dtype=float))
+        self.points = lagrange_points(self.mass_ratio)
+
+        mu = self.mass_ratio[:, np.newaxis]
+        self.hessian = CR3BP.potential_hessian(self.points, mu)
+        self.system_matrix = CR3BP.linearized_system_matrix(self.points, mu)
+
+        eigenvalues, eigenvectors = np.linalg.eig(self.system_matrix)
+        order = np.argsort(eigenvalues.real, axis=-1, kind='stable')
+        self.eigenvalues = np.take_along_axis(eigenvalues, order, axis=-1)
+        self.eigenvectors = np.take_along_axis(eigenvectors, order[..., np.newaxis, :], axis=-1)
+
+        for values in (self.mass_ratio, self.points, self.hessian, self.system_matrix,
+                       self.eigenvalues, self.eigenvectors):
+            values.flags.writeable = False
+
+    def stable(self, tol: float = 1e-9) -> np.ndarray:
+        """
+        Linear stability of every point, stable when no eigenvalue has a positive real part.
+
+        The collinear points are always unstable. The triangular points are stable below the
+        Routh critical mass ratio of about 0.0385.
+
+        Parameters
+        ----------
+        tol : float, optional
+            Real parts up to this value are treated as zero. Defaults to 1e-9.
+
+        Returns
+        -------
+        np.ndarray
+            The (M, 5) stability flags.
+        """
+        return np.all(self.eigenvalues.real <= tol, axis=-1)
+
+    @property
+    def unstable_eigenvector(self) -> np.ndarray:
+        """The (M, 3, 6) real unit eigenvectors of the unstable eigenvalue at L1 to L3."""
+        return _real_unit_vector(self.eigenvectors[:, :3, :, -1])
+
+    @property
+    def stable_eigenvector(self) -> np.ndarray:
+        """The (M, 3, 6) real unit eigenvectors of the stable eigenvalue at L1 to L3."""
+        return _real_unit_vector(self.eigenvectors[:, :3, :, 0])
+
+    def __repr__(self) -> str:
+        """Return a string representation of the analysis."""
+        return f"LagrangeStability({len(self.mass_ratio)} mass ratios)"
+
+
+def lagrange_stability(mass_ratio: Union[float, list, np.ndarray]) -> LagrangeStability:
+    """
+    Return the `LagrangeStability` of the given mass ratios, reusing the analysis of the 32
+    most recently requested sets of mass ratios when available.
+
+    Parameters
+    ----------
+    mass_ratio : Union[float, list, np.ndarray]
+        The mass ratio, or (M,) mass ratios, between the two bodies in the system.
+
+    Returns
+    -------
+    LagrangeStability
+        The shared, read-only stability analysis.
+
+    Examples
+    --------
+    stability = lagrange_stability(SYSTEM_MASS_RATIOS["Earth-Moon"])
+    l1_eigenvalues = stability.eigenvalues[0, 0]
+    """
+    return _cached_stability(tuple(np.atleast_1d(np.asarray(mass_ratio, dtype=float)).tolist()))
+
+@functools.lru_cache(maxsize=32)
+def _cached_stability(mass_ratio: tuple) -> LagrangeStability:
+    """Cached LagrangeStability keyed on a tuple of mass ratios."""
+    return LagrangeStability(mass_ratio)
+
+def _real_unit_vector(vectors: np.ndarray) -> np.ndarray:
+    """Real part of (..., 6) eigenvectors of real eigenvalues, normalized with a positive x component."""
+    vectors = vectors.real
+    vectors = vectors/np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors*np.where(vectors[..., :1] < 0, -1.0, 1.0)
@@ -0,0 +1,289 @@
+"""
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+"""
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from .integrators import integrate
+from .three_body_problem import CR3BP, _array_non_dim_acceleration
+from .periodic_orbits import PeriodicOrbit
+
+class InvariantManifold(object):
+    """
+    Stable or unstable invariant manifold of an unstable periodic orbit, such as a Lyapunov
+    or halo orbit around L1 or L2.
+
+    The eigenvector of the monodromy matrix is mapped to `num_points` phase points along the
+    orbit with the State Transition Matrix, and each phase point is displaced by `step` along
+    it on both sides, the positive and negative branches. All displaced states are then
+    propagated together as a single vectorized system, forward in time for the unstable
+    manifold and backward for the stable manifold, optionally split across a process pool.
+
+    Attributes
+    ----------
+    orbit : PeriodicOrbit
+        The periodic orbit.
+    stability : str
+        "unstable" or "stable".
+    num_points : int
+        The number of phase points along the orbit, default is 50.
+    step : float
+        The non-dimensional position displacement along the eigenvector, default is 1e-4.
+    max_time : float
+        The non-dimensional propagation time of each trajectory, default is 2π.
+    num_time_points : int
+        The number of stored time points of each trajectory, default is 500.
+    rel_tol : float
+        Relative tolerance of each trajectory, default is 1e-10.
+    abs_tol : float
+        Absolute tolerance of each trajectory, default is 1e-10.
+    processes : int
+        The number of worker processes, default is None which propagates every trajectory
+        in a single batch.
+    chunk_size : int
+        The number of trajectories in each batch sent to a worker process, default is 50.
+    phases : np.ndarray
+        The (num_points,) times of the phase points along the orbit after `seed()`.
+    seeds : np.ndarray
+        The (2, num_points, 6) displaced initial states of the positive and negative
+        branches after `seed()`.
+    time : np.ndarray
+        The (num_time_points,) propagation times after `compute()`, negative for the stable
+        manifold.
+    tubes : np.ndarray
+        The (2, num_points, num_time_points, 6) trajectories after `compute()`. If the
+        solver of a batch fails, e.g. on a collision with a primary, the time points of
+        that batch after the failure are NaN.
+    """
+
+    def __init__(self, orbit: PeriodicOrbit, stability: str = "unstable"):
+        """
+        Initialize the InvariantManifold instance.
+
+        Parameters
+        ----------
+        orbit : PeriodicOrbit
+            The periodic orbit, its monodromy matrix is computed when missing.
+        stability : str, optional
+            "unstable" or "stable". Defaults to "unstable".
+
+        Raises
+        ------
+        ValueError
+            If stability is not "unstable" or "stable".
+        """
+        if stability not in ("unstable", "stable"):
+            raise ValueError("stability must be 'unstable' or 'stable'.")
+
+        self.orbit = orbit
+        self.stability = stability
+
+        self.num_points = 50
+        self.step = 1e-4
+        self.max_time = 2*np.pi
+        self.num_time_points = 500
+        self.rel_tol = 1e-10
+        self.abs_tol = 1e-10
+        self.processes = None
+        self.chunk_size = 50
+
+    @property
+    def eigenvector(self) -> np.ndarray:
+        """
+        Real unit eigenvector of the monodromy matrix with the largest (unstable) or smallest
+        (stable) eigenvalue magnitude, signed with a positive x component.
+
+        Raises
+        ------
+        ValueError
+            If the orbit has no real eigenvalue off the unit circle.
+        """
+        if self.orbit.monodromy is None:
+            self.orbit.compute_monodromy()
+
+        eigenvalues, eigenvectors = np.linalg.eig(self.orbit.monodromy)
+        magnitude = np.abs(eigenvalues)
+        k = np.argmax(magnitude) if self.stability == "unstable" else np.argmin(magnitude)
+
+        if abs(eigenvalues[k].imag) > 1e-8*magnitude[k] or np.isclose(magnitude[k], 1.0, atol=1e-6):
+            raise ValueError(f"The orbit has no real {self.stability} eigenvalue.")
+
+        vector = eigenvectors[:, k].real
+        vector = vector/np.linalg.norm(vector)
+        return vector if vector[0] >= 0 else -vector
+
+    def seed(self) -> np.ndarray:
+        """
+        Build the displaced initial states of both branches at every phase point.
+
+        Returns
+        -------
+        np.ndarray
+            The (2, num_points, 6) initial states, also stored in `self.seeds`.
+        """
+        self.phases = np.linspace(0, self.orbit.period, self.num_points, endpoint=False)
+
+        # States and State Transition Matrices at the phase points, in one integration
+        model = CR3BP(self.orbit.state[:3].tolist(), self.orbit.state[3:].tolist())
+        model.mu = self.orbit.mass_ratio
+        sol = integrate(model.non_dim_stm_equations, [0, self.orbit.period],
+                        np.concatenate((self.orbit.state, np.eye(6).ravel())),
+                        t_eval=self.phases, method="DOP853", rtol=1e-12, atol=1e-12)
+
+        states = sol.y[:6].T
+        stm = sol.y[6:].T.reshape(-1, 6, 6)
+
+        # Eigenvector carried along the orbit, scaled to a unit position displacement
+        vectors = stm @ self.eigenvector
+        vectors /= np.linalg.norm(vectors[:, :3], axis=1, keepdims=True)
+
+        self.seeds = np.stack((states + self.step*vectors, states - self.step*vectors))
+        return self.seeds
+
+    def compute(self) -> np.ndarray:
+        """
+        Seed and propagate every trajectory of both branches.
+
+        Returns
+        -------
+        np.ndarray
+            The (2, num_points, num_time_points, 6) trajectories, also stored in `self.tubes`.
+        """
+        seeds = self.seed().reshape(-1, 6)
+        sign = 1.0 if self.stability == "unstable" else -1.0
+        self.time = sign*np.linspace(0, self.max_time, self.num_time_points)
+
+        chunks = [np.arange(start, min(start + self.chunk_size, len(seeds)))
+                  for start in range(0, len(seeds), self.chunk_size)]
+        options = (self.time, self.orbit.mass_ratio, self.rel_tol, self.abs_tol)
+
+        if self.processes is None:
+            results = [_propagate_batch(seeds, *options)]
+            chunks = [np.arange(len(seeds))]
+        else:
+            with ProcessPoolExecutor(max_workers=self.processes) as executor:
+                results = list(executor.map(_propagate_batch, [seeds[chunk] for chunk in chunks],
+                                            *[[option]*len(chunks) for option in options]))
+
+        trajectories = np.empty((len(seeds), len(self.time), 6))
+        self._solutions = []
+        for chunk, (states, sol) in zip(chunks, results):
+            trajectories[chunk] = states
+            self._solutions.append((chunk, sol))
+
+        self.tubes = trajectories.reshape(2, self.num_points, len(self.time), 6)
+        return self.tubes
+
+    def section_crossings(self, axis: int = 0, value: float = None, direction: float = 0,
+                          tol: float = 1e-12) -> tuple:
+        """
+        Locate the first crossing of a plane by every trajectory, e.g. the x = 1 - mu plane
+        through the secondary for Poincaré intersections of L1 and L2 manifolds.
+
+        Crossings are bracketed on the stored time grid and refined by bisection on the
+        continuous solution of the propagation.
+
+        Parameters
+        ----------
+        axis : int, optional
+            Index of the position coordinate of the plane, 0 for x, 1 for y and 2 for z.
+            Defaults to 0.
+        value : float, optional
+            The coordinate of the plane. Defaults to None, the x coordinate 1 - mu of the
+            secondary.
+        direction : float, optional
+            Only count crossings with increasing (1) or decreasing (-1) coordinate along the
+            direction of propagation, or both (0). Defaults to 0.
+        tol : float, optional
+            Precision of the crossing times. Defaults to 1e-12.
+
+        Raises
+        ------
+        ValueError
+            If called before `compute()` or axis is not 0, 1 or 2.
+
+        Returns
+        -------
+        tuple
+            A tuple containing:
+                - times : numpy.ndarray
+                    The (2, num_points) crossing times, NaN for trajectories that do not cross.
+                - states : numpy.ndarray
+                    The (2, num_points, 6) crossing states, NaN for trajectories that do not cross.
+        """
+        if not hasattr(self, 'tubes'):
+            raise ValueError("Call compute() before section_crossings().")
+        if axis not in (0, 1, 2):
+            raise ValueError("axis must be 0, 1 or 2.")
+        if value is None:
+            value = 1 - self.orbit.mass_ratio
+
+        trajectories = self.tubes.reshape(-1, len(self.time), 6)
+        level = trajectories[:, :, axis] - value
+
+        # First bracketing interval of every trajectory
+        before, after = level[:, :-1], level[:, 1:]
+        crossed = ((before < 0) & (after >= 0)) | ((before > 0) & (after <= 0))
+        if direction > 0:
+            crossed &= after > before
+        elif direction < 0:
+            crossed &= after < before
+        found = np.any(crossed, axis=1)
+        first = np.argmax(crossed, axis=1)
+
+        times = np.full(len(trajectories), np.nan)
+        states = np.full((len(trajectories), 6), np.nan)
+
+        for chunk, sol in self._solutions:
+            rows = np.flatnonzero(found[chunk])
+            if len(rows) == 0:
+                continue
+            index = first[chunk][rows]
+            t_low, t_high = self.time[index], self.time[index + 1]
+            low_sign = level[chunk][rows, index] > 0
+
+            # Component of each trajectory in the flattened batch state
+            component = 6*rows + axis
+            num_iter = int(np.ceil(np.log2(abs(self.time[1] - self.time[0])/tol)))
+            for _ in range(max(num_iter, 0)):
+                t_mid = (t_low + t_high)/2
+                mid_sign = sol(t_mid)[component, np.arange(len(rows))] - value > 0
+                same = mid_sign == low_sign
+                t_low = np.where(same, t_mid, t_low)
+                t_high = np.where(same, t_high, t_mid)
+
+            t_cross = (t_low + t_high)/2
+            batch = sol(t_cross).reshape(-1, 6, len(rows))
+            times[chunk[rows]] = t_cross
+            states[chunk[rows]] = batch[rows, :, np.arange(len(rows))]
+
+        return times.reshape(2, self.num_points), states.reshape(2, self.num_points, 6)
+
+
+def _batch_rhs(t: float, y: np.ndarray, mass_ratio: float) -> np.ndarray:
+    """Non-dimensional CR3BP equations of many states flattened into a single vector."""
+    state = y.reshape(-1, 6)
+
+    derivative = np.empty_like(state)
+    derivative[:, :3] = state[:, 3:]
+    derivative[:, 3], derivative[:, 4], derivative[:, 5] = _array_non_dim_acceleration(
+        *state[:, :5].T, mass_ratio)
+
+    return derivative.ravel()
+
+def _propagate_batch(initial_states: np.ndarray, time: np.ndarray, mass_ratio: float,
+                     rel_tol: float, abs_tol: float) -> tuple:
+    """Propagate (N, 6) states as one system, returning (N, T, 6) trajectories and the dense solution."""
+    # Tolerances apply to the RMS error of the whole batch
+    scale = 1/np.sqrt(len(initial_states))
+
+    sol = integrate(_batch_rhs, [time[0], time[-1]], initial_states.ravel(), t_eval=time,
+                    method="DOP853", rtol=rel_tol*scale, atol=abs_tol*scale,
+                    args=(mass_ratio,), dense_output=True)
+
+    # Time points after a solver failure are left as NaN
+    states = np.full((len(initial_states), len(time), 6), np.nan)
+    states[:, :len(sol.t)] = sol.y.reshape(len(initial_states), 6, -1).transpose(0, 2, 1)
+    return states, sol.sol
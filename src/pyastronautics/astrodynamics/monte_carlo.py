@@ -0,0 +1,256 @@
+"""
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+"""
+
+import numpy as np
+from typing import Union
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .two_body_problem import TwoBodyModel
+from .three_body_problem import CR3BP
+
+class RunningStatistics(object):
+    """
+    Mean and covariance of state vectors accumulated chunk by chunk, so the statistics of
+    a dispersion analysis never require every sample to be held in memory.
+
+    Attributes
+    ----------
+    count : int
+        The number of accumulated samples.
+    mean : np.ndarray
+        The running mean of the samples.
+    """
+
+    def __init__(self, size: int = 6):
+        """
+        Initialize an empty RunningStatistics instance.
+
+        Parameters
+        ----------
+        size : int, optional
+            The length of each sample vector. Defaults to 6.
+        """
+        self.count = 0
+        self.mean = np.zeros(size)
+        # Sum of outer products of deviations from the mean
+        self._m2 = np.zeros((size, size))
+
+    def update(self, samples: np.ndarray) -> None:
+        """
+        Merge a chunk of (M, size) samples into the statistics.
+
+        Parameters
+        ----------
+        samples : np.ndarray
+            The new samples, one per row.
+        """
+        samples = np.atleast_2d(samples)
+        count = len(samples)
+        if count == 0:
+            return
+
+        mean = samples.mean(axis=0)
+        deviation = samples - mean
+        m2 = deviation.T @ deviation
+
+        # Chan et al. pairwise combination of two partial results
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta*count/total
+        self._m2 = self._m2 + m2 + np.outer(delta, delta)*self.count*count/total
+        self.count = total
+
+    @property
+    def covariance(self) -> np.ndarray:
+        """The unbiased sample covariance of the accumulated samples."""
+        if self.count < 2:
+            return np.full_like(self._m2, np.nan)
+        return self._m2/(self.count - 1)
+
+    @property
+    def std(self) -> np.ndarray:
+        """The sample standard deviation of each component."""
+        return np.sqrt(np.diag(self.covariance))
+
+
+class MonteCarloDispersion(object):
+    """
+    Monte Carlo dispersion analysis of a TwoBodyModel or CR3BP spacecraft.
+
+    Perturbed initial states are drawn around a nominal state, propagated in chunks over a
+    process pool, and only the final states are sent back. Summary statistics are updated
+    as each chunk arrives.
+
+    Attributes
+    ----------
+    model_class : type
+        `TwoBodyModel` or `CR3BP`.
+    nominal_state : np.ndarray
+        The nominal initial state vector [x, y, z, vx, vy, vz].
+    time : np.ndarray
+        The time grid of each propagation, only its final time is kept.
+    covariance : np.ndarray
+        The (6, 6) covariance of the initial state dispersions, used when no sampler is given.
+    sampler : callable
+        Optional function sampler(rng, size) returning (size, 6) perturbed initial states.
+    num_samples : int
+        The number of propagated samples, default is 1000.
+    chunk_size : int
+        The number of samples propagated by each task, default is 100.
+    processes : int
+        The number of worker processes, default is None which runs serially.
+    seed : int
+        Seed of the random number generator, default is None.
+    model_options : dict
+        Attributes set on every model before solving, e.g. {"mu": 398600, "rel_tol": 1e-12}.
+    statistics : RunningStatistics
+        The statistics of the final states after `run()`.
+    final_states : np.ndarray
+        The (num_samples, 6) final states after `solve()`.
+    success : np.ndarray
+        The (num_samples,) solver success flag of each sample after `solve()`.
+    """
+
+    def __init__(self, model_class: type, nominal_state: Union[list, np.ndarray],
+                 time: Union[list, np.ndarray], covariance: np.ndarray = None,
+                 sampler: callable = None):
+        """
+        Initialize the MonteCarloDispersion instance.
+
+        Parameters
+        ----------
+        model_class : type
+            `TwoBodyModel` or `CR3BP`.
+        nominal_state : Union[list, np.ndarray]
+            The nominal initial state vector [x, y, z, vx, vy, vz].
+        time : Union[list, np.ndarray]
+            The time grid of each propagation.
+        covariance : np.ndarray, optional
+            The (6, 6) covariance of the initial state dispersions.
+        sampler : callable, optional
+            Function sampler(rng, size) returning (size, 6) perturbed initial states.
+
+        Raises
+        ------
+        ValueError
+            If the model class has no known solver, or neither covariance nor sampler is given.
+        """
+        if model_class not in _SOLVERS:
+            raise ValueError("model_class must be TwoBodyModel or CR3BP.")
+        if covariance is None and sampler is None:
+            raise ValueError("Either covariance or sampler must be given.")
+
+        self.model_class = model_class
+        self.nominal_state = np.array(nominal_state, dtype=float)
+        self.time = np.asarray(time, dtype=float)
+        self.covariance = None if covariance is None else np.asarray(covariance, dtype=float)
+        self.sampler = sampler
+
+        self.num_samples = 1000
+        self.chunk_size = 100
+        self.processes = None
+        self.seed = None
+        self.model_options = {}
+
+    def sample(self) -> np.ndarray:
+        """
+        Draw the perturbed initial states.
+
+        Returns
+        -------
+        np.ndarray
+            The (num_samples, 6) initial states.
+        """
+        rng = np.random.default_rng(self.seed)
+        if self.sampler is not None:
+            return np.asarray(self.sampler(rng, self.num_samples), dtype=float)
+        return rng.multivariate_normal(self.nominal_state, self.covariance, size=self.num_samples)
+
+    def run(self):
+        """
+        Propagate all samples, yielding results chunk by chunk as they complete.
+
+        Chunks are yielded in completion order when running over a process pool.
+        `self.statistics` is updated with the successful samples of every chunk before it
+        is yielded.
+
+        Yields
+        ------
+        tuple
+            A tuple containing:
+                - indices : numpy.ndarray
+                    The sample indices of the chunk.
+                - final_states : numpy.ndarray
+                    The (M, 6) final states of the chunk.
+                - success : numpy.ndarray
+                    The (M,) solver success flags of the chunk.
+        """
+        initial_states = self.sample()
+        chunks = [np.arange(start, min(start + self.chunk_size, self.num_samples))
+                  for start in range(0, self.num_samples, self.chunk_size)]
+
+        self.statistics = RunningStatistics()
+
+        if self.processes is None:
+            results = ((indices, _propagate_chunk(self.model_class, initial_states[indices],
+                                                  self.time, self.model_options))
+                       for indices in chunks)
+            for indices, (final_states, success) in results:
+                self.statistics.update(final_states[success])
+                yield indices, final_states, success
+            return
+
+        with ProcessPoolExecutor(max_workers=self.processes) as executor:
+            futures = {executor.submit(_propagate_chunk, self.model_class, initial_states[indices],
+                                       self.time, self.model_options): indices
+                       for indices in chunks}
+            for future in as_completed(futures):
+                final_states, success = future.result()
+                self.statistics.update(final_states[success])
+                yield futures[future], final_states, success
+
+    def solve(self) -> RunningStatistics:
+        """
+        Run every sample and gather the final states in sample order.
+
+        Returns
+        -------
+        RunningStatistics
+            The statistics of the successful final states. The final states and success
+            flags are stored in `self.final_states` and `self.success`.
+        """
+        self.final_states = np.empty((self.num_samples, 6))
+        self.success = np.zeros(self.num_samples, dtype=bool)
+
+        for indices, final_states, success in self.run():
+            self.final_states[indices] = final_states
+            self.success[indices] = success
+
+        return self.statistics
+
+
+# Solver method of each supported model
+_SOLVERS = {TwoBodyModel: "solve_trajectory",
+            CR3BP: "solve_non_dim_trajectory"}
+
+def _propagate_chunk(model_class: type, initial_states: np.ndarray, time: np.ndarray,
+                     model_options: dict) -> tuple:
+    """Propagate a chunk of initial states, returning their final states and success flags."""
+    final_states = np.empty((len(initial_states), 6))
+    success = np.empty(len(initial_states), dtype=bool)
+
+    for k, state in enumerate(initial_states):
+        model = model_class(state[:3].tolist(), state[3:].tolist())
+        for name, value in model_options.items():
+            setattr(model, name, value)
+        model.verbose = False
+        model.time = time
+
+        getattr(model, _SOLVERS[model_class])()
+
+        final_states[k] = model.final_state
+        success[k] = model.num_sol.success
+
+    return final_states, success
@@ -0,0 +1,464 @@
+"""
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+"""
+
+import numpy as np
+from typing import Union
+from concurrent.futures import ProcessPoolExecutor
+
+from .integrators import integrate
+from .events import plane_crossing
+from .three_body_problem import CR3BP, planar_lagrange_points
+
+class PeriodicOrbit(object):
+    """
+    A periodic orbit of the Circular Restricted Three-Body Problem that is symmetric about
+    the x-z plane, such as planar Lyapunov and halo orbits.
+
+    The orbit starts on the x-z plane, [x0, 0, z0, 0, vy0, 0], and crosses it again
+    perpendicularly after half of its period.
+
+    Attributes
+    ----------
+    state : np.ndarray
+        The initial state vector [x, y, z, vx, vy, vz] on the x-z plane.
+    period : float
+        The non-dimensional orbital period.
+    mass_ratio : float
+        The mass ratio between the two primary bodies in the system.
+    jacobi : float
+        The spatial Jacobi constant of the orbit.
+    monodromy : np.ndarray
+        The State Transition Matrix after one full period, None until
+        `compute_monodromy()` is called.
+    """
+
+    def __init__(self, state: Union[list, np.ndarray], period: float, mass_ratio: float):
+        """
+        Initialize the PeriodicOrbit instance.
+
+        Parameters
+        ----------
+        state : Union[list, np.ndarray]
+            The initial state vector [x, y, z, vx, vy, vz] on the x-z plane.
+        period : float
+            The non-dimensional orbital period.
+        mass_ratio : float
+            The mass ratio between the two primary bodies in the system.
+        """
+        self.state = np.array(state, dtype=float)
+        self.period = period
+        self.mass_ratio = mass_ratio
+        self.monodromy = None
+
+        x, y, z, vx, vy, vz = self.state
+        r1 = np.sqrt((x + mass_ratio)**2 + y**2 + z**2)
+        r2 = np.sqrt((x - 1 + mass_ratio)**2 + y**2 + z**2)
+        self.jacobi = (x**2 + y**2) + 2*(1 - mass_ratio)/r1 + 2*mass_ratio/r2 - (vx**2 + vy**2 + vz**2)
+
+    def compute_monodromy(self, rel_tol: float = 1e-12, abs_tol: float = 1e-12) -> np.ndarray:
+        """
+        Integrate the State Transition Matrix over one full period.
+
+        Parameters
+        ----------
+        rel_tol : float, optional
+            Relative tolerance of the integration. Defaults to 1e-12.
+        abs_tol : float, optional
+            Absolute tolerance of the integration. Defaults to 1e-12.
+
+        Returns
+        -------
+        np.ndarray
+            The (6, 6) monodromy matrix, also stored in `self.monodromy`.
+        """
+        self.monodromy = _monodromy(self.state, self.period, self.mass_ratio, rel_tol, abs_tol)
+        return self.monodromy
+
+    @property
+    def eigenvalues(self) -> np.ndarray:
+        """Eigenvalues of the monodromy matrix, computing it first if needed."""
+        if self.monodromy is None:
+            self.compute_monodromy()
+        return np.linalg.eigvals(self.monodromy)
+
+    @property
+    def stability_index(self) -> float:
+        """Stability index (|lambda_max| + 1/|lambda_max|)/2, larger than 1 for unstable orbits."""
+        lambda_max = np.max(np.abs(self.eigenvalues))
+        return (lambda_max + 1/lambda_max)/2
+
+    def propagate(self, num_points: int = 500) -> CR3BP:
+        """
+        Propagate the orbit over one full period.
+
+        Parameters
+        ----------
+        num_points : int, optional
+            Number of evenly spaced time points. Defaults to 500.
+
+        Returns
+        -------
+        CR3BP
+            The solved model, with results in `numerical_position` and `numerical_velocity`.
+        """
+        sc = CR3BP(self.state[:3].tolist(), self.state[3:].tolist())
+        sc.mu = self.mass_ratio
+        sc.time = np.linspace(0, self.period, num_points)
+        sc.rel_tol = 1e-12
+        sc.abs_tol = 1e-12
+        sc.solve_non_dim_trajectory()
+        return sc
+
+    def __repr__(self) -> str:
+        """Return a string representation of the periodic orbit."""
+        return f"PeriodicOrbit(state={self.state}, period={self.period}, jacobi={self.jacobi})"
+
+
+class PeriodicOrbitFamily(object):
+    """
+    A family of periodic orbits produced by continuation.
+
+    Attributes
+    ----------
+    orbits : list[PeriodicOrbit]
+        The members of the family in continuation order.
+    """
+
+    def __init__(self, orbits: list[PeriodicOrbit]):
+        """
+        Initialize the PeriodicOrbitFamily instance.
+
+        Parameters
+        ----------
+        orbits : list[PeriodicOrbit]
+            The members of the family in continuation order.
+        """
+        self.orbits = orbits
+
+    def __len__(self) -> int:
+        return len(self.orbits)
+
+    def __getitem__(self, index: int) -> PeriodicOrbit:
+        return self.orbits[index]
+
+    @property
+    def states(self) -> np.ndarray:
+        """The (M, 6) initial states of the members."""
+        return np.array([orbit.state for orbit in self.orbits])
+
+    @property
+    def periods(self) -> np.ndarray:
+        """The (M,) periods of the members."""
+        return np.array([orbit.period for orbit in self.orbits])
+
+    @property
+    def jacobi(self) -> np.ndarray:
+        """The (M,) Jacobi constants of the members."""
+        return np.array([orbit.jacobi for orbit in self.orbits])
+
+    def compute_stability(self, processes: int = None, rel_tol: float = 1e-12,
+                          abs_tol: float = 1e-12) -> np.ndarray:
+        """
+        Compute the monodromy matrix of every member, optionally across several processes.
+
+        Parameters
+        ----------
+        processes : int, optional
+            Number of worker processes. Defaults to None, which runs serially.
+        rel_tol : float, optional
+            Relative tolerance of the integration. Defaults to 1e-12.
+        abs_tol : float, optional
+            Absolute tolerance of the integration. Defaults to 1e-12.
+
+        Returns
+        -------
+        np.ndarray
+            The (M,) stability indices of the members.
+        """
+        args = [(orbit.state, orbit.period, orbit.mass_ratio, rel_tol, abs_tol) for orbit in self.orbits]
+
+        if processes is None:
+            monodromies = [_monodromy(*arg) for arg in args]
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                monodromies = list(executor.map(_monodromy, *zip(*args)))
+
+        for orbit, monodromy in zip(self.orbits, monodromies):
+            orbit.monodromy = monodromy
+
+        return np.array([orbit.stability_index for orbit in self.orbits])
+
+    def __repr__(self) -> str:
+        """Return a string representation of the family."""
+        return f"PeriodicOrbitFamily({len(self.orbits)} orbits)"
+
+
+def lyapunov_initial_guess(mass_ratio: float, lagrange_point: int = 1,
+                           amplitude: float = 1e-3) -> np.ndarray:
+    """
+    Initial guess of a small planar Lyapunov orbit around a collinear Lagrange point from the
+    solution of the CR3BP equations linearized about the point.
+
+    Parameters
+    ----------
+    mass_ratio : float
+        The mass ratio between the two primary bodies in the system.
+    lagrange_point : int, optional
+        The collinear Lagrange point 1, 2 or 3. Defaults to 1.
+    amplitude : float, optional
+        The non-dimensional x amplitude of the orbit. Defaults to 1e-3.
+
+    Raises
+    ------
+    ValueError
+        If lagrange_point is not 1, 2 or 3.
+
+    Returns
+    -------
+    np.ndarray
+        The initial state [x, 0, 0, 0, vy, 0] on the x-axis.
+    """
+    if lagrange_point not in (1, 2, 3):
+        raise ValueError("lagrange_point must be 1, 2 or 3.")
+
+    x_lagrange = planar_lagrange_points(mass_ratio).colinear_points()[lagrange_point - 1]
+
+    # Linearized in-plane frequency and amplitude ratio
+    c2 = (1 - mass_ratio)/abs(x_lagrange + mass_ratio)**3 + mass_ratio/abs(x_lagrange - 1 + mass_ratio)**3
+    omega = np.sqrt((c2 - 2 + np.sqrt(9*c2**2 - 8*c2))/2)
+    kappa = (omega**2 + 1 + 2*c2)/(2*omega)
+
+    return np.array([x_lagrange - amplitude, 0, 0, 0, kappa*amplitude*omega, 0])
+
+def correct_periodic_orbit(state: Union[list, np.ndarray], mass_ratio: float, fixed_index: int = 0,
+                           tol: float = 1e-11, max_iter: int = 50, max_time: float = 2*np.pi,
+                           rel_tol: float = 1e-12, abs_tol: float = 1e-12) -> PeriodicOrbit:
+    """
+    Single-shooting differential corrector for periodic orbits symmetric about the x-z plane.
+
+    The initial state [x0, 0, z0, 0, vy0, 0] is integrated with its State Transition Matrix
+    to the next x-z plane crossing, where a perpendicular crossing (vx = vz = 0) is enforced
+    by Newton iterations on the free initial conditions. Planar orbits (z0 = 0) only target
+    vx = 0 and vary vy0. Spatial orbits target vx = vz = 0 and vary two of x0, z0 and vy0.
+
+    Parameters
+    ----------
+    state : Union[list, np.ndarray]
+        The initial guess [x0, 0, z0, 0, vy0, 0].
+    mass_ratio : float
+        The mass ratio between the two primary bodies in the system.
+    fixed_index : int, optional
+        The index of the initial condition held fixed: 0 (x0), 2 (z0) or 4 (vy0).
+        Defaults to 0.
+    tol : float, optional
+        Convergence tolerance on the crossing velocity components. Defaults to 1e-11.
+    max_iter : int, optional
+        Maximum number of Newton iterations. Defaults to 50.
+    max_time : float, optional
+        Maximum integration time searched for the half period crossing. Defaults to 2*pi.
+    rel_tol : float, optional
+        Relative tolerance of the integration. Defaults to 1e-12.
+    abs_tol : float, optional
+        Absolute tolerance of the integration. Defaults to 1e-12.
+
+    Raises
+    ------
+    RuntimeError
+        If the corrector does not converge within `max_iter` iterations.
+
+    Returns
+    -------
+    PeriodicOrbit
+        The corrected periodic orbit.
+    """
+    state = np.array(state, dtype=float)
+    free, targets = _shooting_variables(state)
+    free = [index for index in free if index != fixed_index]
+
+    for _ in range(max_iter):
+        crossing = _half_period_crossing(state, mass_ratio, max_time, rel_tol, abs_tol)
+        error = crossing[0][targets]
+
+        if np.max(np.abs(error)) < tol:
+            return PeriodicOrbit(state, 2*crossing[1], mass_ratio)
+
+        jacobian = _shooting_jacobian(crossing, mass_ratio, free, targets)
+        state[free] -= np.linalg.lstsq(jacobian, error, rcond=None)[0]
+
+    raise RuntimeError("Periodic orbit differential correction failed to converge.")
+
+def continue_family(orbit: PeriodicOrbit, step: float, num_orbits: int,
+                    method: str = "pseudo-arclength", parameter_index: int = 0,
+                    processes: int = None, **corrector_options) -> PeriodicOrbitFamily:
+    """
+    Generate a family of periodic orbits by continuation from a converged member.
+
+    Each converged orbit seeds the next one:
+        - "natural": steps the initial condition `parameter_index` by `step` and corrects
+          the remaining free initial conditions, predicted along the family tangent for the
+          first step and extrapolated from the previous two members afterwards.
+        - "pseudo-arclength": steps a distance `step` along the tangent of the family in
+          the space of free initial conditions and corrects with the arclength constraint
+          appended, which follows the family around turning points of any single parameter.
+
+    Parameters
+    ----------
+    orbit : PeriodicOrbit
+        The first, converged, member of the family.
+    step : float
+        The continuation step size. Its sign sets the direction of the continuation.
+    num_orbits : int
+        The number of orbits in the family, including `orbit`.
+    method : str, optional
+        "natural" or "pseudo-arclength". Defaults to "pseudo-arclength".
+    parameter_index : int, optional
+        The initial condition stepped by natural-parameter continuation: 0 (x0), 2 (z0) or
+        4 (vy0). Also sets the initial direction of pseudo-arclength continuation.
+        Defaults to 0.
+    processes : int, optional
+        If given, the monodromy matrices of all members are computed afterwards across this
+        many worker processes, with the rel_tol and abs_tol of `corrector_options`.
+        Defaults to None.
+    **corrector_options
+        Keyword arguments passed to `correct_periodic_orbit()`, such as tol or max_time.
+
+    Raises
+    ------
+    ValueError
+        If method is unknown, or parameter_index is not a free initial condition of
+        orbit, e.g. z0 of a planar orbit.
+
+    Returns
+    -------
+    PeriodicOrbitFamily
+        The family of periodic orbits.
+    """
+    if method not in ("natural", "pseudo-arclength"):
+        raise ValueError(f"Unknown continuation method '{method}'. Expected 'natural' or 'pseudo-arclength'.")
+
+    free = _shooting_variables(orbit.state)[0]
+    if parameter_index not in free:
+        raise ValueError(f"parameter_index must be one of the free initial conditions {free} of this orbit.")
+
+    orbits = [orbit]
+    if method == "natural":
+        for _ in range(num_orbits - 1):
+            guess = orbits[-1].state.copy()
+            if len(orbits) > 1:
+                # Secant extrapolation of the previous two members
+                guess += orbits[-1].state - orbits[-2].state
+            else:
+                # First order prediction along the family tangent
+                tangent = _family_tangent(orbits[-1], free, **corrector_options)
+                guess[free] += step*tangent/tangent[free.index(parameter_index)]
+            guess[parameter_index] = orbits[-1].state[parameter_index] + step
+
+            orbits.append(correct_periodic_orbit(guess, orbit.mass_ratio, fixed_index=parameter_index,
+                                                 **corrector_options))
+    else:
+        tangent = None
+        for _ in range(num_orbits - 1):
+            orbit_next, tangent = _pseudo_arclength_step(orbits[-1], step, tangent, parameter_index,
+                                                         **corrector_options)
+            orbits.append(orbit_next)
+
+    family = PeriodicOrbitFamily(orbits)
+    if processes is not None:
+        # Monodromy matrices are integrated at the tolerances the members were corrected with
+        family.compute_stability(processes=processes,
+                                 rel_tol=corrector_options.get("rel_tol", 1e-12),
+                                 abs_tol=corrector_options.get("abs_tol", 1e-12))
+
+    return family
+
+
+def _shooting_variables(state: np.ndarray) -> tuple:
+    """Free initial conditions and targeted crossing components for planar or spatial orbits."""
+    if state[2] == 0 and state[5] == 0:
+        return [0, 4], [3]
+    return [0, 2, 4], [3, 5]
+
+def _half_period_crossing(state: np.ndarray, mass_ratio: float, max_time: float,
+                          rel_tol: float, abs_tol: float) -> tuple:
+    """Integrate state and STM to the next x-z plane crossing, returning (state, time, stm)."""
+    model = CR3BP(state[:3].tolist(), state[3:].tolist())
+    model.mu = mass_ratio
+
+    # Crossing direction is opposite to the initial y velocity
+    crossing = plane_crossing(axis=1, direction=-np.sign(state[4]), terminal=True)
+
+    sol = integrate(model.non_dim_stm_equations, [0, max_time],
+                    np.concatenate((state, np.eye(6).ravel())),
+                    method="DOP853", rtol=rel_tol, atol=abs_tol, events=crossing)
+
+    if len(sol.t_events[0]) == 0:
+        raise RuntimeError("No x-z plane crossing found, increase max_time.")
+
+    y_cross = sol.y_events[0][0]
+    return y_cross[:6], sol.t_events[0][0], y_cross[6:].reshape(6, 6)
+
+def _shooting_jacobian(crossing: tuple, mass_ratio: float, free: list, targets: list) -> np.ndarray:
+    """Sensitivity of the targeted crossing components to the free initial conditions."""
+    final_state, _, stm = crossing
+
+    # Time derivative of the state at the crossing
+    x, y, z, vx, vy, vz = final_state
+    model = CR3BP([x, y, z], [vx, vy, vz])
+    model.mu = mass_ratio
+    derivative = model.non_dim_differential_equations(0, final_state)
+
+    # The crossing time varies to keep y = 0
+    return (stm[np.ix_(targets, free)] -
+            np.outer(derivative[targets], stm[1, free])/derivative[1])
+
+def _family_tangent(orbit: PeriodicOrbit, free: list, max_time: float = 2*np.pi,
+                    rel_tol: float = 1e-12, abs_tol: float = 1e-12, **kwargs) -> np.ndarray:
+    """Unit tangent of the family in the free initial conditions, the null space of the shooting Jacobian."""
+    targets = _shooting_variables(orbit.state)[1]
+    crossing = _half_period_crossing(orbit.state, orbit.mass_ratio, max_time, rel_tol, abs_tol)
+    jacobian = _shooting_jacobian(crossing, orbit.mass_ratio, free, targets)
+
+    return np.linalg.svd(jacobian)[2][-1]
+
+def _pseudo_arclength_step(orbit: PeriodicOrbit, step: float, tangent: np.ndarray,
+                           parameter_index: int, tol: float = 1e-11, max_iter: int = 50,
+                           max_time: float = 2*np.pi, rel_tol: float = 1e-12,
+                           abs_tol: float = 1e-12) -> tuple:
+    """Single pseudo-arclength continuation step, returning the new orbit and family tangent."""
+    free, targets = _shooting_variables(orbit.state)
+    null_vector = _family_tangent(orbit, free, max_time=max_time, rel_tol=rel_tol, abs_tol=abs_tol)
+
+    # Keep the orientation of the previous step
+    reference = tangent if tangent is not None else np.eye(len(free))[free.index(parameter_index)]
+    if np.dot(null_vector, reference) < 0:
+        null_vector = -null_vector
+
+    state = orbit.state.copy()
+    state[free] += step*null_vector
+
+    for _ in range(max_iter):
+        crossing = _half_period_crossing(state, orbit.mass_ratio, max_time, rel_tol, abs_tol)
+        error = np.concatenate((crossing[0][targets],
+                                [np.dot(state[free] - orbit.state[free], null_vector) - step]))
+
+        if np.max(np.abs(error)) < tol:
+            return PeriodicOrbit(state, 2*crossing[1], orbit.mass_ratio), null_vector
+
+        jacobian = np.vstack((_shooting_jacobian(crossing, orbit.mass_ratio, free, targets), null_vector))
+        state[free] -= np.linalg.solve(jacobian, error)
+
+    raise RuntimeError("Pseudo-arclength continuation failed to converge.")
+
+def _monodromy(state: np.ndarray, period: float, mass_ratio: float,
+               rel_tol: float, abs_tol: float) -> np.ndarray:
+    """State Transition Matrix of a periodic orbit after one full period."""
+    model = CR3BP(state[:3].tolist(), state[3:].tolist())
+    model.mu = mass_ratio
+
+    sol = integrate(model.non_dim_stm_equations, [0, period],
+                    np.concatenate((state, np.eye(6).ravel())),
+                    t_eval=[period], method="DOP853", rtol=rel_tol, atol=abs_tol)
+
+    return sol.y[6:, -1].reshape(6, 6)
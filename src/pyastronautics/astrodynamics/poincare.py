@@ -0,0 +1,203 @@
+"""
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+"""
+
+import numpy as np
+from typing import Union
+from concurrent.futures import ProcessPoolExecutor
+
+from .three_body_problem import CR3BP
+from .events import plane_crossing
+
+class PoincareMap(object):
+    """
+    Poincaré map of the planar CR3BP on the x-axis section (y = 0) at a fixed Jacobi constant.
+
+    Initial conditions are seeded on the section from (x, vx) pairs, with vy chosen by
+    `CR3BP.get_jacobi_velocity()` so every seed has the requested Jacobi constant. The seeds
+    are propagated, optionally over a process pool, and each section crossing is located
+    precisely with an event function. Crossings of every seed are cached, so extending a map
+    only propagates the new seeds.
+
+    Attributes
+    ----------
+    jacobi : float
+        The Jacobi constant of the map.
+    mass_ratio : float
+        The mass ratio of the system, default is the Earth-Moon system.
+    direction : int
+        Only record crossings with increasing (1) or decreasing (-1) y, default is 1. Seeds
+        start in this direction.
+    max_time : float
+        The non-dimensional propagation time of each seed, default is 20*2π.
+    num_crossings : int
+        The maximum number of crossings kept per seed, default is None which keeps all.
+    integrator : str
+        The adaptive integrator used, default is "DOP853".
+    rel_tol : float
+        Relative tolerance of the integrator, default is 1e-10.
+    abs_tol : float
+        Absolute tolerance of the integrator, default is 1e-10.
+    processes : int
+        The number of worker processes, default is None which runs serially.
+    chunk_size : int
+        The number of seeds propagated by each task, default is 16.
+    crossings : np.ndarray
+        The (M, 6) states of every crossing after `compute()`.
+    crossing_times : np.ndarray
+        The (M,) crossing times after `compute()`.
+    seed_index : np.ndarray
+        The (M,) index of the seed of every crossing after `compute()`.
+    """
+
+    def __init__(self, jacobi: float, mass_ratio: float = 0.012150515586657583):
+        """
+        Initialize the PoincareMap instance.
+
+        Parameters
+        ----------
+        jacobi : float
+            The Jacobi constant of the map.
+        mass_ratio : float, optional
+            The mass ratio of the system. Defaults to the Earth-Moon system.
+        """
+        self.jacobi = jacobi
+        self.mass_ratio = mass_ratio
+
+        self.direction = 1
+        self.max_time = 20*2*np.pi
+        self.num_crossings = None
+        self.integrator = "DOP853"
+        self.rel_tol = 1e-10
+        self.abs_tol = 1e-10
+        self.processes = None
+        self.chunk_size = 16
+
+        # Crossings of previously propagated seeds
+        self._cache = {}
+
+    def seed(self, x: Union[float, list, np.ndarray],
+             vx: Union[float, list, np.ndarray] = 0.0) -> np.ndarray:
+        """
+        Build initial states on the section with the map's Jacobi constant.
+
+        Parameters
+        ----------
+        x : Union[float, list, np.ndarray]
+            The x coordinates of the seeds.
+        vx : Union[float, list, np.ndarray], optional
+            The x velocities of the seeds, broadcast against x. Defaults to 0.0.
+
+        Returns
+        -------
+        np.ndarray
+            The (N, 6) initial states [x, 0, 0, vx, vy, 0]. Seeds whose (x, vx) pair is not
+            reachable at the Jacobi constant have NaN vy.
+        """
+        x, vx = np.broadcast_arrays(np.atleast_1d(np.asarray(x, dtype=float)),
+                                    np.asarray(vx, dtype=float))
+
+        with np.errstate(invalid="ignore"):
+            speed = CR3BP.get_jacobi_velocity(x, 0.0, self.jacobi, self.mass_ratio)
+            vy = self.direction*np.sqrt(speed**2 - vx**2)
+
+        zeros = np.zeros_like(x)
+        return np.column_stack((x, zeros, zeros, vx, vy, zeros))
+
+    def compute(self, x: Union[float, list, np.ndarray],
+                vx: Union[float, list, np.ndarray] = 0.0) -> np.ndarray:
+        """
+        Propagate the seeds and collect their section crossings.
+
+        Seeds that are not reachable at the Jacobi constant are skipped, and seeds found in
+        the cache are not propagated again.
+
+        Parameters
+        ----------
+        x : Union[float, list, np.ndarray]
+            The x coordinates of the seeds.
+        vx : Union[float, list, np.ndarray], optional
+            The x velocities of the seeds, broadcast against x. Defaults to 0.0.
+
+        Returns
+        -------
+        np.ndarray
+            The (M, 6) crossing states, also stored in `self.crossings` along with
+            `self.crossing_times` and `self.seed_index`.
+        """
+        seeds = self.seed(x, vx)
+        settings = (self.jacobi, self.mass_ratio, self.direction, self.max_time,
+                    self.integrator, self.rel_tol, self.abs_tol)
+        keys = [(settings, tuple(state)) for state in seeds]
+
+        valid = np.flatnonzero(np.isfinite(seeds[:, 4]))
+        # Propagate each uncached seed once, even when repeated
+        missing = {}
+        for k in valid:
+            if keys[k] not in self._cache:
+                missing.setdefault(keys[k], k)
+        missing = list(missing.values())
+
+        chunks = [missing[start:start + self.chunk_size]
+                  for start in range(0, len(missing), self.chunk_size)]
+        options = (self.mass_ratio, self.direction, self.max_time, self.integrator,
+                   self.rel_tol, self.abs_tol)
+
+        if self.processes is None:
+            results = [_section_crossings(seeds[chunk], *options) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.processes) as executor:
+                results = list(executor.map(_section_crossings,
+                                            [seeds[chunk] for chunk in chunks],
+                                            *[[option]*len(chunks) for option in options]))
+
+        for chunk, crossings in zip(chunks, results):
+            for k, crossing in zip(chunk, crossings):
+                self._cache[keys[k]] = crossing
+
+        # Gather Crossings in Seed Order
+        # ---------------------------------------------------------------------
+        times, states, index = [], [], []
+        for k in valid:
+            t_cross, y_cross = self._cache[keys[k]]
+            if self.num_crossings is not None:
+                t_cross, y_cross = t_cross[:self.num_crossings], y_cross[:self.num_crossings]
+            times.append(t_cross)
+            states.append(y_cross)
+            index.append(np.full(len(t_cross), k))
+
+        self.crossing_times = np.concatenate(times) if times else np.empty(0)
+        self.crossings = np.concatenate(states) if states else np.empty((0, 6))
+        self.seed_index = np.concatenate(index) if index else np.empty(0, dtype=int)
+
+        return self.crossings
+
+    def clear_cache(self) -> None:
+        """Discard the crossings of every previously propagated seed."""
+        self._cache.clear()
+
+
+def _section_crossings(seeds: np.ndarray, mass_ratio: float, direction: int, max_time: float,
+                       integrator: str, rel_tol: float, abs_tol: float) -> list:
+    """Propagate seeds on the section, returning (times, states) of their later crossings."""
+    crossings = []
+
+    for state in seeds:
+        model = CR3BP(state[:3].tolist(), state[3:].tolist())
+        model.mu = mass_ratio
+        model.integrator = integrator
+        model.rel_tol = rel_tol
+        model.abs_tol = abs_tol
+        model.rhs_backend = "numpy"
+        model.verbose = False
+        model.time = np.array([0.0, max_time])
+
+        model.solve_non_dim_trajectory(events=plane_crossing(axis=1, direction=direction))
+
+        # The seed itself lies on the section and is reported as a crossing at t = 0
+        t_cross = model.event_times[0]
+        later = t_cross > 1e-10
+        crossings.append((t_cross[later], model.event_states[0][later]))
+
+    return crossings
@@ -4,13 +4,110 @@
 """
 
 import math
-import pickle
+import warnings
+import functools
 import numpy as np
 from typing import Union
 from numpy.linalg import norm
-from scipy.integrate import solve_ivp
 from scipy.optimize import newton
 
+from .integrators import integrate, iter_integrate
+from .instrumentation import instrumented_integrate
+from .trajectory import DenseTrajectory, save_model_trajectory
+
+# Optional JIT compiler for the right-hand side backends
+try:
+    import numba
+except ImportError:
+    numba = None
+
+def _non_dim_acceleration_kernel(sqrt: callable) -> callable:
+    """Build the non-dimensional CR3BP acceleration kernel around a square root function."""
+
+    def acceleration(x: float, y: float, z: float, vx: float, vy: float, mu: float) -> tuple:
+        # Compute Differential Equation Constants: Position to Primary Bodies
+        r1 = sqrt((x+mu)**2 + y**2 + z**2)
+        r2 = sqrt((x-1+mu)**2 + y**2 + z**2)
+
+        # Differential Equations: ddot is a second derivative
+        x_ddot =  2*vy + x - (1-mu)*(x+mu)/r1**3 - mu*(mu+x-1)/r2**3
+        y_ddot = -2*vx + y - y*(1-mu)/r1**3 - mu*y/r2**3
+        z_ddot =  -z*(1-mu)/r1**3 - mu*z/r2**3
+
+        return x_ddot, y_ddot, z_ddot
+
+    return acceleration
+
+# Acceleration of a single state evaluated on Python floats
+_non_dim_acceleration = _non_dim_acceleration_kernel(math.sqrt)
+# Acceleration evaluated element-wise on arrays of the state components of many states
+_array_non_dim_acceleration = _non_dim_acceleration_kernel(np.sqrt)
+
+def _numpy_non_dim_rhs(t: float, state: np.ndarray, mu: float) -> np.ndarray:
+    """Right-hand side kernel of the "numpy" backend."""
+
+    x,y,z, vx,vy,vz = state.tolist()
+    return np.array((vx, vy, vz) + _non_dim_acceleration(x, y, z, vx, vy, mu))
+
+def _jacobi_potential(x: Union[float, np.ndarray], y: Union[float, np.ndarray],
+                      mass_ratio: float) -> np.ndarray:
+    """Zero velocity Jacobi constant 2U = x^2 + y^2 + 2(1 - mu)/r1 + 2mu/r2 in the plane."""
+
+    r1 = np.sqrt((x + mass_ratio)**2 + y**2)
+    r2 = np.sqrt((x - 1 + mass_ratio)**2 + y**2)
+
+    with np.errstate(divide='ignore'):
+        return x**2 + y**2 + 2*(1 - mass_ratio)/r1 + 2*mass_ratio/r2
+
+def _spatial_potential(position: np.ndarray, mass_ratio: float, out: np.ndarray,
+                       work: np.ndarray) -> np.ndarray:
+    """Spatial 2U = x^2 + y^2 + 2(1 - mu)/r1 + 2mu/r2 of (..., 3) positions, written into out."""
+
+    x, y, z = position[..., 0], position[..., 1], position[..., 2]
+
+    # y^2 + z^2 is shared by both distances
+    rho = np.multiply(y, y)
+    np.multiply(z, z, out=work)
+    rho += work
+
+    # 2(1 - mu)/r1
+    np.add(x, mass_ratio, out=work)
+    np.multiply(work, work, out=work)
+    work += rho
+    np.sqrt(work, out=work)
+    np.divide(2*(1 - mass_ratio), work, out=out)
+
+    # 2mu/r2
+    np.add(x, mass_ratio - 1, out=work)
+    np.multiply(work, work, out=work)
+    work += rho
+    np.sqrt(work, out=work)
+    np.divide(2*mass_ratio, work, out=work)
+    out += work
+
+    # x^2 + y^2
+    rho -= np.multiply(z, z, out=work)
+    out += rho
+    out += np.multiply(x, x, out=work)
+
+    return out
+
+if numba is not None:
+    _numba_non_dim_acceleration = numba.njit(cache=True)(_non_dim_acceleration)
+
+    @numba.njit(cache=True)
+    def _numba_non_dim_rhs(t, state, mu):
+        """Right-hand side kernel of the "numba" backend."""
+
+        derivative = np.empty(6)
+        derivative[0] = state[3]
+        derivative[1] = state[4]
+        derivative[2] = state[5]
+        derivative[3], derivative[4], derivative[5] = _numba_non_dim_acceleration(
+            state[0], state[1], state[2], state[3], state[4], mu)
+
+        return derivative
+
 class CR3BP(object):
     """
     Non-Dimensional Circular Restricted Three-Body Problem as defined in the
@@ -37,8 +134,40 @@ class CR3BP(object):
         Absolute tolerance value for numerical analysis, default is 1e-10.
     rel_tol : float
         Relative tolerance value for numerical analysis, default is 1e-10.
-    num_sol_pickle_file : str
-        The filename for the pickle file to store numerical solution data.
+    integrator : str
+        The integration method, default is "RK45". Any `scipy.integrate.solve_ivp()`
+        method or the fixed-step integrator "RK8" from `integrators.integrate()`. The
+        "symplectic" integrator is not available since the Coriolis terms depend on
+        velocity.
+    step_size : float
+        Maximum step size of the fixed-step integrators, default is None which takes
+        one step per interval of `time`.
+    verbose : bool
+        Print the solver status after each solve, default is True.
+    trajectory_file : str
+        The filename of the `.npz` trajectory file written when saving the analysis.
+        Replaces the deprecated `num_sol_pickle_file`, which still forwards to it.
+    save_dtype : str
+        The data type of the saved state vectors, default is "float64". Use "float32"
+        to halve the file size.
+    save_compressed : bool
+        Compress the saved trajectory file, default is False.
+    instrument : bool
+        Record a `SolverReport` of each solve in `self.solver_report` with nfev, njev,
+        accepted and rejected steps and the wall time in the right-hand side and the
+        integrator, see `instrumentation.instrumented_integrate()`. Default is False.
+    track_memory : bool
+        Also record the peak memory allocated during each instrumented solve with
+        `tracemalloc`, default is False.
+    report_callback : callable
+        Function report_callback(report) called with the `SolverReport` of each
+        instrumented solve, e.g. to forward it to a metrics pipeline, default is None.
+    rhs_backend : str
+        The right-hand side evaluated by the solver, default is "python".
+            - "python": the `non_dim_differential_equations` method
+            - "numpy": a kernel on Python floats building a single array per call
+            - "numba": the same kernel JIT compiled by Numba, falling back to
+              "numpy" when Numba is not installed
    
     """
     def __init__(self, position: list[float], velocity: list[float]):
@@ -82,10 +211,38 @@ class CR3BP(object):
         # Default tolerance values
         self.abs_tol = 1e-10
         self.rel_tol = 1e-10
+        # Default integrator
+        self.integrator = "RK45"
+        self.step_size = None
+        # Print the solver status after each solve
+        self.verbose = True
+        # Right-hand side evaluated by the solver
+        self.rhs_backend = "python"
 
         # Set File Names
         # ---------------------------------------   
-        self.num_sol_pickle_file = "cr3bp_solution.pickle"  
+        self.trajectory_file = "cr3bp_solution.npz"
+        self.save_dtype = "float64"
+        self.save_compressed = False
+
+        # Solver Instrumentation
+        # ---------------------------------------
+        self.instrument = False
+        self.track_memory = False
+        self.report_callback = None
+
+    @property
+    def num_sol_pickle_file(self) -> str:
+        """Deprecated alias of `trajectory_file`."""
+        warnings.warn("num_sol_pickle_file is deprecated, use trajectory_file instead.",
+                      DeprecationWarning, stacklevel=2)
+        return self.trajectory_file
+
+    @num_sol_pickle_file.setter
+    def num_sol_pickle_file(self, value: str) -> None:
+        warnings.warn("num_sol_pickle_file is deprecated, use trajectory_file instead.",
+                      DeprecationWarning, stacklevel=2)
+        self.trajectory_file = value
 
     def non_dim_differential_equations(self, t: float, state: Union[list, np.ndarray]) -> np.ndarray:
         """
@@ -137,13 +294,91 @@ class CR3BP(object):
         # [x, y, z, vx, vy, vx]
         return np.concatenate(([vx,vy,vz],[x_ddot,y_ddot,z_ddot]))
 
-    def solve_non_dim_trajectory(self, save_analysis:bool = False) -> None:
+    def non_dim_stm_equations(self, t: float, state: np.ndarray) -> np.ndarray:
+        """
+        Define the non-dimensional differential equations of the Circular Restricted Three-Body
+        Problem augmented with the variational equations of the State Transition Matrix (STM).
+
+        The 42 element vector `state` is expected to be structured as follows:
+        [x, y, z, vx, vy, vz, phi_11, phi_12, ..., phi_66], where the STM phi is stored
+        row by row. The STM evolves as d(phi)/dt = A(t) phi with the analytic system
+        matrix A from `CR3BP.linearized_system_matrix()`.
+
+        Parameters
+        ----------
+        t : float
+            The current time in the simulation.
+        state : np.ndarray
+            The augmented state vector of the body and its STM.
+
+        Returns
+        -------
+        np.ndarray
+            The derivatives of the augmented state vector.
+        """
+
+        position = state[:3]
+        velocity = state[3:6]
+        phi = state[6:].reshape(6, 6)
+
+        hessian = self.potential_hessian(position, self.mu)
+        x_ddot, y_ddot, z_ddot = _non_dim_acceleration(*state[:5].tolist(), self.mu)
+
+        # d(phi)/dt = [[0, I], [U'', Omega]] phi, expanded by blocks
+        phi_dot = np.empty((6, 6))
+        phi_dot[:3] = phi[3:]
+        phi_dot[3:] = hessian @ phi[:3]
+        phi_dot[3] += 2*phi[4]
+        phi_dot[4] -= 2*phi[3]
+
+        return np.concatenate((velocity, (x_ddot, y_ddot, z_ddot), phi_dot.ravel()))
+
+    def non_dim_rhs(self) -> callable:
+        """
+        Select the right-hand side function of the non-dimensional differential equations
+        according to `self.rhs_backend`.
+
+        The "numpy" and "numba" backends evaluate the same equations as
+        `non_dim_differential_equations` without its per-call type checks and array
+        concatenation. A fresh array is returned on every call since
+        `scipy.integrate.solve_ivp()` keeps references to previously returned derivatives.
+
+        Raises
+        ------
+        ValueError
+            If `self.rhs_backend` is not a known backend.
+
+        Returns
+        -------
+        callable
+            A function with signature fun(t, state) returning the state derivatives.
+        """
+
+        backend = self.rhs_backend
+        if backend == "numba" and numba is None:
+            warnings.warn("Numba is not installed, falling back to the 'numpy' rhs_backend.")
+            backend = "numpy"
+
+        mu = self.mu
+        if backend == "python":
+            return self.non_dim_differential_equations
+        elif backend == "numpy":
+            return lambda t, state: _numpy_non_dim_rhs(t, state, mu)
+        elif backend == "numba":
+            return lambda t, state: _numba_non_dim_rhs(t, state, mu)
+
+        raise ValueError(f"Unknown rhs_backend '{self.rhs_backend}'. Expected 'python', 'numpy' or 'numba'.")
+
+    def solve_non_dim_trajectory(self, save_analysis:bool = False, dense_output:bool = False,
+                                 stm:bool = False, events: Union[callable, list] = None,
+                                 calc_jacobi:bool = False) -> None:
         """
         Solve the trajectory of the Non-Dimensional Circular Restricted Three-Body Problem using the
         initial value problem (IVP).
 
         This method uses the `scipy.integrate.solve_ivp()` function to numerically integrate the differential equations 
         governing the motion of the bodies, given the initial conditions specified in `self.initial_state_vector`.
+        The integration method is selected by `self.integrator`, see `integrators.integrate()`.
 
         Before calling this method, ensure that `self.time` is defined as a sequence of non-dimensional time points
         over which the simulation will be evaluated. If `self.time` is not defined, a ValueError will be raised.
@@ -162,6 +397,30 @@ class CR3BP(object):
         ----------
         save_analysis : bool, optional
             If True, analysis results will be saved for later use. Defaults to False.
+        dense_output : bool, optional
+            If True, the continuous solution is kept and stored in `self.trajectory` as a
+            `DenseTrajectory` that can be evaluated at any time between `self.time[0]` and
+            `self.time[-1]`, otherwise it is set to None. Not available for fixed-step
+            integrators. Defaults to False.
+        stm : bool, optional
+            If True, the State Transition Matrix is integrated alongside the state with
+            `non_dim_stm_equations()`. The (T, 6, 6) STM history is stored in
+            `self.numerical_stm` and the STM at `self.time[-1]` in `self.final_stm`,
+            otherwise both are set to None. The `rhs_backend` is not used in this mode.
+            Defaults to False.
+        events : Union[callable, list], optional
+            Event function or list of event functions passed to `solve_ivp()`, such as those
+            built by the `events` module, e.g. `events.periapsis()`. Event times are located
+            precisely regardless of the spacing of `self.time` and stored in
+            `self.event_times`, with the matching states in `self.event_states`, one array
+            per event, otherwise both are set to None. A terminal event ends the output at
+            the last point of `self.time` before the event. Not available for fixed-step
+            integrators. Defaults to None.
+        calc_jacobi : bool, optional
+            If True, the spatial Jacobi constant at every time point is computed with
+            `jacobi_constant()` and stored in `self.jacobi_history`, and its largest
+            deviation from the initial value in `self.jacobi_drift` to monitor the accuracy
+            of the integration, otherwise both are set to None. Defaults to False.
 
         Raises
         ------
@@ -177,31 +436,231 @@ class CR3BP(object):
         if not hasattr(self, 'time'):
             raise ValueError("Attribute 'time' must be defined before calling solve_trajectory.")
 
-        ivp = self.initial_state_vector
-
-        self.num_sol = solve_ivp(self.non_dim_differential_equations,
-                                [self.time[0],self.time[-1]],
-                                 ivp,
-                                 t_eval=self.time,
-                                 rtol=self.rel_tol,
-                                 atol=self.abs_tol)
+        # Results of a previous solve no longer match this one
+        self.trajectory = None
+        self.numerical_stm = None
+        self.final_stm = None
+        self.event_times = None
+        self.event_states = None
+        self.jacobi_history = None
+        self.jacobi_drift = None
+
+        if stm:
+            # Augment the initial state with an identity STM
+            ivp = np.concatenate((self.initial_state_vector, np.eye(6).ravel()))
+            fun = self.non_dim_stm_equations
+        else:
+            ivp = self.initial_state_vector
+            fun = self.non_dim_rhs()
+
+        if self.integrator == "symplectic":
+            raise ValueError("The 'symplectic' integrator requires velocity independent accelerations.")
+
+        # Only request dense output when needed, fixed-step integrators do not support it
+        options = {"dense_output": True} if dense_output else {}
+        if events is not None:
+            options["events"] = events
+
+        # Instrumented solves also record a SolverReport
+        solver = integrate
+        if self.instrument:
+            solver = instrumented_integrate
+            options.update(track_memory=self.track_memory, callback=self.report_callback)
+
+        self.num_sol = solver(fun,
+                              [self.time[0],self.time[-1]],
+                              ivp,
+                              t_eval=self.time,
+                              method=self.integrator,
+                              rtol=self.rel_tol,
+                              atol=self.abs_tol,
+                              step_size=self.step_size,
+                              **options)
+
+        if self.instrument:
+            self.solver_report = self.num_sol.report
 
         # Check if solver reached interval end or a termination event occurred 
-        if not self.num_sol.success:
-            print(f"Solver termination status: {self.num_sol.status}")
-        else:
-            print(f"Solver Success: {self.num_sol.success}")
+        if self.verbose:
+            if not self.num_sol.success:
+                print(f"Solver termination status: {self.num_sol.status}")
+            else:
+                print(f"Solver Success: {self.num_sol.success}")
 
         # Extract Position and Velocity Results
         self.numerical_position = self.num_sol.y[:3,:].T
-        self.numerical_velocity = self.num_sol.y[3:,:].T
+        self.numerical_velocity = self.num_sol.y[3:6,:].T
+
+        self.final_state = self.num_sol.y[:6,-1].T
+
+        # Extract State Transition Matrix Results
+        if stm:
+            self.numerical_stm = self.num_sol.y[6:,:].T.reshape(-1, 6, 6)
+            self.final_stm = self.numerical_stm[-1]
+
+        # Continuous Solution
+        if dense_output:
+            self.trajectory = DenseTrajectory(self.num_sol.sol)
 
-        self.final_state = self.num_sol.y[:,-1].T
+        # Jacobi Constant Drift Monitor
+        if calc_jacobi:
+            self.jacobi_history = self.jacobi_constant(self.num_sol.y[:6,:].T, self.mu)
+            self.jacobi_drift = np.max(np.abs(self.jacobi_history - self.jacobi_history[0]))
+
+        # Event Times and States, without the STM
+        if events is not None:
+            self.event_times = self.num_sol.t_events
+            self.event_states = [y_event[:, :6] for y_event in self.num_sol.y_events]
 
         # Allow user to save numerical analysis
         if save_analysis:
-            with open(self.num_sol_pickle_file, 'wb') as handle:
-                pickle.dump(self, handle)
+            save_model_trajectory(self, self.num_sol.t, self.num_sol.y.T, self.integrator,
+                                  "non-dimensional")
+
+    def iter_non_dim_trajectory(self, chunk_size: int = 1000, calc_jacobi: bool = False):
+        """
+        Propagate the trajectory over `self.time` in segments, yielding each segment as soon
+        as it is integrated.
+
+        This is the streaming counterpart of `solve_non_dim_trajectory()` for long propagations. Only one
+        chunk of `chunk_size` time points is held in memory at a time, so callers can write
+        each chunk to disk or reduce it on the fly. Adaptive integrators are stepped
+        continuously across chunk boundaries, giving the same states as `solve_non_dim_trajectory()`.
+        The state at `self.time[-1]` is stored as `self.final_state` once the generator is
+        exhausted; `self.num_sol` is not set.
+
+        Parameters
+        ----------
+        chunk_size : int, optional
+            The number of time points in each yielded chunk. Defaults to 1000.
+        calc_jacobi : bool, optional
+            If True, the largest deviation of the Jacobi constant from its initial value is
+            tracked across the chunks and stored in `self.jacobi_drift`. Defaults to False.
+
+        Raises
+        ------
+        ValueError
+            If `self.time` is not defined, or the integrator is 'symplectic'.
+        RuntimeError
+            If the solver fails before reaching `self.time[-1]`.
+
+        Yields
+        ------
+        tuple
+            A tuple containing:
+                - time : numpy.ndarray
+                    The (M,) time points of the chunk.
+                - states : numpy.ndarray
+                    The (M, 6) state vectors [x, y, z, vx, vy, vz] at those times.
+
+        Examples
+        --------
+        for time, states in sc.iter_non_dim_trajectory(chunk_size=10000):
+            radius = np.linalg.norm(states[:, :3], axis=1)
+        """
+
+        # Check if self.time is defined
+        if not hasattr(self, 'time'):
+            raise ValueError("Attribute 'time' must be defined before calling iter_non_dim_trajectory.")
+
+        if self.integrator == "symplectic":
+            raise ValueError("The 'symplectic' integrator requires velocity independent accelerations.")
+
+        if calc_jacobi:
+            initial_jacobi = self.jacobi_constant(np.asarray(self.initial_state_vector), self.mu)
+            jacobi_buffer = np.empty(chunk_size)
+            self.jacobi_drift = 0.0
+
+        for time, states in iter_integrate(self.non_dim_rhs(),
+                                           self.time,
+                                           self.initial_state_vector,
+                                           method=self.integrator,
+                                           rtol=self.rel_tol,
+                                           atol=self.abs_tol,
+                                           step_size=self.step_size,
+                                           chunk_size=chunk_size):
+            self.final_state = states[-1].copy()
+
+            # Jacobi Constant Drift Monitor
+            if calc_jacobi:
+                jacobi = self.jacobi_constant(states, self.mu, out=jacobi_buffer[:len(states)])
+                jacobi -= initial_jacobi
+                self.jacobi_drift = max(self.jacobi_drift, np.max(np.abs(jacobi)))
+
+            yield time, states
+
+    @staticmethod
+    def potential_hessian(position: Union[list, np.ndarray], mass_ratio: float) -> np.ndarray:
+        """
+        Compute the Hessian of the non-dimensional force potential
+        U = (x^2 + y^2)/2 + (1 - mu)/r1 + mu/r2 at one or many positions.
+
+        Parameters
+        ----------
+        position : Union[list, np.ndarray]
+            The position vector (3,) or vectors (..., 3) in the rotating frame.
+        mass_ratio : float
+            The mass ratio between the two bodies in the system.
+
+        Returns
+        -------
+        np.ndarray
+            The symmetric second derivatives of U with shape (3, 3) or (..., 3, 3).
+        """
+
+        position = np.asarray(position, dtype=float)
+        x, y, z = position[..., 0], position[..., 1], position[..., 2]
+
+        # Position relative to the primary bodies
+        d1 = np.stack((x + mass_ratio, y, z), axis=-1)
+        d2 = np.stack((x - 1 + mass_ratio, y, z), axis=-1)
+        r1 = np.sqrt(np.sum(d1**2, axis=-1))
+        r2 = np.sqrt(np.sum(d2**2, axis=-1))
+
+        c1 = (1 - mass_ratio)/r1**3
+        c2 = mass_ratio/r2**3
+
+        # U_ij = delta_ij (planar terms) - (c1 + c2) delta_ij + 3 c1 d1_i d1_j/r1^2 + 3 c2 d2_i d2_j/r2^2
+        hessian = (3*(c1/r1**2)[..., np.newaxis, np.newaxis]*d1[..., :, np.newaxis]*d1[..., np.newaxis, :]
+                   + 3*(c2/r2**2)[..., np.newaxis, np.newaxis]*d2[..., :, np.newaxis]*d2[..., np.newaxis, :])
+        hessian -= (c1 + c2)[..., np.newaxis, np.newaxis]*np.eye(3)
+        hessian[..., 0, 0] += 1
+        hessian[..., 1, 1] += 1
+
+        return hessian
+
+    @staticmethod
+    def linearized_system_matrix(position: Union[list, np.ndarray], mass_ratio: float) -> np.ndarray:
+        """
+        Compute the system matrix A of the CR3BP equations of motion linearized about one or
+        many positions, such that d(dx)/dt = A dx for a state deviation dx.
+
+        A = [[0, I], [U'', Omega]] where U'' is the Hessian of the force potential from
+        `CR3BP.potential_hessian()` and Omega = [[0, 2, 0], [-2, 0, 0], [0, 0, 0]] holds
+        the Coriolis terms.
+
+        Parameters
+        ----------
+        position : Union[list, np.ndarray]
+            The position vector (3,) or vectors (..., 3) in the rotating frame.
+        mass_ratio : float
+            The mass ratio between the two bodies in the system.
+
+        Returns
+        -------
+        np.ndarray
+            The system matrix with shape (6, 6) or (..., 6, 6).
+        """
+
+        hessian = CR3BP.potential_hessian(position, mass_ratio)
+
+        system_matrix = np.zeros(hessian.shape[:-2] + (6, 6))
+        system_matrix[..., :3, 3:] = np.eye(3)
+        system_matrix[..., 3:, :3] = hessian
+        system_matrix[..., 3, 4] = 2
+        system_matrix[..., 4, 3] = -2
+
+        return system_matrix
 
     @staticmethod
     def get_jacobi_velocity(x: float, y: float, jacobi: float, mass_ratio: float) -> float:
@@ -284,11 +743,89 @@ class CR3BP(object):
         
         return jacobi
 
+    @staticmethod
+    def jacobi_constant(states: np.ndarray, mass_ratio: float, out: np.ndarray = None) -> np.ndarray:
+        """
+        Calculate the spatial Jacobi constant of many states at once.
+
+        Unlike `calculate_jacobi()` the z components of position and velocity are included.
+        Every term is accumulated in place into the result, so the distances to the
+        primaries and the kinetic term never get arrays of their own. Two work arrays the
+        size of the result are still allocated per call, even when `out` is given.
+
+        Parameters
+        ----------
+        states : np.ndarray
+            The (..., 6) state vectors [x, y, z, vx, vy, vz], e.g. the (T, 6) history
+            `self.num_sol.y[:6].T`. Only the first six components are used.
+        mass_ratio : float
+            The mass ratio between the two bodies in the system.
+        out : np.ndarray, optional
+            A (...,) float array the result is written into. Defaults to None.
+
+        Returns
+        -------
+        np.ndarray
+            The (...,) Jacobi constant of every state, `out` if given.
+
+        Examples
+        --------
+        jacobi = CR3BP.jacobi_constant(np.hstack((sc.numerical_position, sc.numerical_velocity)), sc.mu)
+        """
+        states = np.asarray(states, dtype=float)
+        if out is None:
+            out = np.empty(states.shape[:-1])
+        work = np.empty_like(out)
+
+        _spatial_potential(states, mass_ratio, out, work)
+
+        # Kinetic term
+        for k in (3, 4, 5):
+            out -= np.multiply(states[..., k], states[..., k], out=work)
+
+        return out
+
+    @staticmethod
+    def jacobi_velocity(position: np.ndarray, jacobi: Union[float, np.ndarray], mass_ratio: float,
+                        out: np.ndarray = None) -> np.ndarray:
+        """
+        Compute the velocity magnitude at many spatial positions for a Jacobi constant, the
+        spatial counterpart of `get_jacobi_velocity()`.
+
+        Parameters
+        ----------
+        position : np.ndarray
+            The (..., 3) positions [x, y, z]. (..., 6) state vectors are also accepted, in
+            which case only the positions are used.
+        jacobi : Union[float, np.ndarray]
+            The Jacobi constant, broadcast against the positions.
+        mass_ratio : float
+            The mass ratio between the two bodies in the system.
+        out : np.ndarray, optional
+            A (...,) float array the result is written into. Defaults to None.
+
+        Returns
+        -------
+        np.ndarray
+            The (...,) velocity magnitude, NaN inside the forbidden region. `out` if given.
+        """
+        position = np.asarray(position, dtype=float)
+        if out is None:
+            out = np.empty(position.shape[:-1])
+        work = np.empty_like(out)
+
+        _spatial_potential(position, mass_ratio, out, work)
+        out -= jacobi
+
+        with np.errstate(invalid='ignore'):
+            return np.sqrt(out, out=out)
+
     @staticmethod
     def forbidden_region(jacobi_max: float, mass_ratio: float, 
                          x_range: list = [-1.5, 1.5],
                          y_range: list = [-1.5, 1.5],
-                         linspace_num: int = 200) -> tuple:
+                         linspace_num: int = 200,
+                         mask: bool = False) -> tuple:
         """
         Compute the forbidden region in the x-y plane based on the Jacobi constant and 
         mass ratio. The forbidden region corresponds to the area where the Jacobi constant 
@@ -311,6 +848,9 @@ class CR3BP(object):
             The range of y-values for the meshgrid (default is [-1.5, 1.5]).
         linspace_num : int, optional
             The number of points to use for the linspace along each axis (default is 200).
+        mask : bool, optional
+            If True, return a boolean mask that is True where the Jacobi constant exceeds
+            `jacobi_max` instead of a NaN-filled copy of the grid (default is False).
 
         Returns
         -------
@@ -322,7 +862,15 @@ class CR3BP(object):
                     The y-values of the meshgrid.
                 - jc : numpy.ndarray
                     The Jacobi constant values on the meshgrid, with values greater than 
-                    `jacobi_max` set to NaN to indicate the forbidden region.
+                    `jacobi_max` set to NaN to indicate the forbidden region. The boolean
+                    mask of those values if `mask` is True.
+
+        Notes
+        -----
+        The potential grid is shared through `jacobi_potential_grid()`, so repeated calls
+        with the same mass ratio, ranges and resolution only apply the new threshold. The
+        4 most recently used grids are kept in memory until
+        `jacobi_potential_grid.cache_clear()` is called.
 
         Examples
         --------
@@ -330,22 +878,328 @@ class CR3BP(object):
 
         """
         
+        grid = jacobi_potential_grid(mass_ratio, tuple(x_range), tuple(y_range), linspace_num)
+
+        if mask:
+            jc = grid.mask(jacobi_max)
+        else:
+            jc = grid.forbidden_region(jacobi_max)
+
+        return grid.x_vals.copy(), grid.y_vals.copy(), jc
+
+    @staticmethod
+    def zero_velocity_curve(jacobi_max: float, mass_ratio: float,
+                            x_range: list = [-1.5, 1.5],
+                            y_range: list = [-1.5, 1.5],
+                            linspace_num: int = 65,
+                            refinements: int = 6,
+                            tol: float = 1e-12) -> np.ndarray:
+        """
+        Compute the zero-velocity curve of the Jacobi constant `jacobi_max` in the x-y plane,
+        the boundary of the region returned by `forbidden_region()`, by adaptive refinement.
+
+        The potential is first evaluated on a coarse `linspace_num x linspace_num` grid. Only
+        the cells crossed by the curve, where the corner values straddle `jacobi_max`, are
+        split into four, `refinements` times over, so the work grows with the length of the
+        curve rather than the area of the plane. Marching squares then extracts a line segment
+        in every remaining cell, with each end point located on the cell edge by bisection.
+
+        Closed curves smaller than a coarse cell, such as those tightly around a primary at
+        very large Jacobi constants, may be missed; increase `linspace_num` in that case.
+
+        Parameters
+        ----------
+        jacobi_max : float
+            The Jacobi constant of the curve.
+        mass_ratio : float
+            The mass ratio between the two bodies in the system.
+        x_range : list of float, optional
+            The range of x-values (default is [-1.5, 1.5]).
+        y_range : list of float, optional
+            The range of y-values (default is [-1.5, 1.5]).
+        linspace_num : int, optional
+            The number of points along each axis of the coarse grid (default is 65).
+        refinements : int, optional
+            The number of times cells on the curve are halved, the final resolution matches
+            a uniform grid of `(linspace_num - 1)*2**refinements + 1` points per axis
+            (default is 6).
+        tol : float, optional
+            The precision of the segment end points along the cell edges (default is 1e-12).
+
+        Returns
+        -------
+        numpy.ndarray
+            The (K, 2, 2) line segments [[x0, y0], [x1, y1]] of the curve, e.g. for
+            `matplotlib.collections.LineCollection`.
+
+        Examples
+        --------
+        segments = zero_velocity_curve(3.1, 0.012150515586657583)
+        """
+
         x_min, x_max = x_range
         y_min, y_max = y_range
-        
-        x_vals = np.linspace(x_min, x_max, linspace_num)
-        y_vals = np.linspace(y_min, y_max, linspace_num)
 
-        [X, Y] = np.meshgrid(x_vals, y_vals)
+        # Spacing of the finest level
+        scale = 2**refinements
+        dx = (x_max - x_min)/((linspace_num - 1)*scale)
+        dy = (y_max - y_min)/((linspace_num - 1)*scale)
+
+        def level_set(x, y):
+            """Zero velocity Jacobi constant minus jacobi_max, zero on the curve."""
+            return _jacobi_potential(x, y, mass_ratio) - jacobi_max
+
+        def node_level_set(i, j, level):
+            """The level set at integer nodes (i, j) of a refinement level."""
+            step = 2**(refinements - level)
+            return level_set(x_min + i*step*dx, y_min + j*step*dy)
+
+        # Coarse Grid
+        # ---------------------------------------------------------------------
+        nodes = np.arange(linspace_num - 1)
+        i, j = [index.ravel() for index in np.meshgrid(nodes, nodes, indexing='ij')]
+        grid = node_level_set(np.arange(linspace_num)[:, np.newaxis],
+                              np.arange(linspace_num)[np.newaxis, :], 0)
+        corners = np.stack((grid[i, j], grid[i+1, j], grid[i+1, j+1], grid[i, j+1]), axis=-1)
+
+        # Refine Cells Crossed by the Curve
+        # ---------------------------------------------------------------------
+        for level in range(1, refinements + 1):
+            crossed = _crossed_cells(corners)
+            i, j = i[crossed], j[crossed]
+
+            # Nine nodes of the four children of every crossed cell, each evaluated once
+            a, b = np.meshgrid(np.arange(3), np.arange(3), indexing='ij')
+            node_i = (2*i[:, np.newaxis] + a.ravel()).ravel()
+            node_j = (2*j[:, np.newaxis] + b.ravel()).ravel()
+            unique, inverse = np.unique(np.stack((node_i, node_j)), axis=1, return_inverse=True)
+            values = node_level_set(unique[0], unique[1], level)[inverse.ravel()].reshape(-1, 3, 3)
+
+            children_i, children_j, children_corners = [], [], []
+            for di in (0, 1):
+                for dj in (0, 1):
+                    children_i.append(2*i + di)
+                    children_j.append(2*j + dj)
+                    children_corners.append(np.stack((values[:, di, dj], values[:, di+1, dj],
+                                                      values[:, di+1, dj+1], values[:, di, dj+1]),
+                                                     axis=-1))
+            i = np.concatenate(children_i)
+            j = np.concatenate(children_j)
+            corners = np.concatenate(children_corners)
+
+        crossed = _crossed_cells(corners)
+        i, j, corners = i[crossed], j[crossed], corners[crossed]
+
+        # Marching Squares
+        # ---------------------------------------------------------------------
+        return _marching_squares(i, j, corners, level_set, x_min, y_min, dx, dy, tol)
+
+
+class JacobiPotentialGrid(object):
+    """
+    The zero velocity Jacobi constant 2U = x^2 + y^2 + 2(1 - mu)/r1 + 2mu/r2 evaluated once
+    on a uniform x-y grid, from which the forbidden region and zero-velocity curve of any
+    number of Jacobi constants are derived without evaluating the potential again.
+
+    Use `jacobi_potential_grid()` to share grids between calls.
+
+    Attributes
+    ----------
+    mass_ratio : float
+        The mass ratio between the two bodies in the system.
+    x_vals : numpy.ndarray
+        The (linspace_num,) x-values of the grid.
+    y_vals : numpy.ndarray
+        The (linspace_num,) y-values of the grid.
+    potential : numpy.ndarray
+        The read-only (linspace_num, linspace_num) potential, indexed [y, x] as
+        `numpy.meshgrid()`.
+    """
+
+    def __init__(self, mass_ratio: float, x_range: list = [-1.5, 1.5],
+                 y_range: list = [-1.5, 1.5], linspace_num: int = 200):
+        """
+        Evaluate the potential on the grid.
+
+        Parameters
+        ----------
+        mass_ratio : float
+            The mass ratio between the two bodies in the system.
+        x_range : list of float, optional
+            The range of x-values (default is [-1.5, 1.5]).
+        y_range : list of float, optional
+            The range of y-values (default is [-1.5, 1.5]).
+        linspace_num : int, optional
+            The number of points along each axis (default is 200).
+        """
+        self.mass_ratio = mass_ratio
+        self.x_vals = np.linspace(x_range[0], x_range[1], linspace_num)
+        self.y_vals = np.linspace(y_range[0], y_range[1], linspace_num)
+
+        # Broadcast rows and columns rather than building full meshgrid temporaries
+        self.potential = _jacobi_potential(self.x_vals[np.newaxis, :],
+                                           self.y_vals[:, np.newaxis], mass_ratio)
+
+        for values in (self.x_vals, self.y_vals, self.potential):
+            values.flags.writeable = False
+
+    def mask(self, jacobi_max: float) -> np.ndarray:
+        """
+        Boolean mask of the grid points where the potential exceeds `jacobi_max`, the
+        points set to NaN by `forbidden_region()`.
+
+        Parameters
+        ----------
+        jacobi_max : float
+            The Jacobi constant threshold.
+
+        Returns
+        -------
+        numpy.ndarray
+            The (linspace_num, linspace_num) boolean mask.
+        """
+        return self.potential > jacobi_max
+
+    def forbidden_region(self, jacobi_max: float) -> np.ndarray:
+        """
+        Copy of the potential with values greater than `jacobi_max` set to NaN, as returned
+        by `CR3BP.forbidden_region()`.
+
+        Parameters
+        ----------
+        jacobi_max : float
+            The Jacobi constant threshold.
+
+        Returns
+        -------
+        numpy.ndarray
+            The (linspace_num, linspace_num) masked potential.
+        """
+        return np.where(self.mask(jacobi_max), np.nan, self.potential)
+
+    def contour(self, jacobi_max: float, tol: float = 1e-12) -> np.ndarray:
+        """
+        Zero-velocity curve of `jacobi_max` by marching squares over the grid cells, with
+        each segment end point located on its cell edge by bisection.
 
-        r1 = np.sqrt((X + mass_ratio)**2 + Y**2)
-        r2 = np.sqrt((X - 1 + mass_ratio)**2 + Y**2)
+        Parameters
+        ----------
+        jacobi_max : float
+            The Jacobi constant of the curve.
+        tol : float, optional
+            The precision of the segment end points along the cell edges (default is 1e-12).
+
+        Returns
+        -------
+        numpy.ndarray
+            The (K, 2, 2) line segments [[x0, y0], [x1, y1]] of the curve.
+        """
+        level = self.potential - jacobi_max
+        corners = np.stack((level[:-1, :-1], level[:-1, 1:], level[1:, 1:], level[1:, :-1]),
+                           axis=-1).reshape(-1, 4)
+        j, i = np.divmod(np.arange(len(corners)), len(self.x_vals) - 1)
+
+        crossed = _crossed_cells(corners)
 
-        jc = X**2 + Y**2 + 2*(1 - mass_ratio)/r1 + 2*mass_ratio/r2
-        jc[jc > jacobi_max] = np.nan
+        def level_set(x, y):
+            """Zero velocity Jacobi constant minus jacobi_max, zero on the curve."""
+            return _jacobi_potential(x, y, self.mass_ratio) - jacobi_max
 
-        return x_vals, y_vals, jc
+        return _marching_squares(i[crossed], j[crossed], corners[crossed], level_set,
+                                 self.x_vals[0], self.y_vals[0],
+                                 self.x_vals[1] - self.x_vals[0], self.y_vals[1] - self.y_vals[0], tol)
 
+    def __repr__(self) -> str:
+        """Return a string representation of the grid."""
+        return (f"JacobiPotentialGrid(mass_ratio={self.mass_ratio}, "
+                f"shape={self.potential.shape})")
+
+
+@functools.lru_cache(maxsize=4)
+def jacobi_potential_grid(mass_ratio: float, x_range: tuple = (-1.5, 1.5),
+                          y_range: tuple = (-1.5, 1.5), linspace_num: int = 200) -> JacobiPotentialGrid:
+    """
+    Return the `JacobiPotentialGrid` of the given mass ratio, ranges and resolution, reusing
+    one of the 4 most recently used grids when available.
+
+    Each cached grid holds linspace_num**2 float64 values, e.g. 200 MB for a linspace_num
+    of 5000. Use `jacobi_potential_grid.cache_clear()` to release the cached grids after
+    working with fine grids.
+
+    Parameters
+    ----------
+    mass_ratio : float
+        The mass ratio between the two bodies in the system.
+    x_range : tuple of float, optional
+        The range of x-values (default is (-1.5, 1.5)).
+    y_range : tuple of float, optional
+        The range of y-values (default is (-1.5, 1.5)).
+    linspace_num : int, optional
+        The number of points along each axis (default is 200).
+
+    Returns
+    -------
+    JacobiPotentialGrid
+        The shared, read-only potential grid.
+
+    Examples
+    --------
+    grid = jacobi_potential_grid(0.012150515586657583)
+    regions = [grid.mask(jacobi) for jacobi in np.linspace(3.0, 3.2, 20)]
+    """
+    return JacobiPotentialGrid(mass_ratio, x_range, y_range, linspace_num)
+
+def _crossed_cells(corners: np.ndarray) -> np.ndarray:
+    """Mask of cells whose (M, 4) corner values do not all share the same sign."""
+    positive = corners > 0
+    return np.any(positive, axis=1) & ~np.all(positive, axis=1)
+
+def _marching_squares(i: np.ndarray, j: np.ndarray, corners: np.ndarray, func: callable,
+                      x_min: float, y_min: float, dx: float, dy: float, tol: float) -> np.ndarray:
+    """Line segments of the zero level set of func in cells (i, j) with counter-clockwise corner values."""
+
+    # Corner coordinates in counter-clockwise order from the lower left
+    offset_i = np.array([0, 1, 1, 0])
+    offset_j = np.array([0, 0, 1, 1])
+    corner_x = x_min + (i[:, np.newaxis] + offset_i)*dx
+    corner_y = y_min + (j[:, np.newaxis] + offset_j)*dy
+
+    # Crossing of every edge k between corners k and k+1, by bisection
+    start = np.arange(4)
+    end = (start + 1) % 4
+    x0, y0, f0 = corner_x[:, start], corner_y[:, start], corners[:, start]
+    x1, y1 = corner_x[:, end], corner_y[:, end]
+    crossed = (f0 > 0) != (corners[:, end] > 0)
+
+    low, high = np.zeros(crossed.shape), np.ones(crossed.shape)
+    num_iter = int(np.ceil(np.log2(max(dx, dy)/tol))) if max(dx, dy) > tol else 0
+    for _ in range(num_iter):
+        mid = (low + high)/2
+        same = (func(x0 + mid*(x1 - x0), y0 + mid*(y1 - y0)) > 0) == (f0 > 0)
+        low = np.where(same, mid, low)
+        high = np.where(same, high, mid)
+    fraction = (low + high)/2
+    points = np.stack((x0 + fraction*(x1 - x0), y0 + fraction*(y1 - y0)), axis=-1)
+
+    # Pair the crossed edges of each cell
+    num_crossed = np.count_nonzero(crossed, axis=1)
+    single = num_crossed == 2
+    edges = np.argsort(~crossed[single], axis=1, kind='stable')[:, :2]
+    rows = np.flatnonzero(single)
+    segments = [np.stack((points[rows, edges[:, 0]], points[rows, edges[:, 1]]), axis=1)]
+
+    # Saddle cells cut off the two corners whose sign differs from the cell center
+    saddle = np.flatnonzero(num_crossed == 4)
+    if len(saddle):
+        center = func(corner_x[saddle, 0] + dx/2, corner_y[saddle, 0] + dy/2)
+        # Edges k-1 and k meet at corner k
+        cut = np.where(((center > 0) == (corners[saddle, 0] > 0))[:, np.newaxis],
+                       np.array([1, 3]), np.array([0, 2]))
+        for corner in (cut[:, 0], cut[:, 1]):
+            segments.append(np.stack((points[saddle, (corner - 1) % 4],
+                                      points[saddle, corner]), axis=1))
+
+    return np.concatenate(segments)
 
 class planar_lagrange_points(object):
     """
@@ -0,0 +1,317 @@
+"""
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+"""
+
+import json
+import struct
+import zipfile
+import numpy as np
+from typing import Union
+
+class DenseTrajectory(object):
+    """
+    Continuous solution of a solver run, evaluated at arbitrary times by interpolating the
+    dense output of `scipy.integrate.solve_ivp()` instead of integrating again.
+
+    Attributes
+    ----------
+    sol : scipy.integrate.OdeSolution
+        The dense output of the solver.
+    t_min : float
+        The earliest time covered by the trajectory.
+    t_max : float
+        The latest time covered by the trajectory.
+    """
+
+    def __init__(self, sol):
+        """
+        Initialize the DenseTrajectory instance with the dense output of a solver run.
+
+        Parameters
+        ----------
+        sol : scipy.integrate.OdeSolution
+            The `sol` attribute of a `solve_ivp()` result computed with `dense_output=True`.
+
+        Raises
+        ------
+        ValueError
+            If sol is None, i.e. the solver did not keep its dense output.
+        """
+        if sol is None:
+            raise ValueError("sol is None, solve with dense_output=True to build a DenseTrajectory.")
+
+        self.sol = sol
+        self.t_min = sol.t_min
+        self.t_max = sol.t_max
+
+    def __call__(self, t: Union[float, list, np.ndarray]) -> np.ndarray:
+        """
+        Evaluate the state vector at the given times.
+
+        Parameters
+        ----------
+        t : Union[float, list, np.ndarray]
+            A single time or an array of T times within [t_min, t_max].
+
+        Raises
+        ------
+        ValueError
+            If any time is outside of the integrated interval.
+
+        Returns
+        -------
+        np.ndarray
+            The state vector (n,) for a single time, or the (T, n) state vectors, where n is
+            the size of the integrated state (6, or 42 when the STM was integrated).
+        """
+        t = np.asarray(t, dtype=float)
+        if np.any(t < self.t_min) or np.any(t > self.t_max):
+            raise ValueError(f"Times must be within the integrated interval [{self.t_min}, {self.t_max}].")
+
+        return self.sol(t).T
+
+    def position(self, t: Union[float, list, np.ndarray]) -> np.ndarray:
+        """Evaluate the position vector (3,) or vectors (T, 3) at the given times."""
+        return self(t)[..., :3]
+
+    def velocity(self, t: Union[float, list, np.ndarray]) -> np.ndarray:
+        """Evaluate the velocity vector (3,) or vectors (T, 3) at the given times."""
+        return self(t)[..., 3:6]
+
+    def __repr__(self) -> str:
+        """Return a string representation of the trajectory."""
+        return f"DenseTrajectory(t_min={self.t_min}, t_max={self.t_max})"
+
+
+class TrajectoryData(object):
+    """
+    A trajectory loaded from a file written by `save_trajectory()`.
+
+    Attributes
+    ----------
+    time : np.ndarray
+        The (T,) time points.
+    states : np.ndarray
+        The (T, n) state vectors, where the first 6 columns are [x, y, z, vx, vy, vz].
+    metadata : dict
+        The metadata stored with the trajectory, e.g. the model, mu and tolerances.
+    """
+
+    def __init__(self, time: np.ndarray, states: np.ndarray, metadata: dict):
+        """
+        Initialize the TrajectoryData instance.
+
+        Parameters
+        ----------
+        time : np.ndarray
+            The (T,) time points.
+        states : np.ndarray
+            The (T, n) state vectors.
+        metadata : dict
+            The metadata stored with the trajectory.
+        """
+        self.time = time
+        self.states = states
+        self.metadata = metadata
+
+    @property
+    def position(self) -> np.ndarray:
+        """The (T, 3) position vectors, a view into `states`."""
+        return self.states[:, :3]
+
+    @property
+    def velocity(self) -> np.ndarray:
+        """The (T, 3) velocity vectors, a view into `states`."""
+        return self.states[:, 3:6]
+
+    @property
+    def final_state(self) -> np.ndarray:
+        """The (6,) state vector at the last time point."""
+        return self.states[-1, :6]
+
+    def iter_chunks(self, chunk_size: int = 100000):
+        """
+        Iterate over the trajectory in consecutive time windows.
+
+        When the trajectory is memory-mapped only the window being processed is read from
+        disk, so analysis functions such as `CR3BP.calculate_jacobi()` or
+        `calc_orbit_elements_array()` can be applied to files larger than memory.
+
+        Parameters
+        ----------
+        chunk_size : int, optional
+            The number of time points in each window. Defaults to 100000.
+
+        Raises
+        ------
+        ValueError
+            If chunk_size is not positive.
+
+        Yields
+        ------
+        TrajectoryData
+            A view of `chunk_size` consecutive samples sharing this trajectory's metadata.
+
+        Examples
+        --------
+        for chunk in data.iter_chunks(10000):
+            x, y = chunk.position[:, 0], chunk.position[:, 1]
+            vx, vy = chunk.velocity[:, 0], chunk.velocity[:, 1]
+            jacobi = CR3BP.calculate_jacobi(x, y, vx, vy, data.metadata["mu"])
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer.")
+        for start in range(0, len(self.time), chunk_size):
+            window = slice(start, start + chunk_size)
+            yield TrajectoryData(self.time[window], self.states[window], self.metadata)
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def __repr__(self) -> str:
+        """Return a string representation of the trajectory."""
+        return f"TrajectoryData({len(self.time)} samples, {self.metadata.get('model')})"
+
+
+def save_trajectory(filename: str, time: Union[list, np.ndarray], states: np.ndarray,
+                    metadata: dict = None, dtype: str = "float64", compress: bool = False) -> None:
+    """
+    Save a trajectory as a NumPy `.npz` archive holding the time points, the state vectors
+    and a JSON metadata header.
+
+    Every array is stored once, and only plain arrays are written, so the file is loaded
+    without unpickling any code.
+
+    Parameters
+    ----------
+    filename : str
+        The file to write, ".npz" is appended when missing.
+    time : Union[list, np.ndarray]
+        The (T,) time points.
+    states : np.ndarray
+        The (T, n) state vectors.
+    metadata : dict, optional
+        JSON serializable metadata stored with the trajectory. Defaults to None.
+    dtype : str, optional
+        Data type of the stored states, e.g. "float32" to halve the file size. The time
+        points are always stored in float64. Defaults to "float64".
+    compress : bool, optional
+        If True, the archive is zip compressed. Defaults to False.
+
+    Examples
+    --------
+    save_trajectory("trajectory.npz", sc.time, sc.num_sol.y.T, {"mu": sc.mu}, dtype="float32")
+    """
+    states = np.asarray(states)
+    if states.ndim != 2:
+        raise ValueError("states must have shape (T, n).")
+
+    arrays = {"time": np.asarray(time, dtype=np.float64),
+              "states": np.ascontiguousarray(states, dtype=dtype),
+              "metadata": np.array(json.dumps(metadata or {}))}
+
+    if compress:
+        np.savez_compressed(filename, **arrays)
+    else:
+        np.savez(filename, **arrays)
+
+def save_model_trajectory(model, time: Union[list, np.ndarray], states: np.ndarray,
+                          integrator: str, units: Union[dict, str]) -> None:
+    """
+    Save the trajectory solved by a model, e.g. `TwoBodyModel` or `CR3BP`, to its
+    `trajectory_file` with the setup of the model as metadata, see `save_trajectory()`.
+
+    The model provides `mu`, `initial_state_vector`, `abs_tol`, `rel_tol`,
+    `trajectory_file`, `save_dtype` and `save_compressed`.
+
+    Parameters
+    ----------
+    model : object
+        The solved model.
+    time : Union[list, np.ndarray]
+        The (T,) time points.
+    states : np.ndarray
+        The (T, n) state vectors.
+    integrator : str
+        The integration method used for the solve, e.g. "RK45" or "kepler".
+    units : Union[dict, str]
+        The units of the time points and state vectors.
+    """
+    metadata = {"model": type(model).__name__,
+                "mu": float(model.mu),
+                "initial_state": np.asarray(model.initial_state_vector, dtype=float).tolist(),
+                "abs_tol": float(model.abs_tol),
+                "rel_tol": float(model.rel_tol),
+                "integrator": integrator,
+                "units": units}
+
+    save_trajectory(model.trajectory_file, time, states, metadata,
+                    dtype=model.save_dtype, compress=model.save_compressed)
+
+def load_trajectory(filename: str, mmap_mode: str = None) -> TrajectoryData:
+    """
+    Load a trajectory written by `save_trajectory()`.
+
+    Parameters
+    ----------
+    filename : str
+        The `.npz` file to read.
+    mmap_mode : str, optional
+        If given, the time points and states are memory-mapped with this mode ("r", "r+"
+        or "c", see `numpy.memmap`) instead of being read into memory. Slices of the
+        returned arrays are then read lazily from disk without copies. Only uncompressed
+        files support memory-mapping. Defaults to None.
+
+    Raises
+    ------
+    ValueError
+        If memory-mapping is requested for a compressed file.
+
+    Returns
+    -------
+    TrajectoryData
+        The time points, state vectors and metadata of the trajectory.
+
+    Examples
+    --------
+    data = load_trajectory("cr3bp_solution.npz", mmap_mode="r")
+    window = data.position[1000:2000]
+    """
+    if mmap_mode is None:
+        with np.load(filename, allow_pickle=False) as data:
+            return TrajectoryData(data["time"], data["states"], json.loads(str(data["metadata"])))
+
+    with np.load(filename, allow_pickle=False) as data:
+        metadata = json.loads(str(data["metadata"]))
+
+    with zipfile.ZipFile(filename) as archive, open(filename, "rb") as fid:
+        time = _memmap_member(archive, fid, filename, "time.npy", mmap_mode)
+        states = _memmap_member(archive, fid, filename, "states.npy", mmap_mode)
+
+    return TrajectoryData(time, states, metadata)
+
+def _memmap_member(archive: zipfile.ZipFile, fid, filename: str, name: str,
+                   mmap_mode: str) -> np.memmap:
+    """Memory-map a stored `.npy` member of an `.npz` archive in place."""
+
+    info = archive.getinfo(name)
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"Cannot memory-map '{name}' of a compressed file, "
+                         f"save it with compress=False.")
+
+    # The member data follows its local file header, whose variable length fields may
+    # differ from the central directory entry
+    fid.seek(info.header_offset)
+    header = fid.read(30)
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    fid.seek(info.header_offset + 30 + name_length + extra_length)
+
+    version = np.lib.format.read_magic(fid)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fid)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(fid)
+
+    return np.memmap(filename, dtype=dtype, mode=mmap_mode, offset=fid.tell(),
+                     shape=shape, order="F" if fortran_order else "C")
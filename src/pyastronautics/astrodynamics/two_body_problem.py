@@ -3,13 +3,20 @@
    https://github.com/eduardo-ocampo/PyAstronautics
 """
 
-import pickle
+import warnings
 import numpy as np
 from typing import Union
 from numpy.linalg import norm
 from scipy.integrate import solve_ivp
 
-from .base_model import TwoBodyOrbitalModel
+from .base_model import TwoBodyOrbitalModel, calc_orbit_elements_array
+from .kepler import kepler_propagate
+from .integrators import integrate, iter_integrate
+from .instrumentation import instrumented_integrate
+from .trajectory import DenseTrajectory, save_model_trajectory
+
+# Units of saved trajectories
+_TRAJECTORY_UNITS = {"time": "sec", "position": "km", "velocity": "km/s"}
 
 class TwoBodyModel(TwoBodyOrbitalModel):
     """
@@ -37,8 +44,33 @@ class TwoBodyModel(TwoBodyOrbitalModel):
         Absolute tolerance value for numerical analysis, default is 1e-10.
     rel_tol : float
         Relative tolerance value for numerical analysis, default is 1e-10.
-    num_sol_pickle_file : str
-        The filename for the pickle file to store numerical solution data.
+    integrator : str
+        The integration method, default is "RK45". Any `scipy.integrate.solve_ivp()`
+        method or one of the fixed-step integrators "RK8" and "symplectic" from
+        `integrators.integrate()`.
+    step_size : float
+        Maximum step size of the fixed-step integrators, default is None which takes
+        one step per interval of `time`.
+    verbose : bool
+        Print the solver status after each solve, default is True.
+    trajectory_file : str
+        The filename of the `.npz` trajectory file written when saving the analysis.
+        Replaces the deprecated `num_sol_pickle_file`, which still forwards to it.
+    save_dtype : str
+        The data type of the saved state vectors, default is "float64". Use "float32"
+        to halve the file size.
+    save_compressed : bool
+        Compress the saved trajectory file, default is False.
+    instrument : bool
+        Record a `SolverReport` of each solve in `self.solver_report` with nfev, njev,
+        accepted and rejected steps and the wall time in the right-hand side and the
+        integrator, see `instrumentation.instrumented_integrate()`. Default is False.
+    track_memory : bool
+        Also record the peak memory allocated during each instrumented solve with
+        `tracemalloc`, default is False.
+    report_callback : callable
+        Function report_callback(report) called with the `SolverReport` of each
+        instrumented solve, e.g. to forward it to a metrics pipeline, default is None.
    
     """
     
@@ -90,10 +122,36 @@ class TwoBodyModel(TwoBodyOrbitalModel):
         # Default tolerance values
         self.abs_tol = 1e-10
         self.rel_tol = 1e-10
+        # Default integrator
+        self.integrator = "RK45"
+        self.step_size = None
+        # Print the solver status after each solve
+        self.verbose = True
 
         # Set File Names
         # ---------------------------------------   
-        self.num_sol_pickle_file = "twoBody_trajectory.pickle"        
+        self.trajectory_file = "twoBody_trajectory.npz"
+        self.save_dtype = "float64"
+        self.save_compressed = False
+
+        # Solver Instrumentation
+        # ---------------------------------------
+        self.instrument = False
+        self.track_memory = False
+        self.report_callback = None
+
+    @property
+    def num_sol_pickle_file(self) -> str:
+        """Deprecated alias of `trajectory_file`."""
+        warnings.warn("num_sol_pickle_file is deprecated, use trajectory_file instead.",
+                      DeprecationWarning, stacklevel=2)
+        return self.trajectory_file
+
+    @num_sol_pickle_file.setter
+    def num_sol_pickle_file(self, value: str) -> None:
+        warnings.warn("num_sol_pickle_file is deprecated, use trajectory_file instead.",
+                      DeprecationWarning, stacklevel=2)
+        self.trajectory_file = value
 
     def differential_equations(self, t: float, state: Union[list, np.ndarray]) -> np.ndarray:
         """
@@ -143,12 +201,14 @@ class TwoBodyModel(TwoBodyOrbitalModel):
         # [x, y, z, vx, vy, vx]
         return np.concatenate((vel,accel))
 
-    def solve_trajectory(self, save_analysis:bool = False) -> None:
+    def solve_trajectory(self, save_analysis:bool = False, calc_elements:bool = False,
+                         dense_output:bool = False, events: Union[callable, list] = None) -> None:
         """
         Solve the trajectory of a Two-Body system using the initial value problem (IVP).
 
         This method uses the `scipy.integrate.solve_ivp()` function to numerically integrate the differential equations 
         governing the motion of the bodies, given the initial conditions specified in `self.initial_state_vector`.
+        The integration method is selected by `self.integrator`, see `integrators.integrate()`.
 
         Before calling this method, ensure that `self.time` is defined as a sequence of time points in seconds
         over which the simulation will be evaluated. If `self.time` is not defined, a ValueError will be raised.
@@ -167,6 +227,23 @@ class TwoBodyModel(TwoBodyOrbitalModel):
         ----------
         save_analysis : bool, optional
             If True, analysis results will be saved for later use. Defaults to False.
+        calc_elements : bool, optional
+            If True, the osculating orbit elements at every time point are computed in one
+            vectorized pass and stored in `self.orbit_element_history`, otherwise it is
+            set to None. Defaults to False.
+        dense_output : bool, optional
+            If True, the continuous solution is kept and stored in `self.trajectory` as a
+            `DenseTrajectory` that can be evaluated at any time between `self.time[0]` and
+            `self.time[-1]`, otherwise it is set to None. Not available for fixed-step
+            integrators. Defaults to False.
+        events : Union[callable, list], optional
+            Event function or list of event functions passed to `solve_ivp()`, such as those
+            built by the `events` module, e.g. `events.periapsis()`. Event times are located
+            precisely regardless of the spacing of `self.time` and stored in
+            `self.event_times`, with the matching states in `self.event_states`, one array
+            per event, otherwise both are set to None. A terminal event ends the output at
+            the last point of `self.time` before the event. Not available for fixed-step
+            integrators. Defaults to None.
 
         Raises
         ------
@@ -182,20 +259,44 @@ class TwoBodyModel(TwoBodyOrbitalModel):
         if not hasattr(self, 'time'):
             raise ValueError("Attribute 'time' must be defined before calling solve_trajectory.")
 
+        # Results of a previous solve no longer match this one
+        self.orbit_element_history = None
+        self.trajectory = None
+        self.event_times = None
+        self.event_states = None
+
         ivp = self.initial_state_vector
 
-        self.num_sol = solve_ivp(self.differential_equations,
-                                 [self.time[0],self.time[-1]],
-                                 ivp,
-                                 t_eval=self.time,
-                                 rtol=self.rel_tol,
-                                 atol=self.abs_tol)
+        # Only request dense output when needed, fixed-step integrators do not support it
+        options = {"dense_output": True} if dense_output else {}
+        if events is not None:
+            options["events"] = events
+
+        # Instrumented solves also record a SolverReport
+        solver = integrate
+        if self.instrument:
+            solver = instrumented_integrate
+            options.update(track_memory=self.track_memory, callback=self.report_callback)
+
+        self.num_sol = solver(self.differential_equations,
+                              [self.time[0],self.time[-1]],
+                              ivp,
+                              t_eval=self.time,
+                              method=self.integrator,
+                              rtol=self.rel_tol,
+                              atol=self.abs_tol,
+                              step_size=self.step_size,
+                              **options)
+
+        if self.instrument:
+            self.solver_report = self.num_sol.report
 
         # Check if solver reached interval end or a termination event occurred 
-        if not self.num_sol.success:
-            print(f"Solver termination status: {self.num_sol.status}")
-        else:
-            print(f"Solver Success: {self.num_sol.success}")
+        if self.verbose:
+            if not self.num_sol.success:
+                print(f"Solver termination status: {self.num_sol.status}")
+            else:
+                print(f"Solver Success: {self.num_sol.success}")
 
         # Extract Position and Velocity Results
         self.numerical_position = self.num_sol.y[:3,:].T
@@ -203,8 +304,392 @@ class TwoBodyModel(TwoBodyOrbitalModel):
 
         self.final_state = self.num_sol.y[:,-1].T
 
+        # Continuous Solution
+        if dense_output:
+            self.trajectory = DenseTrajectory(self.num_sol.sol)
+
+        # Event Times and States
+        if events is not None:
+            self.event_times = self.num_sol.t_events
+            self.event_states = self.num_sol.y_events
+
+        # Osculating Orbit Elements at Every Time Point
+        if calc_elements:
+            self.orbit_element_history = calc_orbit_elements_array(self.num_sol.y[:3,:].T,
+                                                                   self.num_sol.y[3:,:].T,
+                                                                   self.mu)
+
         # Allow user to save numerical analysis
         if save_analysis:
-            with open(self.num_sol_pickle_file, 'wb') as handle:
-                pickle.dump(self, handle)
+            save_model_trajectory(self, self.num_sol.t, self.num_sol.y.T, self.integrator,
+                                  _TRAJECTORY_UNITS)
+
+    def iter_trajectory(self, chunk_size: int = 1000):
+        """
+        Propagate the trajectory over `self.time` in segments, yielding each segment as soon
+        as it is integrated.
+
+        This is the streaming counterpart of `solve_trajectory()` for long propagations. Only one
+        chunk of `chunk_size` time points is held in memory at a time, so callers can write
+        each chunk to disk or reduce it on the fly. Adaptive integrators are stepped
+        continuously across chunk boundaries, giving the same states as `solve_trajectory()`.
+        The state at `self.time[-1]` is stored as `self.final_state` once the generator is
+        exhausted; `self.num_sol` is not set.
+
+        Parameters
+        ----------
+        chunk_size : int, optional
+            The number of time points in each yielded chunk. Defaults to 1000.
+
+        Raises
+        ------
+        ValueError
+            If `self.time` is not defined.
+        RuntimeError
+            If the solver fails before reaching `self.time[-1]`.
+
+        Yields
+        ------
+        tuple
+            A tuple containing:
+                - time : numpy.ndarray
+                    The (M,) time points of the chunk.
+                - states : numpy.ndarray
+                    The (M, 6) state vectors [x, y, z, vx, vy, vz] at those times.
+
+        Examples
+        --------
+        for time, states in sc.iter_trajectory(chunk_size=10000):
+            radius = np.linalg.norm(states[:, :3], axis=1)
+        """
+
+        # Check if self.time is defined
+        if not hasattr(self, 'time'):
+            raise ValueError("Attribute 'time' must be defined before calling iter_trajectory.")
+
+        for time, states in iter_integrate(self.differential_equations,
+                                           self.time,
+                                           self.initial_state_vector,
+                                           method=self.integrator,
+                                           rtol=self.rel_tol,
+                                           atol=self.abs_tol,
+                                           step_size=self.step_size,
+                                           chunk_size=chunk_size):
+            self.final_state = states[-1].copy()
+            yield time, states
+
+    def solve_kepler_trajectory(self, save_analysis:bool = False, calc_elements:bool = False) -> None:
+        """
+        Solve the trajectory of a Two-Body system analytically using the universal variable
+        formulation of Kepler's equation.
+
+        This method is an alternative to `solve_trajectory()` for pure Two-Body motion. Rather
+        than integrating the differential equations, the closed form solution is evaluated at
+        every point of `self.time` at once with `kepler.kepler_propagate()`, which handles
+        elliptic, parabolic and hyperbolic orbits. The cost does not grow with the length of
+        the propagation.
+
+        Before calling this method, ensure that `self.time` is defined as a sequence of time points in seconds
+        over which the simulation will be evaluated. The initial state corresponds to `self.time[0]`.
+        If `self.time` is not defined, a ValueError will be raised.
+
+        The position and velocity results are stored in `self.numerical_position` and
+        `self.numerical_velocity`, respectively. The final state which corresponds to
+        `self.time[-1]` is stored as `self.final_state`. No solver is involved, so
+        `self.num_sol`, `self.trajectory`, `self.event_times` and `self.event_states` from a
+        previous `solve_trajectory()` call are set to None.
+
+        Parameters
+        ----------
+        save_analysis : bool, optional
+            If True, analysis results will be saved for later use. Defaults to False.
+        calc_elements : bool, optional
+            If True, the osculating orbit elements at every time point are computed in one
+            vectorized pass and stored in `self.orbit_element_history`, otherwise it is
+            set to None. Defaults to False.
+
+        Raises
+        ------
+        ValueError
+            If `self.time` is not defined.
+
+        Returns
+        -------
+        None
+        """
+
+        # Check if self.time is defined
+        if not hasattr(self, 'time'):
+            raise ValueError("Attribute 'time' must be defined before calling solve_kepler_trajectory.")
+
+        # Results of a previous solve no longer match this one
+        self.num_sol = None
+        self.orbit_element_history = None
+        self.trajectory = None
+        self.event_times = None
+        self.event_states = None
+
+        time = np.asarray(self.time, dtype=float)
+
+        # Extract Position and Velocity Results
+        self.numerical_position, self.numerical_velocity = kepler_propagate(self.position,
+                                                                            self.velocity,
+                                                                            time - time[0],
+                                                                            self.mu)
+
+        self.final_state = np.concatenate((self.numerical_position[-1],
+                                           self.numerical_velocity[-1]))
+
+        # Osculating Orbit Elements at Every Time Point
+        if calc_elements:
+            self.orbit_element_history = calc_orbit_elements_array(self.numerical_position,
+                                                                   self.numerical_velocity,
+                                                                   self.mu)
+
+        # Allow user to save numerical analysis
+        if save_analysis:
+            save_model_trajectory(self, self.time, np.hstack((self.numerical_position,
+                                                              self.numerical_velocity)),
+                                  "kepler", _TRAJECTORY_UNITS)
+
+
+class TwoBodyBatchModel(object):
+    """
+    Propagates many independent Two-Body spacecraft at once.
+
+    The initial states of all spacecraft are stacked into a single system of
+    differential equations and integrated together, so the acceleration of every
+    spacecraft is evaluated with one set of array operations per right-hand side
+    call instead of one Python-level integration per spacecraft.
+
+    Attributes
+    ----------
+    mu : float
+        The gravitational parameter (standard gravitational constant) of the central body,
+        set to Earth's gravitational constant (3.986004418E+05 km^3/sec^2).
+    initial_states : np.ndarray
+        The (N, 6) array of initial state vectors [x, y, z, vx, vy, vz] in km and km/sec.
+    abs_tol : float
+        Absolute tolerance value for numerical analysis, default is 1e-10.
+    rel_tol : float
+        Relative tolerance value for numerical analysis, default is 1e-10.
+    verbose : bool
+        Print the solver status after each solve, default is True.
+
+    Notes
+    -----
+    `scipy.integrate.solve_ivp()` controls the error of the stacked system with a
+    root-mean-square norm, which would dilute the error of a single spacecraft by
+    the square root of N. The tolerances are therefore scaled by 1/sqrt(N) so every
+    spacecraft is held to the accuracy it would have been given by `TwoBodyModel`.
+    All spacecraft share the integrator steps, so batching orbits of similar period
+    and eccentricity gives the best throughput.
+    """
+
+    def __init__(self, initial_states: Union[list, np.ndarray]):
+        """
+        Initialize the TwoBodyBatchModel instance with an array of initial state vectors.
+
+        Parameters
+        ----------
+        initial_states : Union[list, np.ndarray]
+            The (N, 6) initial state vectors [x, y, z, vx, vy, vz] in km and km/sec.
+
+        Raises
+        ------
+        ValueError
+            If initial_states is not a two-dimensional array with 6 columns.
+        """
+
+        # Set Gravitational Constant
+        # ---------------------------------------   
+        # Default Set to Earth
+        self.mu = 3.986004418E+05 # km^3/sec^2
 
+        # Set Initial State Vectors
+        # ---------------------------------------   
+        # Assumed input is in (km, sec)    
+        initial_states = np.array(initial_states, dtype=float)
+        if initial_states.ndim != 2 or initial_states.shape[1] != 6:
+            raise ValueError("initial_states must have shape (N, 6).")
+
+        self.initial_states = initial_states
+
+        # Numerical Analysis Setup
+        # ---------------------------------------
+        # Default tolerance values
+        self.abs_tol = 1e-10
+        self.rel_tol = 1e-10
+        # Print the solver status after each solve
+        self.verbose = True
+
+    @classmethod
+    def from_models(cls, models: list[TwoBodyModel]) -> "TwoBodyBatchModel":
+        """
+        Create a batch from existing TwoBodyModel instances sharing one central body.
+
+        Parameters
+        ----------
+        models : list[TwoBodyModel]
+            The spacecraft to propagate together.
+
+        Raises
+        ------
+        ValueError
+            If no models are given or the models do not share the same `mu`.
+
+        Returns
+        -------
+        TwoBodyBatchModel
+            A batch using the initial states, `mu` and tolerances of the first model.
+        """
+        if len(models) == 0:
+            raise ValueError("models must contain at least one TwoBodyModel.")
+        if any(model.mu != models[0].mu for model in models):
+            raise ValueError("models must share the same gravitational parameter mu.")
+
+        batch = cls([model.initial_state_vector for model in models])
+        batch.mu = models[0].mu
+        batch.abs_tol = models[0].abs_tol
+        batch.rel_tol = models[0].rel_tol
+        batch.verbose = models[0].verbose
+
+        return batch
+
+    def differential_equations(self, t: float, state: np.ndarray) -> np.ndarray:
+        """
+        Define the stacked differential equations of every spacecraft in the batch.
+
+        The flattened state is expected to be structured as N consecutive blocks of
+        [x, y, z, vx, vy, vz], one block per spacecraft.
+
+        Parameters
+        ----------
+        t : float
+            The current time in the simulation.
+        state : np.ndarray
+            The flattened (6N,) state vector of the batch.
+
+        Returns
+        -------
+        np.ndarray
+            The flattened (6N,) derivatives of the batch state vector.
+        """
+
+        state = state.reshape(-1, 6)
+        pos = state[:, :3]
+
+        # Compute Differential Equation Constants
+        r = np.sqrt(np.einsum('ij,ij->i', pos, pos))
+        constant = -self.mu/r**3
+
+        # Differential Equations
+        derivatives = np.empty_like(state)
+        derivatives[:, :3] = state[:, 3:]
+        derivatives[:, 3:] = constant[:, np.newaxis]*pos
+
+        return derivatives.ravel()
+
+    def solve_trajectory(self, calc_elements:bool = False) -> None:
+        """
+        Solve the trajectories of every spacecraft in the batch.
+
+        Before calling this method, ensure that `self.time` is defined in seconds as either
+        a shared (T,) time grid or an (N, T) array holding one time grid per spacecraft.
+        Since Two-Body motion does not depend on the epoch, per-spacecraft grids are
+        shifted to start at zero and spacecraft with identical relative grids are
+        integrated together.
+
+        The results are stored in `self.states` as an (N, T, 6) array, with views into
+        it stored as `self.numerical_position` and `self.numerical_velocity`. The final
+        state of each spacecraft is stored in `self.final_state` as an (N, 6) array and
+        the underlying solver results in the list `self.num_sols`. If a solver stops
+        before the end of its time grid, the states of its spacecraft after the last
+        solved time point are NaN and their entries of the (N,) boolean array
+        `self.success` are False.
+
+        Parameters
+        ----------
+        calc_elements : bool, optional
+            If True, the osculating orbit elements of every spacecraft at every time point
+            are stored in `self.orbit_element_history` as (N, T) arrays, otherwise it is
+            set to None. Defaults to False.
+
+        Raises
+        ------
+        ValueError
+            If `self.time` is not defined or does not match the batch size.
+
+        Returns
+        -------
+        None
+        """
+
+        # Check if self.time is defined
+        if not hasattr(self, 'time'):
+            raise ValueError("Attribute 'time' must be defined before calling solve_trajectory.")
+
+        # Results of a previous solve no longer match this one
+        self.orbit_element_history = None
+
+        time = np.asarray(self.time, dtype=float)
+        num_states = len(self.initial_states)
+
+        self.num_sols = []
+
+        self.success = np.ones(num_states, dtype=bool)
+
+        if time.ndim == 1:
+            self.states, self.success[:] = self._propagate(self.initial_states, time)
+        elif time.ndim == 2 and time.shape[0] == num_states:
+            # Group spacecraft sharing the same grid relative to their own epoch
+            offsets = time - time[:, :1]
+            grids, group = np.unique(offsets, axis=0, return_inverse=True)
+            group = group.ravel()
+
+            self.states = np.empty((num_states, time.shape[1], 6))
+            for index, grid in enumerate(grids):
+                members = np.flatnonzero(group == index)
+                self.states[members], self.success[members] = self._propagate(self.initial_states[members],
+                                                                              grid)
+        else:
+            raise ValueError("Attribute 'time' must have shape (T,) or (N, T).")
+
+        # Extract Position and Velocity Results
+        self.numerical_position = self.states[:, :, :3]
+        self.numerical_velocity = self.states[:, :, 3:]
+
+        self.final_state = self.states[:, -1, :]
+
+        # Osculating Orbit Elements at Every Time Point
+        if calc_elements:
+            self.orbit_element_history = calc_orbit_elements_array(self.numerical_position,
+                                                                   self.numerical_velocity,
+                                                                   self.mu)
+
+    def _propagate(self, initial_states: np.ndarray, time: np.ndarray) -> tuple:
+        """Integrate a group of spacecraft over a shared time grid, returning (N, T, 6) states and success."""
+
+        num_states = len(initial_states)
+        scale = 1/np.sqrt(num_states)
+
+        num_sol = solve_ivp(self.differential_equations,
+                            [time[0],time[-1]],
+                            initial_states.ravel(),
+                            t_eval=time,
+                            rtol=self.rel_tol*scale,
+                            atol=self.abs_tol*scale)
+
+        # Check if solver reached interval end or a termination event occurred 
+        if self.verbose:
+            if not num_sol.success:
+                print(f"Solver termination status: {num_sol.status}")
+            else:
+                print(f"Solver Success: {num_sol.success}")
+
+        self.num_sols.append(num_sol)
+
+        # Time points after a solver failure are left as NaN
+        states = np.full((num_states, len(time), 6), np.nan)
+        states[:, :num_sol.y.shape[1]] = num_sol.y.reshape(num_states, 6, -1).transpose(0, 2, 1)
+        return states, num_sol.success
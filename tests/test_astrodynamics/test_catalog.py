@@ -0,0 +1,141 @@
+"""
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+"""
+
+import pytest
+import numpy as np
+
+from pyastronautics.astrodynamics.catalog import OrbitCatalog
+from pyastronautics.astrodynamics.two_body_problem import TwoBodyModel
+
+class TestOrbitCatalog:
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """Set up a catalog of low, medium and high orbits of various inclinations."""
+
+        self.mu = 398600 # km^3/sec^2
+        self.states = np.array([[7000, 0, 0, 0, 7.546, 0.1],
+                                [0, 8000, 0, -6.0, 0, 3.5],
+                                [26000, 0, 0, 0, 2.5, 3.0],
+                                [-6800, 0, 0, 0, -5.4, 5.4],
+                                [42164, 0, 0, 0, 3.0747, 0.05],
+                                [7000, 0, 0, 0, 12.0, 0.5]])
+        self.catalog = OrbitCatalog(self.states, ids=["a", "b", "c", "d", "e", "f"], mu=self.mu)
+
+    def test_matches_models(self):
+
+        for k, state in enumerate(self.states):
+            sc = TwoBodyModel(state[:3].tolist(), state[3:].tolist())
+            sc.mu = self.mu
+            sc.calc_orbit_elements()
+
+            for name in ("a", "e", "i", "Omega", "omega", "h_vector"):
+                assert np.allclose(self.catalog.column(name)[k],
+                                   getattr(sc.orbit_elements, name).value, equal_nan=True), name
+
+    def test_derived_columns(self):
+
+        a = self.catalog.column("a")
+        e = self.catalog.column("e")
+        bound = e < 1
+
+        assert np.allclose(self.catalog.column("perigee_radius"), a*(1 - e))
+        assert np.allclose(self.catalog.column("apogee_radius")[bound], (a*(1 + e))[bound])
+        assert np.isinf(self.catalog.column("apogee_radius")[~bound]).all()
+        assert np.allclose(self.catalog.column("perigee_altitude"),
+                           self.catalog.column("perigee_radius") - 6378.1363)
+        assert np.allclose(self.catalog.column("radius"), np.linalg.norm(self.states[:, :3], axis=1))
+
+        with pytest.raises(ValueError, match="Unknown column"):
+            self.catalog.column("altitude")
+
+    def test_filter(self):
+
+        leo = self.catalog.filter(perigee_altitude=(None, 2000), i=(20, None))
+        assert list(leo.ids) == ["b", "d"]
+
+        bound = self.catalog.filter(e=(None, 0.999))
+        assert "f" not in bound.ids
+        assert np.all(bound.column("e") < 1)
+
+        with pytest.raises(ValueError, match="not a scalar column"):
+            self.catalog.filter(h_vector=(0, 1))
+
+    def test_sort_and_index(self):
+
+        by_a = self.catalog.filter(e=(None, 0.999)).sort("a")
+        assert np.all(np.diff(by_a.column("a")) > 0)
+        assert by_a.ids[-1] == "e"
+
+        descending = self.catalog.sort("i", descending=True)
+        assert np.all(np.diff(descending.column("i")) <= 0)
+
+        single = self.catalog[2]
+        assert len(single) == 1
+        assert single.ids[0] == "c"
+        assert np.array_equal(single.states[0], self.states[2])
+
+        # Computed elements are carried over to the selection
+        subset = self.catalog[[4, 0]]
+        assert np.allclose(subset.column("a"), self.catalog.column("a")[[4, 0]])
+
+    def test_propagate(self):
+
+        bound = self.catalog.filter(e=(None, 0.999))
+        time = np.linspace(0, 3600, 7)
+
+        kepler = bound.propagate(time)
+        numerical = bound.propagate(time, method="numerical")
+
+        assert kepler.shape == (len(bound), len(time), 6)
+        assert np.allclose(kepler[:, 0], bound.states)
+        assert np.allclose(kepler, numerical, rtol=1e-6, atol=1e-5)
+
+        later = bound.advance(3600)
+        assert list(later.ids) == list(bound.ids)
+        assert np.allclose(later.states, kepler[:, -1])
+        assert np.allclose(later.column("E"), bound.column("E"))
+
+        with pytest.raises(ValueError, match="Unknown propagation method"):
+            bound.propagate(time, method="RK45")
+
+    def test_propagate_mixed_long_offsets(self):
+
+        # Elliptic and hyperbolic members well past the hyperbolic perigee pass
+        catalog = OrbitCatalog(np.vstack((self.states, [7000, 0, 0, 0, 20.0, 0])), mu=self.mu)
+        time = np.linspace(0, 2e5, 5)
+
+        kepler = catalog.propagate(time)
+        numerical = catalog.propagate(time, method="numerical")
+
+        assert np.all(np.isfinite(kepler))
+        assert np.allclose(kepler, numerical, rtol=1e-6, atol=1e-3)
+
+    def test_models(self):
+
+        models = self.catalog.to_models()
+        catalog = OrbitCatalog.from_models(models)
+
+        assert len(models) == len(self.states)
+        assert models[0].mu == self.mu
+        assert np.array_equal(catalog.states, self.states)
+        assert np.array_equal(catalog.ids, np.arange(len(self.states)))
+
+        models[1].mu = 4.9e3
+        with pytest.raises(ValueError, match="same gravitational parameter"):
+            OrbitCatalog.from_models(models)
+
+    def test_states_and_mu(self):
+
+        with pytest.raises(ValueError):
+            self.catalog.states[0, 0] = 0.0
+        with pytest.raises(ValueError, match="shape"):
+            OrbitCatalog(self.states[:, :3])
+        with pytest.raises(ValueError, match="ids"):
+            OrbitCatalog(self.states, ids=[1, 2])
+
+        a = self.catalog.column("a")
+        self.catalog.mu = 2*self.mu
+        assert not np.allclose(self.catalog.column("a"), a)
@@ -0,0 +1,131 @@
+""" 
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+"""
+
+import pytest
+import numpy as np
+
+from pyastronautics.astrodynamics import events
+from pyastronautics.astrodynamics.two_body_problem import TwoBodyModel
+from pyastronautics.astrodynamics.three_body_problem import CR3BP
+from pyastronautics.astrodynamics.base_model import calc_orbit_elements_array
+
+class TestTwoBodyEvents:
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """Set up a spacecraft propagated over three periods on a coarse grid."""
+
+        self.sc = TwoBodyModel([5000, 100, 0], [1, 10, 5])
+        self.sc.mu = 398600 # km^3/sec^2
+        self.sc.verbose = False
+        self.sc.rel_tol = 1e-12
+        self.sc.abs_tol = 1e-12
+
+        self.period = 12969.97314383982 # sec
+        # Deliberately coarse output grid
+        self.sc.time = np.linspace(0, 3*self.period, 7)
+
+        elements = calc_orbit_elements_array(np.atleast_2d(self.sc.position),
+                                             np.atleast_2d(self.sc.velocity), self.sc.mu)
+        self.a = elements.a.value[0]
+        self.e = elements.e.value[0]
+
+    def test_apsides(self):
+
+        self.sc.solve_trajectory(events=[events.periapsis(), events.apoapsis()])
+        peri_times, apo_times = self.sc.event_times
+        peri_states, apo_states = self.sc.event_states
+
+        assert len(peri_times) == 3
+        assert len(apo_times) == 3
+        assert np.allclose(np.diff(peri_times), self.period)
+        assert np.allclose(np.linalg.norm(peri_states[:, :3], axis=1), self.a*(1 - self.e))
+        assert np.allclose(np.linalg.norm(apo_states[:, :3], axis=1), self.a*(1 + self.e))
+
+        # Events of a previous solve are not kept
+        self.sc.solve_trajectory()
+        assert self.sc.event_times is None
+        assert self.sc.event_states is None
+
+    def test_terminal_impact(self):
+
+        radius = 0.5*(self.a*(1 - self.e) + self.a)
+        self.sc.solve_trajectory(events=events.impact(radius))
+
+        assert self.sc.num_sol.status == 1
+        assert len(self.sc.event_times[0]) == 1
+        assert np.isclose(np.linalg.norm(self.sc.event_states[0][0, :3]), radius)
+
+    def test_fixed_step_events(self):
+
+        self.sc.integrator = "RK8"
+        with pytest.raises(ValueError, match="does not support options: events"):
+            self.sc.solve_trajectory(events=events.periapsis())
+
+class TestCR3BPEvents:
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """Set up a CR3BP spacecraft on a coarse output grid."""
+
+        self.sc = CR3BP([0.50, 0.50, 0.0], [-0.05, 0.10, 0.0])
+        self.sc.verbose = False
+        self.sc.rel_tol = 1e-12
+        self.sc.abs_tol = 1e-13
+        self.sc.time = np.linspace(0, 2*np.pi*4, 10)
+
+    def test_x_axis_crossings(self):
+
+        self.sc.solve_non_dim_trajectory(events=events.plane_crossing(axis=1))
+        crossing_times = self.sc.event_times[0]
+        crossing_states = self.sc.event_states[0]
+
+        assert len(crossing_times) > 0
+        assert np.allclose(crossing_states[:, 1], 0, atol=1e-12)
+
+        # Compare against a densely sampled solution
+        self.sc.time = np.linspace(0, 2*np.pi*4, 20001)
+        self.sc.solve_non_dim_trajectory()
+        y = self.sc.numerical_position[:, 1]
+        assert self.sc.event_times is None
+        assert self.sc.event_states is None
+        assert np.count_nonzero(np.sign(y[1:]) != np.sign(y[:-1])) == len(crossing_times)
+
+    def test_event_states_without_stm(self):
+
+        center = events.cr3bp_primary_position(self.sc.mu, body=1)
+        self.sc.solve_non_dim_trajectory(stm=True, events=events.periapsis(center))
+
+        assert self.sc.event_states[0].shape == (len(self.sc.event_times[0]), 6)
+
+    def test_crossing_direction(self):
+
+        self.sc.solve_non_dim_trajectory(events=[events.plane_crossing(1, direction=1),
+                                                 events.plane_crossing(1, direction=-1)])
+        up, down = self.sc.event_states
+
+        assert np.all(up[:, 4] > 0)
+        assert np.all(down[:, 4] < 0)
+
+class TestEventFactories:
+
+    def test_flags(self):
+
+        event = events.plane_crossing(axis=0, value=0.5, direction=-1, terminal=True)
+
+        assert event.terminal and event.direction == -1
+        assert event(0, np.array([0.75, 0, 0, 0, 0, 0])) == 0.25
+        assert events.impact(1.0).terminal
+        assert events.periapsis().direction == 1
+        assert events.apoapsis().direction == -1
+
+    def test_invalid_arguments(self):
+
+        with pytest.raises(ValueError, match="axis must be 0, 1 or 2"):
+            events.plane_crossing(axis=3)
+        with pytest.raises(ValueError, match="radius must be positive"):
+            events.impact(0)
+        with pytest.raises(ValueError, match="body must be 1 or 2"):
+            events.cr3bp_primary_position(0.01, body=3)
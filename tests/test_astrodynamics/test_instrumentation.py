@@ -0,0 +1,135 @@
+"""
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+"""
+
+import pytest
+import numpy as np
+
+from pyastronautics.astrodynamics.integrators import integrate
+from pyastronautics.astrodynamics.instrumentation import instrumented_integrate, SolverReport
+from pyastronautics.astrodynamics.two_body_problem import TwoBodyModel
+from pyastronautics.astrodynamics.three_body_problem import CR3BP
+
+def oscillator(t, y):
+    return np.array([y[1], -y[0]])
+
+class TestInstrumentedIntegrate:
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """Set up a harmonic oscillator integrated over a few periods."""
+
+        self.t_span = [0, 20]
+        self.t_eval = np.linspace(0, 20, 41)
+        self.y0 = [1.0, 0.0]
+
+    @pytest.mark.parametrize("method", ["RK45", "RK23", "DOP853"])
+    def test_runge_kutta_steps(self, method):
+
+        sol = instrumented_integrate(oscillator, self.t_span, self.y0, t_eval=self.t_eval,
+                                     method=method, rtol=1e-10, atol=1e-10)
+        reference = integrate(oscillator, self.t_span, self.y0, t_eval=self.t_eval,
+                              method=method, rtol=1e-10, atol=1e-10)
+        report = sol.report
+
+        # Instrumentation does not change the solution
+        assert np.array_equal(sol.y, reference.y)
+        assert report.nfev == reference.nfev
+        assert report.rhs_calls == reference.nfev
+        assert report.accepted_steps > 0
+        assert report.rejected_steps >= 0
+
+        # Initial evaluations, then one call per stage of every attempt, plus the
+        # three extra calls of each DOP853 interpolant at the output times
+        stages = {"RK45": 6, "RK23": 3, "DOP853": 12}[method]
+        attempts = report.accepted_steps + report.rejected_steps
+        extra = 3*len(self.t_eval) if method == "DOP853" else 0
+        assert 2 + stages*attempts <= report.nfev <= 2 + stages*attempts + extra
+
+    def test_timings(self):
+
+        sol = instrumented_integrate(oscillator, self.t_span, self.y0, method="DOP853")
+        report = sol.report
+
+        assert 0 < report.rhs_time < report.wall_time
+        assert report.integrator_time == pytest.approx(report.wall_time - report.rhs_time)
+        assert report.peak_memory is None
+
+    @pytest.mark.parametrize("method", ["RK8", "symplectic"])
+    def test_fixed_step(self, method):
+
+        sol = instrumented_integrate(oscillator, self.t_span, self.y0, t_eval=self.t_eval,
+                                     method=method, step_size=0.1)
+
+        assert sol.report.accepted_steps == 200
+        assert sol.report.rejected_steps == 0
+        assert sol.report.rhs_calls == sol.nfev
+
+    def test_implicit_steps_not_counted(self):
+
+        sol = instrumented_integrate(oscillator, self.t_span, self.y0, method="Radau")
+
+        assert sol.report.accepted_steps is None
+        assert sol.report.rejection_ratio is None
+        assert sol.report.rhs_calls >= sol.nfev
+
+    def test_peak_memory(self):
+
+        def allocating(t, y):
+            np.ones(100000)
+            return oscillator(t, y)
+
+        sol = instrumented_integrate(allocating, self.t_span, self.y0, track_memory=True)
+
+        assert sol.report.peak_memory >= 8*100000
+
+    def test_callback_and_dict(self):
+
+        reports = []
+        sol = instrumented_integrate(oscillator, self.t_span, self.y0, callback=reports.append)
+
+        assert reports == [sol.report]
+        data = sol.report.as_dict()
+        assert data["method"] == "RK45"
+        assert data["success"] is True
+        assert data["nfev"] == sol.nfev
+        assert 0 <= data["rejection_ratio"] < 1
+        assert "SolverReport(method='RK45'" in repr(sol.report)
+
+
+class TestModelInstrumentation:
+
+    def test_two_body_report(self):
+
+        reports = []
+        sc = TwoBodyModel([5000, 100, 0], [1, 10, 5])
+        sc.mu = 398600 # km^3/sec^2
+        sc.verbose = False
+        sc.time = np.linspace(0, 13000, 50)
+        sc.instrument = True
+        sc.track_memory = True
+        sc.report_callback = reports.append
+
+        sc.solve_trajectory()
+
+        assert isinstance(sc.solver_report, SolverReport)
+        assert reports == [sc.solver_report]
+        assert sc.solver_report.nfev == sc.num_sol.nfev
+        assert sc.solver_report.peak_memory > 0
+
+    def test_cr3bp_report(self):
+
+        sc = CR3BP([0.5, 0, 0], [0, 0.5, 0])
+        sc.verbose = False
+        sc.integrator = "DOP853"
+        sc.time = np.linspace(0, 2, 20)
+
+        sc.solve_non_dim_trajectory()
+        assert not hasattr(sc, 'solver_report')
+
+        sc.instrument = True
+        sc.solve_non_dim_trajectory(stm=True)
+        assert sc.solver_report.method == "DOP853"
+        assert sc.solver_report.accepted_steps > 0
+        assert sc.numerical_stm.shape == (20, 6, 6)
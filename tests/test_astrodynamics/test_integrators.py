@@ -0,0 +1,105 @@
+""" 
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+"""
+
+import pytest
+import numpy as np
+
+from pyastronautics.astrodynamics.integrators import (integrate, iter_integrate, RK8_A, RK8_B, RK8_C,
+                                                      RK8_N_STAGES)
+
+def harmonic_oscillator(t, y):
+    """Unit frequency harmonic oscillator with state [x, v]."""
+    return np.array([y[1], -y[0]])
+
+class TestIntegrate:
+
+    @pytest.mark.parametrize("method", ["RK45", "DOP853", "LSODA"])
+    def test_adaptive_methods(self, method):
+        t_eval = np.linspace(0, 2*np.pi, 50)
+        sol = integrate(harmonic_oscillator, [0, 2*np.pi], [1.0, 0.0], t_eval=t_eval,
+                        method=method, rtol=1e-10, atol=1e-12)
+
+        assert sol.success
+        assert np.allclose(sol.y[0], np.cos(t_eval), atol=1e-7)
+
+    def test_rk8_order(self):
+        # Halving the step of an 8th order method reduces the error by about 2^8
+        errors = []
+        for step_size in [0.4, 0.2]:
+            sol = integrate(harmonic_oscillator, [0, 10], [1.0, 0.0], t_eval=[0, 10],
+                            method="RK8", step_size=step_size)
+            errors.append(abs(sol.y[0, -1] - np.cos(10)))
+
+        assert 2**7 < errors[0]/errors[1] < 2**9
+
+    def test_rk8_tableau(self):
+        # Explicit, consistent and with nodes equal to the row sums of A
+        assert RK8_A.shape == (RK8_N_STAGES, RK8_N_STAGES)
+        assert np.all(np.triu(RK8_A) == 0)
+        assert np.isclose(RK8_B.sum(), 1.0)
+        assert np.allclose(RK8_A.sum(axis=1), RK8_C)
+
+    def test_rk8_output_times(self):
+        t_eval = np.array([0.0, 0.3, 1.0, 2.5])
+        sol = integrate(harmonic_oscillator, [0, 2.5], [1.0, 0.0], t_eval=t_eval,
+                        method="RK8", step_size=0.05)
+
+        assert np.array_equal(sol.t, t_eval)
+        assert sol.y.shape == (2, 4)
+        assert np.allclose(sol.y[0], np.cos(t_eval), atol=1e-12)
+        assert sol.nfev > 0
+
+    def test_fixed_step_without_initial_time(self):
+        sol = integrate(harmonic_oscillator, [0, 2], [1.0, 0.0], t_eval=[1.0, 2.0],
+                        method="RK8", step_size=0.1)
+
+        assert np.array_equal(sol.t, [1.0, 2.0])
+        assert np.allclose(sol.y[0], np.cos([1.0, 2.0]), atol=1e-12)
+
+    def test_symplectic_energy(self):
+        # Energy error of a symplectic method stays bounded over long horizons
+        t_eval = np.linspace(0, 1000, 1001)
+        sol = integrate(harmonic_oscillator, [0, 1000], [1.0, 0.0], t_eval=t_eval,
+                        method="symplectic", step_size=0.1)
+
+        energy = (sol.y[0]**2 + sol.y[1]**2)/2
+        assert np.max(np.abs(energy - 0.5)) < 1e-5
+
+    def test_unknown_method(self):
+        with pytest.raises(ValueError, match="Unknown integrator 'Euler'"):
+            integrate(harmonic_oscillator, [0, 1], [1.0, 0.0], method="Euler")
+
+    def test_fixed_step_options(self):
+        with pytest.raises(ValueError, match="does not support options: dense_output"):
+            integrate(harmonic_oscillator, [0, 1], [1.0, 0.0], method="RK8", dense_output=True)
+
+
+class TestIterIntegrate:
+
+    @pytest.mark.parametrize("method, step_size", [("RK45", None), ("DOP853", None),
+                                                   ("LSODA", None), ("RK8", 0.05)])
+    def test_chunks_match_integrate(self, method, step_size):
+        t_eval = np.linspace(0, 20, 501)
+        sol = integrate(harmonic_oscillator, [0, 20], [1.0, 0.0], t_eval=t_eval,
+                        method=method, rtol=1e-10, atol=1e-12, step_size=step_size)
+        chunks = list(iter_integrate(harmonic_oscillator, t_eval, [1.0, 0.0], method=method,
+                                     rtol=1e-10, atol=1e-12, step_size=step_size, chunk_size=64))
+
+        assert [len(t) for t, _ in chunks] == [64]*7 + [53]
+        assert np.array_equal(np.concatenate([t for t, _ in chunks]), t_eval)
+        assert np.allclose(np.concatenate([y for _, y in chunks]), sol.y.T, rtol=0, atol=1e-12)
+
+    def test_backward_integration(self):
+        t_eval = np.linspace(0, -5, 40)
+        y = np.concatenate([y for _, y in iter_integrate(harmonic_oscillator, t_eval, [1.0, 0.0],
+                                                         rtol=1e-10, atol=1e-12, chunk_size=16)])
+
+        assert np.allclose(y[:, 0], np.cos(t_eval), atol=1e-8)
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError, match="Unknown integrator"):
+            next(iter_integrate(harmonic_oscillator, [0, 1], [1.0, 0.0], method="Euler"))
+        with pytest.raises(ValueError, match="chunk_size must be a positive integer"):
+            next(iter_integrate(harmonic_oscillator, [0, 1], [1.0, 0.0], chunk_size=0))
@@ -0,0 +1,95 @@
+""" 
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+"""
+
+import pytest
+import numpy as np
+from scipy.integrate import solve_ivp
+
+from pyastronautics.astrodynamics.kepler import stumpff_c, stumpff_s, kepler_propagate
+
+class TestStumpff:
+
+    def test_stumpff_at_zero(self):
+        assert np.isclose(stumpff_c(0.0), 1/2)
+        assert np.isclose(stumpff_s(0.0), 1/6)
+
+    def test_stumpff_series_near_zero(self):
+        # Series expansion must agree with the closed form where it is used
+        z = np.array([-0.9e-3, 0.9e-3])
+        sqrt_z = np.sqrt(np.abs(z))
+        expected_c = [(np.cosh(sqrt_z[0]) - 1)/-z[0], (1 - np.cos(sqrt_z[1]))/z[1]]
+        expected_s = [(np.sinh(sqrt_z[0]) - sqrt_z[0])/sqrt_z[0]**3,
+                      (sqrt_z[1] - np.sin(sqrt_z[1]))/sqrt_z[1]**3]
+
+        assert np.allclose(stumpff_c(z), expected_c, rtol=1e-9)
+        assert np.allclose(stumpff_s(z), expected_s, rtol=1e-6)
+
+    def test_stumpff_closed_form(self):
+        z = np.array([4.0, -4.0])
+        assert np.allclose(stumpff_c(z), [(1 - np.cos(2))/4, (np.cosh(2) - 1)/4])
+        assert np.allclose(stumpff_s(z), [(2 - np.sin(2))/8, (np.sinh(2) - 2)/8])
+
+class TestKeplerPropagate:
+
+    mu = 398600 # km^3/sec^2
+
+    def test_circular_orbit(self):
+        r = 7000
+        v = np.sqrt(self.mu/r)
+        period = 2*np.pi*np.sqrt(r**3/self.mu)
+
+        positions, velocities = kepler_propagate([r, 0, 0], [0, v, 0],
+                                                 [0, period/4, period/2, 3*period], self.mu)
+
+        assert positions.shape == (4, 3)
+        assert np.allclose(positions[1], [0, r, 0], atol=1e-6)
+        assert np.allclose(positions[2], [-r, 0, 0], atol=1e-6)
+        assert np.allclose(positions[3], [r, 0, 0], atol=1e-6)
+        assert np.allclose(velocities[1], [-v, 0, 0], atol=1e-9)
+
+    @pytest.mark.parametrize("speed_factor", [0.8, 1.0, 1.5])
+    def test_energy_and_momentum_conserved(self, speed_factor):
+        # Elliptic, parabolic and hyperbolic orbits
+        r0 = np.array([7000.0, 500.0, 100.0])
+        v_escape = np.sqrt(2*self.mu/np.linalg.norm(r0))
+        v0 = speed_factor*v_escape*np.array([0.0, 0.9, 0.43588989])
+
+        positions, velocities = kepler_propagate(r0, v0, np.linspace(-5000, 20000, 50), self.mu)
+
+        r = np.linalg.norm(positions, axis=1)
+        energy = np.sum(velocities**2, axis=1)/2 - self.mu/r
+        ang_momentum = np.cross(positions, velocities)
+
+        assert np.allclose(energy, np.dot(v0, v0)/2 - self.mu/np.linalg.norm(r0), atol=1e-8)
+        assert np.allclose(ang_momentum, np.cross(r0, v0), rtol=1e-10)
+
+    def test_multiple_states(self):
+        positions = np.array([[7000.0, 0, 0], [0, 8000.0, 0]])
+        velocities = np.array([[0, 7.5, 0.5], [-7.0, 0, 0]])
+        dt = np.linspace(0, 10000, 7)
+
+        batch_pos, batch_vel = kepler_propagate(positions, velocities, dt, self.mu)
+
+        assert batch_pos.shape == (2, 7, 3)
+        for k in range(2):
+            single_pos, single_vel = kepler_propagate(positions[k], velocities[k], dt, self.mu)
+            assert np.allclose(batch_pos[k], single_pos)
+            assert np.allclose(batch_vel[k], single_vel)
+
+    @pytest.mark.parametrize("v0, dt", [([0, 20.0, 0], 5e4), ([0, 20.0, 0], 1e6),
+                                        ([0, 12.0, 0], 2e5), ([0, 12.0, 0.5], -2e5)])
+    def test_long_hyperbolic_offset(self, v0, dt):
+        # Long time offsets overflowed from a poor hyperbolic starting guess
+        r0 = [7000.0, 0, 0]
+
+        def two_body(t, y):
+            return np.concatenate((y[3:], -self.mu*y[:3]/np.linalg.norm(y[:3])**3))
+
+        num_sol = solve_ivp(two_body, [0, dt], np.concatenate((r0, v0)),
+                            method="DOP853", rtol=1e-12, atol=1e-12)
+        positions, velocities = kepler_propagate(r0, v0, [dt], self.mu)
+
+        assert np.allclose(positions[0], num_sol.y[:3, -1], rtol=1e-9)
+        assert np.allclose(velocities[0], num_sol.y[3:, -1], rtol=1e-9)
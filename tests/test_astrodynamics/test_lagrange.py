@@ -0,0 +1,127 @@
+""" 
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+"""
+
+import pytest
+import numpy as np
+
+from pyastronautics.astrodynamics.lagrange import (lagrange_points, system_lagrange_points,
+                                                    lagrange_stability, LagrangeStability,
+                                                    SYSTEM_MASS_RATIOS)
+from pyastronautics.astrodynamics.three_body_problem import CR3BP, planar_lagrange_points
+
+class TestLagrangePoints:
+
+    def test_single_mass_ratio(self):
+
+        points = lagrange_points(0.1)
+
+        assert points.shape == (5, 3)
+        assert np.allclose(points[:3, 0], [0.609035110, 1.259699832, -1.041608908], atol=1e-8)
+        assert np.allclose(points[3], [0.4, np.sqrt(3)/2, 0.0])
+        assert np.allclose(points[4], [0.4, -np.sqrt(3)/2, 0.0])
+
+    def test_matches_planar_lagrange_points(self):
+
+        mass_ratios = np.geomspace(1e-8, 0.5, 50)
+        points = lagrange_points(mass_ratios)
+
+        assert points.shape == (50, 5, 3)
+        for mu, expected in zip(mass_ratios, points):
+            lagrange = planar_lagrange_points(mu)
+            lagrange.get_points()
+
+            assert np.allclose(expected[:3, 0], [lagrange.l1x, lagrange.l2x, lagrange.l3x],
+                               rtol=0, atol=1e-14)
+            assert np.allclose(expected[3, :2], [lagrange.l4x, lagrange.l4y])
+
+    def test_root_equation_residual(self):
+
+        mass_ratios = np.linspace(0.001, 0.5, 20)
+        points = lagrange_points(mass_ratios)
+        residual = planar_lagrange_points(mass_ratios).root_equation(points[:, :3, 0].T)
+
+        assert np.allclose(residual, 0, atol=1e-13)
+
+    def test_invalid_mass_ratio(self):
+
+        with pytest.raises(ValueError, match="mass_ratio must be within"):
+            lagrange_points([0.1, 0.6])
+
+    def test_system_table(self):
+
+        points = system_lagrange_points("Earth-Moon")
+
+        assert system_lagrange_points("Earth-Moon") is points
+        assert np.array_equal(points, lagrange_points(SYSTEM_MASS_RATIOS["Earth-Moon"]))
+        assert np.isclose(points[0, 0], 0.8369, atol=1e-4)
+
+        with pytest.raises(ValueError, match="read-only"):
+            points[0, 0] = 0.0
+        with pytest.raises(ValueError, match="Unknown system 'Earth-Mars'"):
+            system_lagrange_points("Earth-Mars")
+
+class TestLagrangeStability:
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """Set up the Earth-Moon stability analysis."""
+
+        self.mu = SYSTEM_MASS_RATIOS["Earth-Moon"]
+        self.stability = lagrange_stability(self.mu)
+
+    def test_shapes(self):
+
+        assert self.stability.points.shape == (1, 5, 3)
+        assert self.stability.hessian.shape == (1, 5, 3, 3)
+        assert self.stability.system_matrix.shape == (1, 5, 6, 6)
+        assert self.stability.eigenvalues.shape == (1, 5, 6)
+        assert self.stability.eigenvectors.shape == (1, 5, 6, 6)
+
+    def test_matches_system_matrix(self):
+
+        for k, point in enumerate(self.stability.points[0]):
+            system_matrix = CR3BP.linearized_system_matrix(point, self.mu)
+            assert np.allclose(self.stability.system_matrix[0, k], system_matrix)
+
+            # A v = lambda v for every eigenpair
+            vectors = self.stability.eigenvectors[0, k]
+            assert np.allclose(system_matrix @ vectors, vectors*self.stability.eigenvalues[0, k])
+
+    def test_earth_moon_eigenvalues(self):
+
+        # Known L1 saddle eigenvalue of the Earth-Moon system
+        assert np.isclose(self.stability.eigenvalues[0, 0, -1].real, 2.93206, atol=1e-5)
+        assert np.array_equal(self.stability.stable()[0], [False, False, False, True, True])
+
+    def test_routh_critical_mass_ratio(self):
+
+        mass_ratios = np.array([0.03, 0.0385, 0.039, 0.1])
+        stable = lagrange_stability(mass_ratios).stable()
+
+        assert np.array_equal(stable[:, 3], [True, True, False, False])
+        assert np.array_equal(stable[:, 3], stable[:, 4])
+        assert not np.any(stable[:, :3])
+
+    def test_saddle_eigenvectors(self):
+
+        unstable = self.stability.unstable_eigenvector[0]
+        stable = self.stability.stable_eigenvector[0]
+        eigenvalues = self.stability.eigenvalues[0]
+
+        assert unstable.shape == stable.shape == (3, 6)
+        for k in range(3):
+            system_matrix = self.stability.system_matrix[0, k]
+            assert np.allclose(system_matrix @ unstable[k], eigenvalues[k, -1].real*unstable[k])
+            assert np.allclose(system_matrix @ stable[k], eigenvalues[k, 0].real*stable[k])
+            assert np.isclose(np.linalg.norm(unstable[k]), 1.0)
+
+    def test_cached(self):
+
+        assert lagrange_stability(self.mu) is self.stability
+        assert lagrange_stability([self.mu]) is self.stability
+        assert isinstance(self.stability, LagrangeStability)
+
+        with pytest.raises(ValueError, match="read-only"):
+            self.stability.eigenvalues[0, 0, 0] = 0.0
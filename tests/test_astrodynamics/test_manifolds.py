@@ -0,0 +1,132 @@
+""" 
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+"""
+
+import pytest
+import numpy as np
+
+from pyastronautics.astrodynamics.manifolds import InvariantManifold
+from pyastronautics.astrodynamics.periodic_orbits import (PeriodicOrbit, lyapunov_initial_guess,
+                                                          correct_periodic_orbit)
+from pyastronautics.astrodynamics.three_body_problem import CR3BP
+
+# Earth-Moon Mass Ratio
+MU = 0.012150515586657583
+
+class TestInvariantManifold:
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """Correct an L1 Lyapunov orbit and set up its unstable manifold."""
+
+        guess = lyapunov_initial_guess(MU, lagrange_point=1, amplitude=1e-2)
+        self.orbit = correct_periodic_orbit(guess, MU)
+
+        self.manifold = InvariantManifold(self.orbit)
+        self.manifold.num_points = 10
+        self.manifold.max_time = 3.0
+        self.manifold.num_time_points = 200
+
+    def test_invalid_stability(self):
+
+        with pytest.raises(ValueError, match="stability must be 'unstable' or 'stable'"):
+            InvariantManifold(self.orbit, "neutral")
+
+    def test_eigenvector(self):
+
+        vector = self.manifold.eigenvector
+        eigenvalue = np.max(np.abs(self.orbit.eigenvalues))
+
+        assert np.allclose(self.orbit.monodromy @ vector, eigenvalue*vector, atol=1e-6)
+
+        stable = InvariantManifold(self.orbit, "stable").eigenvector
+        assert np.allclose(self.orbit.monodromy @ stable, stable/eigenvalue, atol=1e-6)
+
+    def test_seeds(self):
+
+        seeds = self.manifold.seed()
+
+        assert seeds.shape == (2, 10, 6)
+        assert np.allclose(self.manifold.phases, np.linspace(0, self.orbit.period, 10, endpoint=False))
+        # Branches are displaced by step in position on either side of the orbit
+        midpoint = seeds.mean(axis=0)
+        assert np.allclose(midpoint[0], self.orbit.state)
+        assert np.allclose(np.linalg.norm(seeds[0, :, :3] - midpoint[:, :3], axis=1), self.manifold.step)
+
+    def test_tubes_jacobi(self):
+
+        tubes = self.manifold.compute()
+        jacobi = CR3BP.jacobi_constant(tubes, MU)
+
+        assert tubes.shape == (2, 10, 200, 6)
+        assert np.allclose(tubes[:, :, 0], self.manifold.seeds)
+        assert np.allclose(jacobi, self.orbit.jacobi, atol=1e-6)
+
+        # The unstable manifold departs from the orbit
+        distance = np.linalg.norm(tubes[..., :3] - self.orbit.state[:3], axis=-1)
+        assert np.all(distance[:, :, -1] > 10*self.manifold.step)
+
+    def test_stable_manifold_backward(self):
+
+        manifold = InvariantManifold(self.orbit, "stable")
+        manifold.num_points = 4
+        manifold.max_time = 1.0
+        manifold.num_time_points = 50
+        manifold.compute()
+
+        assert manifold.time[-1] == -1.0
+
+        # Propagating the end of a stable trajectory forward returns to its seed
+        end = manifold.tubes[0, 0, -1]
+        sc = CR3BP(end[:3].tolist(), end[3:].tolist())
+        sc.verbose = False
+        sc.rel_tol = sc.abs_tol = 1e-12
+        sc.time = np.array([0.0, 1.0])
+        sc.solve_non_dim_trajectory()
+        assert np.allclose(sc.final_state, manifold.seeds[0, 0], atol=1e-7)
+
+    def test_section_crossings(self):
+
+        self.manifold.compute()
+        times, states = self.manifold.section_crossings()
+
+        assert times.shape == (2, 10)
+        assert states.shape == (2, 10, 6)
+        crossed = np.isfinite(times)
+        assert np.any(crossed)
+        assert np.allclose(states[crossed][:, 0], 1 - MU, atol=1e-10)
+
+        # Crossing states lie on the propagated trajectories
+        branch, point = np.argwhere(crossed)[0]
+        seed = self.manifold.seeds[branch, point]
+        sc = CR3BP(seed[:3].tolist(), seed[3:].tolist())
+        sc.verbose = False
+        sc.rel_tol = sc.abs_tol = 1e-12
+        sc.time = np.array([0.0, times[branch, point]])
+        sc.solve_non_dim_trajectory()
+        assert np.allclose(sc.final_state, states[branch, point], atol=1e-6)
+
+    def test_parallel_matches_batch(self):
+
+        batch = self.manifold.compute()
+
+        self.manifold.processes = 2
+        self.manifold.chunk_size = 5
+        parallel = self.manifold.compute()
+
+        assert np.allclose(batch, parallel, atol=1e-7)
+
+    def test_section_crossings_before_compute(self):
+
+        with pytest.raises(ValueError, match="Call compute"):
+            self.manifold.section_crossings()
+
+    def test_stable_orbit(self):
+
+        # Every eigenvalue of a stable orbit's monodromy lies on the unit circle
+        orbit = PeriodicOrbit(self.orbit.state, self.orbit.period, MU)
+        orbit.monodromy = np.eye(6)
+
+        with pytest.raises(ValueError, match="no real unstable eigenvalue"):
+            InvariantManifold(orbit).eigenvector
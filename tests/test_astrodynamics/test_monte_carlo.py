@@ -0,0 +1,83 @@
+""" 
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+"""
+
+import pytest
+import numpy as np
+
+from pyastronautics.astrodynamics.monte_carlo import RunningStatistics, MonteCarloDispersion
+from pyastronautics.astrodynamics.two_body_problem import TwoBodyModel
+from pyastronautics.astrodynamics.three_body_problem import CR3BP
+
+class TestRunningStatistics:
+
+    def test_chunked_statistics(self):
+        samples = np.random.default_rng(1).normal(size=(250, 6))
+
+        stats = RunningStatistics()
+        for chunk in np.array_split(samples, 7):
+            stats.update(chunk)
+
+        assert stats.count == 250
+        assert np.allclose(stats.mean, samples.mean(axis=0))
+        assert np.allclose(stats.covariance, np.cov(samples, rowvar=False))
+
+class TestMonteCarloDispersion:
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """Set up a small CR3BP dispersion for testing."""
+
+        self.nominal = [0.50, 0.50, 0.0, -0.05, 0.10, 0.0]
+        self.mc = MonteCarloDispersion(CR3BP, self.nominal, np.linspace(0, np.pi, 10),
+                                       covariance=np.diag([1e-6]*3 + [1e-8]*3))
+        self.mc.num_samples = 20
+        self.mc.chunk_size = 6
+        self.mc.seed = 7
+
+    def test_solve(self, capsys):
+
+        stats = self.mc.solve()
+
+        assert self.mc.final_states.shape == (20, 6)
+        assert np.all(self.mc.success)
+        assert stats.count == 20
+        assert np.allclose(stats.mean, self.mc.final_states.mean(axis=0))
+
+        # Solver status is not printed for every sample
+        assert capsys.readouterr().out == ""
+
+    def test_processes_match_serial(self):
+
+        self.mc.solve()
+        serial = self.mc.final_states.copy()
+
+        self.mc.processes = 2
+        self.mc.solve()
+
+        assert np.allclose(self.mc.final_states, serial)
+
+    def test_sampler_and_model_options(self):
+
+        nominal = np.array([7000, 0, 0, 0, 7.5, 1.0])
+        mc = MonteCarloDispersion(TwoBodyModel, nominal, np.linspace(0, 600, 5),
+                                  sampler=lambda rng, size: np.tile(nominal, (size, 1)))
+        mc.num_samples = 4
+        mc.model_options = {"mu": 398600}
+        mc.solve()
+
+        sc = TwoBodyModel(nominal[:3].tolist(), nominal[3:].tolist())
+        sc.mu = 398600
+        sc.time = np.linspace(0, 600, 5)
+        sc.solve_trajectory()
+
+        assert np.allclose(mc.final_states, sc.final_state)
+        assert np.allclose(mc.statistics.std, 0)
+
+    def test_invalid_setup(self):
+
+        with pytest.raises(ValueError, match="model_class must be TwoBodyModel or CR3BP."):
+            MonteCarloDispersion(dict, self.nominal, [0, 1], covariance=np.eye(6))
+        with pytest.raises(ValueError, match="Either covariance or sampler must be given."):
+            MonteCarloDispersion(CR3BP, self.nominal, [0, 1])
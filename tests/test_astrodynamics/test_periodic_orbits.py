@@ -0,0 +1,100 @@
+""" 
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+"""
+
+import pytest
+import numpy as np
+
+from pyastronautics.astrodynamics.periodic_orbits import (PeriodicOrbit, PeriodicOrbitFamily,
+                                                          lyapunov_initial_guess,
+                                                          correct_periodic_orbit, continue_family)
+
+# Earth-Moon Mass Ratio
+MU = 0.012150515586657583
+
+class TestPeriodicOrbits:
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """Correct a small L1 Lyapunov orbit for testing."""
+
+        guess = lyapunov_initial_guess(MU, lagrange_point=1, amplitude=1e-3)
+        self.orbit = correct_periodic_orbit(guess, MU)
+
+    def test_lyapunov_initial_guess(self):
+
+        guess = lyapunov_initial_guess(MU, lagrange_point=2, amplitude=1e-3)
+
+        assert guess.shape == (6,)
+        assert guess[0] > 1 and guess[4] > 0
+        assert np.all(guess[[1, 2, 3, 5]] == 0)
+
+        with pytest.raises(ValueError, match="lagrange_point must be 1, 2 or 3."):
+            lyapunov_initial_guess(MU, lagrange_point=4)
+
+    def test_correct_lyapunov_orbit(self):
+
+        # Small L1 Lyapunov orbits have a period near the linearized value
+        assert np.isclose(self.orbit.period, 2.6918, atol=1e-3)
+
+        # Returns to its initial state after one period
+        sc = self.orbit.propagate(num_points=100)
+        assert np.allclose(sc.final_state, self.orbit.state, atol=1e-8)
+
+    def test_monodromy(self):
+
+        monodromy = self.orbit.compute_monodromy()
+
+        # Symplectic monodromy has unit determinant and a unit eigenvalue pair
+        assert np.isclose(np.linalg.det(monodromy), 1, atol=1e-6)
+        assert np.min(np.abs(self.orbit.eigenvalues - 1)) < 1e-4
+        assert self.orbit.stability_index > 1
+
+    def test_natural_parameter_family(self):
+
+        family = continue_family(self.orbit, -0.003, 4, method="natural", parameter_index=0)
+
+        assert len(family) == 4
+        assert np.allclose(np.diff(family.states[:, 0]), -0.003)
+        # Larger Lyapunov orbits have lower Jacobi constants and longer periods
+        assert np.all(np.diff(family.jacobi) < 0)
+        assert np.all(np.diff(family.periods) > 0)
+
+    def test_pseudo_arclength_family(self):
+
+        family = continue_family(self.orbit, -0.01, 4, processes=2)
+
+        step = np.linalg.norm(np.diff(family.states[:, [0, 4]], axis=0), axis=1)
+        assert np.allclose(step, 0.01, rtol=1e-2)
+        assert all(orbit.monodromy is not None for orbit in family)
+
+    def test_family_stability_tolerances(self, monkeypatch):
+
+        calls = []
+        monkeypatch.setattr(PeriodicOrbitFamily, "compute_stability",
+                            lambda family, **kwargs: calls.append(kwargs))
+
+        continue_family(self.orbit, -0.01, 2, processes=2, rel_tol=1e-10, abs_tol=1e-11)
+
+        assert calls == [{"processes": 2, "rel_tol": 1e-10, "abs_tol": 1e-11}]
+
+    def test_correct_halo_orbit(self):
+
+        halo = correct_periodic_orbit([0.8234, 0, 0.0224, 0, 0.1343, 0], MU, fixed_index=2)
+
+        assert halo.state[2] == 0.0224
+        assert np.isclose(halo.period, 2.7464, atol=1e-3)
+
+    def test_unknown_continuation_method(self):
+
+        with pytest.raises(ValueError, match="Unknown continuation method"):
+            continue_family(self.orbit, 0.01, 3, method="shooting")
+
+    def test_invalid_parameter_index(self):
+
+        # z0 is not free for a planar orbit
+        with pytest.raises(ValueError, match="parameter_index"):
+            continue_family(self.orbit, 0.01, 3, method="natural", parameter_index=2)
+        with pytest.raises(ValueError, match="parameter_index"):
+            continue_family(self.orbit, 0.01, 3, parameter_index=1)
@@ -0,0 +1,86 @@
+""" 
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+"""
+
+import pytest
+import numpy as np
+
+from pyastronautics.astrodynamics.poincare import PoincareMap
+from pyastronautics.astrodynamics.three_body_problem import CR3BP
+
+class TestPoincareMap:
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """Set up a short Earth-Moon Poincaré map."""
+
+        self.map = PoincareMap(3.15)
+        self.map.max_time = 4*np.pi
+        self.x = np.linspace(0.2, 0.8, 4)
+
+    def test_seed_jacobi(self):
+
+        seeds = self.map.seed(self.x, vx=0.1)
+        jacobi = CR3BP.calculate_jacobi(seeds[:, 0], seeds[:, 1], seeds[:, 3], seeds[:, 4],
+                                        self.map.mass_ratio)
+
+        assert seeds.shape == (4, 6)
+        assert np.all(seeds[:, 4] > 0)
+        assert np.allclose(jacobi, 3.15)
+
+    def test_unreachable_seed(self):
+
+        # The x velocity of the second seed exceeds the speed allowed at C = 3.15
+        seeds = self.map.seed([0.2, 0.5], vx=[0.0, 10.0])
+
+        assert np.isfinite(seeds[0, 4])
+        assert np.isnan(seeds[1, 4])
+
+        crossings = self.map.compute([0.2, 0.5], vx=[0.0, 10.0])
+        assert np.all(self.map.seed_index == 0)
+        assert len(crossings) > 0
+
+    def test_crossings_on_section(self):
+
+        crossings = self.map.compute(self.x)
+        jacobi = CR3BP.calculate_jacobi(crossings[:, 0], crossings[:, 1], crossings[:, 3],
+                                        crossings[:, 4], self.map.mass_ratio)
+
+        assert crossings.shape == (len(self.map.crossing_times), 6)
+        assert np.allclose(crossings[:, 1], 0, atol=1e-10)
+        assert np.all(crossings[:, 4] > 0)
+        assert np.all(self.map.crossing_times > 0)
+        assert np.allclose(jacobi, 3.15, atol=1e-6)
+        assert set(self.map.seed_index) == {0, 1, 2, 3}
+
+    def test_cache(self, monkeypatch):
+
+        first = self.map.compute(self.x)
+
+        # A cached seed must not be propagated again
+        from pyastronautics.astrodynamics import poincare
+        monkeypatch.setattr(poincare, "_section_crossings",
+                            lambda *args: pytest.fail("cached seed propagated"))
+        second = self.map.compute(self.x[::-1])
+
+        assert len(second) == len(first)
+        assert np.array_equal(self.map.seed_index[0], 0)
+
+    def test_num_crossings(self):
+
+        self.map.num_crossings = 1
+        self.map.compute(self.x)
+
+        assert np.array_equal(np.bincount(self.map.seed_index), [1, 1, 1, 1])
+
+    def test_parallel_matches_serial(self):
+
+        serial = self.map.compute(self.x)
+
+        self.map.clear_cache()
+        self.map.processes = 2
+        self.map.chunk_size = 2
+        parallel = self.map.compute(self.x)
+
+        assert np.array_equal(serial, parallel)
@@ -6,7 +6,8 @@
 import pytest
 import numpy as np
 
-from pyastronautics.astrodynamics.three_body_problem import CR3BP
+from pyastronautics.astrodynamics import three_body_problem
+from pyastronautics.astrodynamics.three_body_problem import CR3BP, jacobi_potential_grid
 
 class TestCR3BP:
 
@@ -52,6 +53,23 @@ class TestCR3BP:
 
         assert np.allclose(self.sc.final_state, expected_state)
 
+    def test_solve_trajectory_dop853(self):
+
+        self.sc.integrator = "DOP853"
+        self.sc.solve_non_dim_trajectory()
+
+        # Known final state
+        expected_state = np.array([-0.00131049,  0.53114043,  0.,
+                                   -0.59227612, -0.62395045, 0.])
+
+        assert np.allclose(self.sc.final_state, expected_state)
+
+    def test_solve_trajectory_symplectic(self):
+
+        self.sc.integrator = "symplectic"
+        with pytest.raises(ValueError, match="requires velocity independent accelerations"):
+            self.sc.solve_non_dim_trajectory()
+
     def test_solve_trajectory_empty_time(self):
  
         self.sc.time = []
@@ -65,6 +83,142 @@ class TestCR3BP:
         with pytest.raises(ValueError, match="Attribute 'time' must be defined before calling solve_trajectory."):
             self.sc.solve_non_dim_trajectory()
 
+    def test_iter_trajectory_matches_solve(self):
+
+        chunks = list(self.sc.iter_non_dim_trajectory(chunk_size=300))
+        states = np.concatenate([states for _, states in chunks])
+
+        self.sc.solve_non_dim_trajectory()
+
+        assert len(chunks) == 4
+        assert states.shape == (len(self.sc.time), 6)
+        assert np.allclose(states[:, :3], self.sc.numerical_position, rtol=0, atol=1e-12)
+        assert np.allclose(self.sc.final_state, states[-1])
+
+    def test_iter_trajectory_symplectic(self):
+
+        self.sc.integrator = "symplectic"
+        with pytest.raises(ValueError, match="requires velocity independent accelerations"):
+            next(self.sc.iter_non_dim_trajectory())
+
+class TestRHSBackends:
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """Set up the spacecraft model instance for testing."""
+
+        self.sc = CR3BP([0.50, 0.50, 0.05], [-0.05, 0.10, 0.01])
+        self.sc.time = np.linspace(0, 2*np.pi, 200)
+        self.sc.rel_tol = 1e-12
+        self.sc.abs_tol = 1e-13
+
+        self.state = np.array([0.5, 0.5, 0.05, -0.05, 0.1, 0.01])
+
+    @pytest.mark.parametrize("backend", ["numpy", "numba"])
+    def test_rhs_matches_python_backend(self, backend):
+        if backend == "numba":
+            pytest.importorskip("numba")
+
+        self.sc.rhs_backend = backend
+        derivative = self.sc.non_dim_rhs()(0.0, self.state)
+
+        assert np.allclose(derivative, self.sc.non_dim_differential_equations(0.0, self.state),
+                           rtol=1e-14, atol=1e-15)
+
+    def test_numpy_backend_identical_trajectory(self):
+
+        self.sc.solve_non_dim_trajectory()
+        expected = self.sc.num_sol.y
+
+        self.sc.rhs_backend = "numpy"
+        self.sc.solve_non_dim_trajectory()
+
+        assert np.array_equal(self.sc.num_sol.y, expected)
+
+    def test_numba_fallback(self, monkeypatch):
+
+        monkeypatch.setattr(three_body_problem, "numba", None)
+        self.sc.rhs_backend = "numba"
+
+        with pytest.warns(UserWarning, match="Numba is not installed"):
+            rhs = self.sc.non_dim_rhs()
+
+        assert np.allclose(rhs(0.0, self.state), self.sc.non_dim_differential_equations(0.0, self.state))
+
+    def test_unknown_backend(self):
+
+        self.sc.rhs_backend = "fortran"
+        with pytest.raises(ValueError, match="Unknown rhs_backend 'fortran'"):
+            self.sc.solve_non_dim_trajectory()
+
+class TestStateTransitionMatrix:
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """Set up the spacecraft model instance for testing."""
+
+        self.state = np.array([0.50, 0.50, 0.05, -0.05, 0.10, 0.01])
+
+        self.sc = CR3BP(list(self.state[:3]), list(self.state[3:]))
+        self.sc.time = np.linspace(0, 2, 20)
+        self.sc.rel_tol = 1e-12
+        self.sc.abs_tol = 1e-12
+
+    def test_system_matrix_finite_difference(self):
+
+        system_matrix = CR3BP.linearized_system_matrix(self.state[:3], self.sc.mu)
+
+        jacobian = np.zeros((6, 6))
+        step = 1e-7
+        for k in range(6):
+            delta = np.zeros(6)
+            delta[k] = step
+            jacobian[:, k] = (self.sc.non_dim_differential_equations(0, self.state + delta) -
+                              self.sc.non_dim_differential_equations(0, self.state - delta))/(2*step)
+
+        assert np.allclose(system_matrix, jacobian, atol=1e-7)
+
+    def test_potential_hessian_vectorized(self):
+
+        positions = np.array([[0.5, 0.5, 0.05], [0.8, 0.0, 0.0], [-1.0, 0.1, -0.2]])
+        hessians = CR3BP.potential_hessian(positions, self.sc.mu)
+
+        assert hessians.shape == (3, 3, 3)
+        for position, hessian in zip(positions, hessians):
+            assert np.allclose(CR3BP.potential_hessian(position, self.sc.mu), hessian)
+            assert np.allclose(hessian, hessian.T)
+
+    def test_solve_trajectory_stm(self):
+
+        self.sc.solve_non_dim_trajectory(stm=True)
+        final_state = self.sc.final_state
+        final_stm = self.sc.final_stm
+
+        assert self.sc.numerical_stm.shape == (len(self.sc.time), 6, 6)
+        assert np.allclose(self.sc.numerical_stm[0], np.eye(6))
+        assert self.sc.numerical_velocity.shape == (len(self.sc.time), 3)
+
+        # State is unchanged by the augmented system
+        self.sc.solve_non_dim_trajectory()
+        assert np.allclose(final_state, self.sc.final_state, atol=1e-10)
+        assert self.sc.numerical_stm is None
+        assert self.sc.final_stm is None
+
+        # STM columns match central differences of perturbed trajectories
+        step = 1e-6
+        for k in range(6):
+            finals = []
+            for sign in (1, -1):
+                perturbed = self.state.copy()
+                perturbed[k] += sign*step
+                sc = CR3BP(list(perturbed[:3]), list(perturbed[3:]))
+                sc.time = self.sc.time
+                sc.rel_tol = sc.abs_tol = 1e-12
+                sc.solve_non_dim_trajectory()
+                finals.append(sc.final_state)
+
+            assert np.allclose(final_stm[:, k], (finals[0] - finals[1])/(2*step), atol=1e-6)
+
 class TestForbiddenRegions:
     def test_forbidden_region_default(self):
         # Use some reasonable defaults
@@ -112,6 +266,44 @@ class TestForbiddenRegions:
         # Verify that the Jacobi constant is below the given threshold (no NaNs)
         assert np.all(~np.isnan(jc))  # There should be no NaNs if jacobi_max is high
 
+    def test_zero_velocity_curve_precision(self):
+        # End points of every segment lie on the curve
+        mass_ratio = 0.012150515586657583
+        segments = CR3BP.zero_velocity_curve(3.1, mass_ratio)
+        points = segments.reshape(-1, 2)
+        jacobi = CR3BP.calculate_jacobi(points[:, 0], points[:, 1], 0, 0, mass_ratio)
+
+        assert segments.shape[1:] == (2, 2)
+        assert np.allclose(jacobi, 3.1, rtol=0, atol=1e-10)
+
+    def test_zero_velocity_curve_closed(self):
+        # Inside the range every end point is shared by exactly two segments
+        segments = CR3BP.zero_velocity_curve(3.1, 0.012150515586657583, refinements=3)
+        keys = np.round(segments.reshape(-1, 2)*1e9).astype(np.int64)
+        counts = np.unique(keys, axis=0, return_counts=True)[1]
+
+        assert np.all(counts == 2)
+
+    def test_zero_velocity_curve_matches_forbidden_region(self):
+        # The finest level matches a 513 x 513 uniform grid, so both find the same cells
+        mass_ratio = 0.1
+        segments = CR3BP.zero_velocity_curve(3.0, mass_ratio, linspace_num=33, refinements=4)
+        _, _, jc = CR3BP.forbidden_region(3.0, mass_ratio, linspace_num=513)
+
+        allowed = np.isnan(jc)
+        corners = np.stack((allowed[:-1, :-1], allowed[:-1, 1:], allowed[1:, 1:], allowed[1:, :-1]))
+        crossed = np.any(corners, axis=0) & ~np.all(corners, axis=0)
+        # Saddle cells hold two segments
+        saddle = (corners[0] == corners[2]) & (corners[1] == corners[3]) & crossed
+
+        assert len(segments) == np.count_nonzero(crossed) + np.count_nonzero(saddle)
+
+    def test_zero_velocity_curve_empty(self):
+        # No curve when the whole range is allowed
+        segments = CR3BP.zero_velocity_curve(450.0, 0.1, x_range=[-1.5, -1.0], y_range=[-1.5, -1.0])
+
+        assert segments.shape == (0, 2, 2)
+
     # Test for calculate_jacobi function
     def test_calculate_jacobi(self):
         # Known test case
@@ -162,6 +354,142 @@ class TestForbiddenRegions:
         # Check if the result is as expected
         assert np.isclose(jacobi, expected_jacobi), f"Expected {expected_jacobi}, but got {jacobi}"
 
+class TestJacobiPotentialGrid:
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """Start every test with an empty grid cache."""
+
+        jacobi_potential_grid.cache_clear()
+        self.mass_ratio = 0.012150515586657583
+
+    def test_grid_reused(self):
+
+        CR3BP.forbidden_region(3.0, self.mass_ratio, [-1.5, 1.5], [-1.5, 1.5], 100)
+        CR3BP.forbidden_region(3.1, self.mass_ratio, [-1.5, 1.5], [-1.5, 1.5], 100)
+        CR3BP.forbidden_region(3.1, self.mass_ratio, [-1.0, 1.0], [-1.5, 1.5], 100)
+
+        info = jacobi_potential_grid.cache_info()
+        assert info.hits == 1
+        assert info.misses == 2
+        # Only a few grids are kept alive
+        assert info.maxsize == 4
+
+    def test_grid_read_only(self):
+
+        grid = jacobi_potential_grid(self.mass_ratio)
+
+        with pytest.raises(ValueError, match="read-only"):
+            grid.potential[0, 0] = 0.0
+
+        # Returned arrays are independent of the cached grid
+        x_vals, _, jc = CR3BP.forbidden_region(3.0, self.mass_ratio)
+        x_vals[0] = 10.0
+        jc[0, 0] = 0.0
+        assert grid.x_vals[0] == -1.5
+        assert grid.potential[0, 0] != 0.0
+
+    def test_mask_matches_nan(self):
+
+        for jacobi in np.linspace(3.0, 3.2, 5):
+            _, _, jc = CR3BP.forbidden_region(jacobi, self.mass_ratio)
+            _, _, mask = CR3BP.forbidden_region(jacobi, self.mass_ratio, mask=True)
+
+            assert mask.dtype == bool
+            assert np.array_equal(mask, np.isnan(jc))
+
+    def test_contour(self):
+
+        grid = jacobi_potential_grid(self.mass_ratio, linspace_num=129)
+        segments = grid.contour(3.1)
+        points = segments.reshape(-1, 2)
+
+        # Same cells as the adaptive curve at the same resolution
+        adaptive = CR3BP.zero_velocity_curve(3.1, self.mass_ratio, linspace_num=65, refinements=1)
+
+        assert len(segments) == len(adaptive)
+        assert np.allclose(CR3BP.calculate_jacobi(points[:, 0], points[:, 1], 0, 0, self.mass_ratio),
+                           3.1, rtol=0, atol=1e-10)
+
+class TestSpatialJacobi:
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """Set up random spatial states."""
+
+        self.mass_ratio = 0.012150515586657583
+        rng = np.random.default_rng(0)
+        self.states = rng.normal(0.0, 0.5, size=(500, 6)) + [0.3, 0.2, 0.1, 0.0, 0.0, 0.0]
+
+    def test_jacobi_constant(self):
+
+        x, y, z, vx, vy, vz = self.states.T
+        r1 = np.sqrt((x + self.mass_ratio)**2 + y**2 + z**2)
+        r2 = np.sqrt((x - 1 + self.mass_ratio)**2 + y**2 + z**2)
+        expected = (x**2 + y**2 + 2*(1 - self.mass_ratio)/r1 + 2*self.mass_ratio/r2
+                    - (vx**2 + vy**2 + vz**2))
+
+        assert np.allclose(CR3BP.jacobi_constant(self.states, self.mass_ratio), expected)
+        assert np.isclose(CR3BP.jacobi_constant(self.states[0], self.mass_ratio), expected[0])
+
+    def test_jacobi_constant_planar(self):
+
+        planar = self.states.copy()
+        planar[:, [2, 5]] = 0.0
+        x, y, _, vx, vy, _ = planar.T
+
+        assert np.allclose(CR3BP.jacobi_constant(planar, self.mass_ratio),
+                           CR3BP.calculate_jacobi(x, y, vx, vy, self.mass_ratio))
+
+    def test_out_buffer(self):
+
+        out = np.full(len(self.states), np.nan)
+        result = CR3BP.jacobi_constant(self.states, self.mass_ratio, out=out)
+
+        assert result is out
+        assert np.all(np.isfinite(out))
+        assert np.allclose(out, CR3BP.jacobi_constant(self.states, self.mass_ratio))
+
+    def test_jacobi_velocity(self):
+
+        jacobi = CR3BP.jacobi_constant(self.states, self.mass_ratio)
+        out = np.empty(len(self.states))
+        speed = CR3BP.jacobi_velocity(self.states[:, :3], jacobi, self.mass_ratio, out=out)
+
+        assert speed is out
+        assert np.allclose(speed, np.linalg.norm(self.states[:, 3:], axis=1))
+
+        # Positions inside the forbidden region have no real velocity
+        assert np.isnan(CR3BP.jacobi_velocity([0.5, 0.5, 0.0], 10.0, self.mass_ratio))
+
+    def test_solver_drift_monitor(self):
+
+        sc = CR3BP([0.50, 0.50, 0.0], [-0.05, 0.10, 0.02])
+        sc.verbose = False
+        sc.time = np.linspace(0, 2*np.pi, 200)
+        sc.solve_non_dim_trajectory(calc_jacobi=True)
+
+        assert sc.jacobi_history.shape == (200,)
+        assert np.isclose(sc.jacobi_history[0],
+                          CR3BP.jacobi_constant(np.array(sc.initial_state_vector), sc.mu))
+        assert 0 < sc.jacobi_drift < 1e-6
+
+        # Looser tolerances drift further
+        sc.rel_tol = sc.abs_tol = 1e-6
+        drift = sc.jacobi_drift
+        sc.solve_non_dim_trajectory(calc_jacobi=True)
+        assert sc.jacobi_drift > drift
+
+        # The streaming monitor tracks the same drift
+        for _ in sc.iter_non_dim_trajectory(chunk_size=64, calc_jacobi=True):
+            pass
+        assert np.isclose(sc.jacobi_drift, np.max(np.abs(sc.jacobi_history - sc.jacobi_history[0])))
+
+        # A solve without the monitor does not keep the previous history
+        sc.solve_non_dim_trajectory()
+        assert sc.jacobi_history is None
+        assert sc.jacobi_drift is None
+
 from pyastronautics.astrodynamics.three_body_problem import planar_lagrange_points
 class TestPlanarLagrangePoints:
     def test_lagrange_points_init(self):
@@ -0,0 +1,221 @@
+""" 
+   Copyright 2024 Eduardo Ocampo
+   https://github.com/eduardo-ocampo/PyAstronautics
+"""
+
+import pytest
+import numpy as np
+
+from pyastronautics.astrodynamics.trajectory import DenseTrajectory, TrajectoryData, save_trajectory, load_trajectory
+from pyastronautics.astrodynamics.two_body_problem import TwoBodyModel
+from pyastronautics.astrodynamics.three_body_problem import CR3BP
+
+class TestDenseTrajectory:
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """Set up a spacecraft solved with dense output."""
+
+        self.sc = TwoBodyModel([5000, 100, 0], [1, 10, 5])
+        self.sc.mu = 398600 # km^3/sec^2
+        self.sc.time = np.arange(0, 4*12969.97314383982, 15*60)
+        self.sc.solve_trajectory(dense_output=True)
+
+    def test_evaluate_on_solver_grid(self):
+
+        states = self.sc.trajectory(self.sc.time)
+
+        assert states.shape == (len(self.sc.time), 6)
+        assert np.allclose(states[:, :3], self.sc.numerical_position)
+        assert np.allclose(self.sc.trajectory.velocity(self.sc.time), self.sc.numerical_velocity)
+
+    def test_evaluate_between_samples(self):
+
+        t = 1234.5
+        trajectory = self.sc.trajectory
+        state = trajectory(t)
+
+        # Compare against the closed form solution
+        self.sc.time = np.array([0, t])
+        self.sc.solve_kepler_trajectory()
+
+        assert state.shape == (6,)
+        assert np.allclose(trajectory.position(t), self.sc.final_state[:3], rtol=1e-8)
+
+    def test_cleared_by_kepler_solve(self):
+
+        self.sc.solve_kepler_trajectory()
+
+        assert self.sc.trajectory is None
+        assert self.sc.num_sol is None
+
+    def test_evaluate_outside_interval(self):
+
+        with pytest.raises(ValueError, match="Times must be within the integrated interval"):
+            self.sc.trajectory(-1.0)
+
+    def test_missing_dense_output(self):
+
+        with pytest.raises(ValueError, match="solve with dense_output=True"):
+            DenseTrajectory(None)
+
+    def test_cleared_by_later_solve(self):
+
+        # The trajectory of the previous solve no longer matches the results
+        self.sc.solve_trajectory()
+        assert self.sc.trajectory is None
+
+    def test_cr3bp_dense_output(self):
+
+        sc = CR3BP([0.50, 0.50, 0.0], [-0.05, 0.10, 0.0])
+        sc.time = np.linspace(0, 2*np.pi, 50)
+        sc.solve_non_dim_trajectory(dense_output=True)
+
+        assert np.allclose(sc.trajectory(sc.time[-1]), sc.final_state)
+        assert sc.trajectory.position([0.1, 0.2]).shape == (2, 3)
+
+        sc.solve_non_dim_trajectory()
+        assert sc.trajectory is None
+
+class TestTrajectoryStore:
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, tmp_path):
+        """Set up a spacecraft solved and saved to a temporary directory."""
+
+        self.sc = TwoBodyModel([5000, 100, 0], [1, 10, 5])
+        self.sc.mu = 398600 # km^3/sec^2
+        self.sc.verbose = False
+        self.sc.time = np.arange(0, 12969.97314383982, 15*60)
+        self.sc.trajectory_file = str(tmp_path/"orbit.npz")
+        self.sc.solve_trajectory(save_analysis=True)
+        self.tmp_path = tmp_path
+
+    def test_round_trip(self):
+
+        data = load_trajectory(self.sc.trajectory_file)
+
+        assert isinstance(data, TrajectoryData)
+        assert len(data) == len(self.sc.time)
+        assert np.array_equal(data.time, self.sc.num_sol.t)
+        assert np.array_equal(data.position, self.sc.numerical_position)
+        assert np.array_equal(data.final_state, self.sc.final_state)
+
+    def test_metadata(self):
+
+        metadata = load_trajectory(self.sc.trajectory_file).metadata
+
+        assert metadata["model"] == "TwoBodyModel"
+        assert metadata["mu"] == 398600
+        assert metadata["integrator"] == "RK45"
+        assert metadata["initial_state"] == [5000, 100, 0, 1, 10, 5]
+
+    def test_float32_compressed(self):
+
+        filename = self.tmp_path/"orbit32.npz"
+        save_trajectory(filename, self.sc.num_sol.t, self.sc.num_sol.y.T,
+                        dtype="float32", compress=True)
+        data = load_trajectory(filename)
+
+        assert data.states.dtype == np.float32
+        assert data.time.dtype == np.float64
+        assert data.metadata == {}
+        assert np.allclose(data.states, self.sc.num_sol.y.T, rtol=1e-6)
+
+    def test_invalid_states(self):
+
+        with pytest.raises(ValueError, match="states must have shape"):
+            save_trajectory(self.tmp_path/"bad.npz", [0, 1], np.zeros(6))
+
+    def test_kepler_and_cr3bp_save(self):
+
+        self.sc.solve_kepler_trajectory(save_analysis=True)
+        assert load_trajectory(self.sc.trajectory_file).metadata["integrator"] == "kepler"
+
+        sc = CR3BP([0.50, 0.50, 0.0], [-0.05, 0.10, 0.0])
+        sc.verbose = False
+        sc.time = np.linspace(0, np.pi, 20)
+        sc.trajectory_file = str(self.tmp_path/"cr3bp.npz")
+        sc.solve_non_dim_trajectory(save_analysis=True)
+        data = load_trajectory(sc.trajectory_file)
+
+        assert data.metadata["units"] == "non-dimensional"
+        assert np.array_equal(data.final_state, sc.final_state)
+
+    def test_deprecated_pickle_file(self):
+
+        sc = CR3BP([0.50, 0.50, 0.0], [-0.05, 0.10, 0.0])
+        with pytest.warns(DeprecationWarning, match="trajectory_file"):
+            sc.num_sol_pickle_file = str(self.tmp_path/"legacy.npz")
+        assert sc.trajectory_file == str(self.tmp_path/"legacy.npz")
+
+        with pytest.warns(DeprecationWarning):
+            assert self.sc.num_sol_pickle_file == self.sc.trajectory_file
+
+class TestMemoryMappedTrajectory:
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, tmp_path):
+        """Set up a CR3BP spacecraft solved and saved to a temporary directory."""
+
+        self.sc = CR3BP([0.50, 0.50, 0.0], [-0.05, 0.10, 0.0])
+        self.sc.verbose = False
+        self.sc.time = np.linspace(0, 2*np.pi, 500)
+        self.sc.trajectory_file = str(tmp_path/"cr3bp.npz")
+        self.sc.solve_non_dim_trajectory(save_analysis=True)
+        self.tmp_path = tmp_path
+
+    def test_memmap_matches_load(self):
+
+        data = load_trajectory(self.sc.trajectory_file)
+        mapped = load_trajectory(self.sc.trajectory_file, mmap_mode="r")
+
+        assert isinstance(mapped.states, np.memmap)
+        assert np.array_equal(mapped.time, data.time)
+        assert np.array_equal(mapped.states, data.states)
+        assert mapped.metadata == data.metadata
+
+    def test_slices_are_views(self):
+
+        mapped = load_trajectory(self.sc.trajectory_file, mmap_mode="r")
+        window = mapped.position[100:200]
+
+        assert np.shares_memory(window, mapped.states)
+        assert np.array_equal(window, self.sc.numerical_position[100:200])
+
+    def test_memmap_float32(self):
+
+        filename = self.tmp_path/"cr3bp32.npz"
+        save_trajectory(filename, self.sc.num_sol.t, self.sc.num_sol.y.T, dtype="float32")
+        mapped = load_trajectory(filename, mmap_mode="r")
+
+        assert mapped.states.dtype == np.float32
+        assert np.allclose(mapped.states, self.sc.num_sol.y.T, rtol=1e-6)
+
+    def test_memmap_compressed(self):
+
+        filename = self.tmp_path/"cr3bp_compressed.npz"
+        save_trajectory(filename, self.sc.num_sol.t, self.sc.num_sol.y.T, compress=True)
+
+        with pytest.raises(ValueError, match="Cannot memory-map"):
+            load_trajectory(filename, mmap_mode="r")
+
+    def test_chunked_jacobi(self):
+
+        mapped = load_trajectory(self.sc.trajectory_file, mmap_mode="r")
+        mu = mapped.metadata["mu"]
+
+        jacobi = np.concatenate([
+            CR3BP.calculate_jacobi(chunk.position[:, 0], chunk.position[:, 1],
+                                   chunk.velocity[:, 0], chunk.velocity[:, 1], mu)
+            for chunk in mapped.iter_chunks(64)])
+
+        assert len(jacobi) == len(mapped)
+        assert np.allclose(jacobi, jacobi[0], atol=1e-6)
+
+    def test_invalid_chunk_size(self):
+
+        data = load_trajectory(self.sc.trajectory_file)
+
+        with pytest.raises(ValueError, match="chunk_size"):
+            next(data.iter_chunks(0))
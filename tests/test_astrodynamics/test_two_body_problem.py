@@ -4,10 +4,14 @@
 """
 
 import math
+import copy
+import pickle
 import pytest
 import numpy as np
 
-from pyastronautics.astrodynamics.two_body_problem import TwoBodyModel
+from pyastronautics.astrodynamics.base_model import (calc_orbit_elements_array, OrbitElements, Parameter,
+                                                     ORBIT_ELEMENT_FIELDS, NUM_ELEMENT_VALUES)
+from pyastronautics.astrodynamics.two_body_problem import TwoBodyModel, TwoBodyBatchModel
 
 class TestTwoBody:
 
@@ -74,6 +78,206 @@ class TestTwoBody:
         assert np.isclose(self.sc.orbit_elements.n.value, 0.00113206419)
         assert np.isclose(self.sc.orbit_elements.period.value, 5550.1834355392)
 
+class TestOrbitElementsArray:
+
+    mu = 398600 # km^3/sec^2
+
+    # Elliptic, retrograde node, negative eccentricity z and hyperbolic states
+    position = [[5000, 100, 0], [7000, -2000, 500], [-6000, 3000, -1000], [7000, 0, 100]]
+    velocity = [[1, 9.9286057, 1], [-1, 7, -2], [-2, -6, 1], [0, 12, 1]]
+
+    # Known elements of each state, in the units of ORBIT_ELEMENT_FIELDS
+    known = {"E": [-29.41545521, -27.62324395, -38.27036372, 15.56295246],
+             "h": [49794.79564123, 48902.96514528, 42860.23798347, 84299.70343957],
+             "e": [0.28614888, 0.41039837, 0.33916492, 1.54667163],
+             "i": [5.76405788, 16.03629063, 11.49869942, 4.83280444],
+             "Omega": [1.14576284, 177.8789036, 200.55604522, 350.27242145],
+             "omega": [328.45575228, 281.31313215, 113.20066332, 9.64970839],
+             "a": [6775.34984881, 7214.93827369, 5207.68502334, -12806.05338008],
+             "p": [6220.57619908, 5999.74912193, 4608.63020572, 17828.49974912],
+             "fi": [31.54424772, 244.32557045, 199.09947135, 0.11191059],
+             "Mi": [17.15873291, 68.0881331, 144.26083675, np.nan],
+             "period": [5550.20224686, 6099.02131346, 3740.05754643, np.nan]}
+
+    def test_known_elements(self):
+
+        elements = calc_orbit_elements_array(self.position, self.velocity, self.mu)
+
+        for name, value in self.known.items():
+            assert np.allclose(getattr(elements, name).value, value, equal_nan=True), name
+
+        assert np.allclose(elements.h_vector.value, [[100, -5000, 49543.0285],
+                                                     [500, 13500, 47000],
+                                                     [-3000, 8000, 42000],
+                                                     [-1200, -7000, 84000]])
+        assert np.allclose(elements.e_vector.value[1], [-0.06613825, 0.3894794, -0.11116814])
+        assert np.allclose(elements.N.value[2], [-8000, -3000, 0])
+
+    def test_single_state_elements(self):
+
+        elements = calc_orbit_elements_array(self.position, self.velocity, self.mu)
+
+        for k, (pos, vel) in enumerate(zip(self.position, self.velocity)):
+            sc = TwoBodyModel(pos, vel)
+            sc.mu = self.mu
+            sc.calc_orbit_elements()
+
+            for name, value in self.known.items():
+                assert np.isclose(getattr(sc.orbit_elements, name).value, value[k], equal_nan=True), name
+                assert getattr(sc.orbit_elements, name).unit == getattr(elements, name).unit
+
+    def test_array_shapes(self):
+
+        elements = calc_orbit_elements_array(self.position, self.velocity, self.mu)
+
+        assert elements.e.value.shape == (4,)
+        assert elements.h_vector.value.shape == (4, 3)
+
+    def test_hyperbolic_mean_motion(self):
+
+        elements = calc_orbit_elements_array(self.position, self.velocity, self.mu)
+
+        assert elements.a.value[-1] < 0
+        assert np.isnan(elements.n.value[-1])
+        assert np.isnan(elements.period.value[-1])
+        assert np.all(np.isfinite(elements.n.value[:-1]))
+
+class TestCompactOrbitElements:
+
+    mu = 398600 # km^3/sec^2
+
+    position = [[5000, 100, 0], [7000, -2000, 500], [-6000, 3000, -1000], [7000, 0, 100]]
+    velocity = [[1, 9.9286057, 1], [-1, 7, -2], [-2, -6, 1], [0, 12, 1]]
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """Set up element arrays of several states."""
+
+        self.elements = calc_orbit_elements_array(self.position, self.velocity, self.mu)
+
+    def test_single_array(self):
+
+        data = self.elements.to_array()
+
+        assert data.shape == (NUM_ELEMENT_VALUES, 4)
+        assert self.elements.shape == (4,)
+        # Every element is a view of the same array
+        assert np.shares_memory(self.elements.a.value, data)
+        assert np.shares_memory(self.elements.h_vector.value, data)
+        assert list(self.elements.parameters) == list(ORBIT_ELEMENT_FIELDS)
+        assert self.elements.a.unit == "km"
+        assert self.elements.Omega.description == "Longitude of Ascending Node (Ω)"
+
+    def test_records(self):
+
+        records = self.elements.to_records()
+
+        assert records.shape == (4,)
+        assert np.array_equal(records["a"], self.elements.a.value)
+        assert np.array_equal(records["h_vector"], self.elements.h_vector.value)
+        assert np.array_equal(records["n"], self.elements.n.value, equal_nan=True)
+
+    def test_indexing(self):
+
+        bound = self.elements[self.elements.e.value < 1]
+        first = self.elements[0]
+
+        assert bound.shape == (3,)
+        assert np.array_equal(bound.a.value, self.elements.a.value[:3])
+        assert first.shape == ()
+        assert isinstance(first.a.value, float)
+        assert first.h_vector.value.shape == (3,)
+
+        with pytest.raises(TypeError):
+            first[0]
+
+    def test_copy(self):
+
+        duplicate = self.elements.copy()
+        duplicate.add_parameter("a", np.zeros(4), "km")
+
+        assert np.all(duplicate.a.value == 0)
+        assert np.all(self.elements.a.value != 0)
+
+        restored = pickle.loads(pickle.dumps(self.elements))
+        assert np.array_equal(restored.to_array(), self.elements.to_array(), equal_nan=True)
+
+        sc = TwoBodyModel(self.position[0], self.velocity[0])
+        sc.mu = self.mu
+        sc.calc_orbit_elements()
+        deep = copy.deepcopy(sc.orbit_elements)
+        deep.position.value.append(0)
+        assert sc.orbit_elements.position.value == [5000, 100, 0]
+        assert deep.a.value == sc.orbit_elements.a.value
+
+    def test_add_parameter(self):
+
+        elements = OrbitElements()
+        elements.add_parameter("a", 7000.0, "km")
+        elements.add_parameter("e_vector", np.array([0.1, 0, 0]), "")
+        elements.add_parameter("f", 30.0, "degrees", description="True Anomaly")
+
+        assert elements.shape == ()
+        assert elements.a.value == 7000.0
+        assert np.array_equal(elements.e_vector.value, [0.1, 0, 0])
+        assert elements.f.description == "True Anomaly"
+        assert list(elements.parameters) == ["f", "e_vector", "a"]
+        with pytest.raises(AttributeError):
+            elements.e
+
+        # Values that do not match the field index are kept as given
+        elements.add_parameter("a", 7e6, "m")
+        assert elements.a.value == 7e6
+        assert elements.a.unit == "m"
+        elements.add_parameter("a", [7000.0, 8000.0], "km")
+        assert elements.a.value == [7000.0, 8000.0]
+
+    def test_write_through(self):
+
+        sc = TwoBodyModel(self.position[0], self.velocity[0])
+        sc.mu = self.mu
+        sc.calc_orbit_elements()
+        elements = sc.orbit_elements
+        a = elements.a
+
+        # Writes to a parameter read earlier reach the element array
+        elements.a.value = 1.0
+        assert elements.a.value == 1.0
+        assert a.value == 1.0
+        assert elements.to_array()[ORBIT_ELEMENT_FIELDS["a"][0]] == 1.0
+
+        elements.parameters["a"] = Parameter(2.0, "km")
+        assert elements.a.value == 2.0
+        elements.a = Parameter(3.0, "km")
+        assert a.value == 3.0
+
+        # Array views are written in place
+        self.elements.h_vector.value[0] = [1, 2, 3]
+        assert np.array_equal(self.elements.to_records()["h_vector"][0], [1, 2, 3])
+
+        # A new unit keeps the value as a separate parameter
+        a.unit = "m"
+        assert elements.a.unit == "m"
+        assert a.value == 3.0
+
+        elements.parameters["f"] = Parameter(30.0, "degrees", "True Anomaly")
+        assert elements.f.value == 30.0
+        del elements.parameters["e"]
+        assert "e" not in elements.parameters
+        with pytest.raises(AttributeError):
+            elements.e
+        with pytest.raises(KeyError):
+            del elements.parameters["e"]
+        with pytest.raises(TypeError, match="must be set to a Parameter"):
+            elements.parameters["a"] = 1.0
+
+    def test_invalid(self):
+
+        with pytest.raises(ValueError, match="values in its first axis"):
+            OrbitElements(np.zeros((4, NUM_ELEMENT_VALUES)))
+        with pytest.raises(ValueError, match="Cannot update"):
+            self.elements.update(self.elements[:2])
+
 class TestTwoBodyModel:
 
     @pytest.fixture(autouse=True)
@@ -121,9 +325,196 @@ class TestTwoBodyModel:
         with pytest.raises(IndexError, match="list index out of range"):
             self.sc.solve_trajectory()
 
+    @pytest.mark.parametrize("integrator, step_size", [("DOP853", None), ("LSODA", None),
+                                                       ("RK8", 60), ("symplectic", 5)])
+    def test_solve_trajectory_integrators(self, integrator, step_size):
+
+        self.sc.integrator = integrator
+        self.sc.step_size = step_size
+        self.sc.solve_trajectory()
+
+        # Known final state
+        expected_state = np.array([4.48191388e+03, -1.85756502e+03, -9.75552752e+02,
+                                   4.15484717e+00, 9.41162692e+00,  4.67361221e+00])
+
+        assert self.sc.numerical_position.shape == (len(self.sc.time), 3)
+        assert np.allclose(self.sc.final_state, expected_state, rtol=1e-4)
+
+    def test_solve_trajectory_element_history(self):
+
+        self.sc.solve_trajectory(calc_elements=True)
+        history = self.sc.orbit_element_history
+
+        assert history.E.value.shape == (len(self.sc.time),)
+        assert history.h_vector.value.shape == (len(self.sc.time), 3)
+
+        # Initial sample matches the scalar orbit elements
+        self.sc.calc_orbit_elements()
+        assert np.isclose(history.a.value[0], self.sc.orbit_elements.a.value)
+        assert np.isclose(history.e.value[0], self.sc.orbit_elements.e.value)
+
+        # Energy and eccentricity are conserved along the trajectory
+        assert np.allclose(history.E.value, self.sc.orbit_elements.E.value, rtol=1e-6)
+        assert np.allclose(history.e.value, self.sc.orbit_elements.e.value, rtol=1e-5)
+
+    def test_solve_trajectory_without_element_history(self):
+
+        self.sc.solve_trajectory(calc_elements=True)
+        self.sc.solve_trajectory()
+        assert self.sc.orbit_element_history is None
+
+        # A Kepler solve does not keep the history of the numerical one
+        self.sc.solve_trajectory(calc_elements=True)
+        self.sc.solve_kepler_trajectory()
+        assert self.sc.orbit_element_history is None
+
+    def test_solve_kepler_trajectory_final_state(self):
+
+        self.sc.solve_kepler_trajectory()
+
+        # Known final state
+        expected_state = np.array([4.48191388e+03, -1.85756502e+03, -9.75552752e+02,
+                                   4.15484717e+00, 9.41162692e+00,  4.67361221e+00])
+
+        assert self.sc.numerical_position.shape == (len(self.sc.time), 3)
+        assert self.sc.numerical_velocity.shape == (len(self.sc.time), 3)
+        assert np.allclose(self.sc.final_state, expected_state)
+
+    def test_solve_kepler_trajectory_matches_numerical(self):
+
+        self.sc.solve_trajectory()
+        numerical_position = self.sc.numerical_position
+
+        self.sc.solve_kepler_trajectory()
+
+        assert np.allclose(self.sc.numerical_position, numerical_position, rtol=1e-6, atol=1e-2)
+
     def test_solve_trajectory_no_time(self):
         
         # Remove the time attribute
         del self.sc.time
         with pytest.raises(ValueError, match="Attribute 'time' must be defined before calling solve_trajectory."):
             self.sc.solve_trajectory()
+
+    def test_iter_trajectory_final_state(self):
+
+        running_max = 0.0
+        for time, states in self.sc.iter_trajectory(chunk_size=50):
+            assert states.shape == (len(time), 6)
+            running_max = max(running_max, np.linalg.norm(states[:, :3], axis=1).max())
+        final_state = self.sc.final_state
+
+        self.sc.solve_trajectory()
+
+        assert np.allclose(final_state, self.sc.final_state, rtol=1e-12)
+        assert np.isclose(running_max, np.linalg.norm(self.sc.numerical_position, axis=1).max())
+
+    def test_iter_trajectory_no_time(self):
+
+        del self.sc.time
+        with pytest.raises(ValueError, match="before calling iter_trajectory"):
+            next(self.sc.iter_trajectory())
+
+class TestTwoBodyBatchModel:
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """Set up a batch of spacecraft for testing."""
+
+        self.states = [[5000, 100, 0, 1, 10, 5],
+                       [7000, 0, 0, 0, 7.5, 1],
+                       [0, 8000, 0, -7, 0, 0.5]]
+
+        # Spacecraft
+        self.batch = TwoBodyBatchModel(self.states)
+        # Earth
+        self.batch.mu = 398600 # km^3/sec^2
+
+        self.batch.time = np.arange(0, 4*3600, 15*60)
+
+    def test_create_batch_with_invalid_shape(self):
+        with pytest.raises(ValueError, match=r"initial_states must have shape \(N, 6\)."):
+            TwoBodyBatchModel([[5000, 100, 0]])
+
+    def test_solve_trajectory_shape(self):
+
+        self.batch.solve_trajectory()
+
+        num_time = len(self.batch.time)
+        assert self.batch.states.shape == (3, num_time, 6)
+        assert self.batch.numerical_position.shape == (3, num_time, 3)
+        assert self.batch.numerical_velocity.shape == (3, num_time, 3)
+        assert self.batch.final_state.shape == (3, 6)
+
+    def test_solve_trajectory_matches_single_model(self):
+
+        self.batch.solve_trajectory()
+
+        for state, final_state in zip(self.states, self.batch.final_state):
+            sc = TwoBodyModel(state[:3], state[3:])
+            sc.mu = self.batch.mu
+            sc.time = self.batch.time
+            sc.solve_trajectory()
+
+            assert np.allclose(final_state, sc.final_state, rtol=1e-8, atol=1e-6)
+
+    def test_solve_trajectory_per_object_time(self):
+
+        shared = self.batch.time
+        self.batch.time = np.stack([shared, shared + 600, 2*shared])
+        self.batch.solve_trajectory()
+
+        # Epoch shifted grids share one integration, the stretched grid gets its own
+        assert len(self.batch.num_sols) == 2
+
+        reference = TwoBodyBatchModel(self.states)
+        reference.mu = self.batch.mu
+        reference.time = shared
+        reference.solve_trajectory()
+
+        assert np.allclose(self.batch.states[:2], reference.states[:2], rtol=1e-8, atol=1e-6)
+        assert self.batch.final_state.shape == (3, 6)
+
+    def test_solver_failure(self):
+
+        # The second spacecraft falls straight into the central body
+        batch = TwoBodyBatchModel([[7000, 0, 0, 0, 7.5, 0],
+                                   [7000, 0, 0, 0, 0, 0],
+                                   [8000, 0, 0, 0, 7, 0]])
+        batch.mu = self.batch.mu
+        batch.verbose = False
+        grid = np.linspace(0, 6000, 50)
+        batch.time = np.vstack((grid, grid + 100, 2*grid))
+        batch.solve_trajectory()
+
+        assert batch.states.shape == (3, 50, 6)
+        assert list(batch.success) == [True, False, True]
+        assert np.isnan(batch.final_state[1]).all()
+        assert np.all(np.isfinite(batch.states[[0, 2]]))
+        assert np.all(np.isfinite(batch.states[1, 0]))
+
+    def test_solve_trajectory_no_time(self):
+
+        # Remove the time attribute
+        del self.batch.time
+        with pytest.raises(ValueError, match="Attribute 'time' must be defined before calling solve_trajectory."):
+            self.batch.solve_trajectory()
+
+    def test_solve_trajectory_element_history(self):
+
+        self.batch.solve_trajectory(calc_elements=True)
+
+        assert self.batch.orbit_element_history.a.value.shape == (3, len(self.batch.time))
+        assert np.allclose(self.batch.orbit_element_history.E.value,
+                           self.batch.orbit_element_history.E.value[:, :1], rtol=1e-6)
+
+        self.batch.solve_trajectory()
+        assert self.batch.orbit_element_history is None
+
+    def test_from_models(self):
+
+        models = [TwoBodyModel(state[:3], state[3:]) for state in self.states]
+        batch = TwoBodyBatchModel.from_models(models)
+
+        assert np.allclose(batch.initial_states, self.states)
+        assert batch.mu == models[0].mu